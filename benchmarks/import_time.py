@@ -0,0 +1,128 @@
+"""Import-time benchmark of the integration as Home Assistant loads it.
+
+Home Assistant's own modules are imported first, so only the cost of the
+integration (and what it pulls in, like vvspy, requests and the station enum)
+is measured. Every run is a fresh interpreter with ``-X importtime``.
+
+    python benchmarks/import_time.py [--runs N] [--top N] [--save out.json] [--compare old.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+PRELOAD = [
+    "homeassistant.bootstrap",
+    "homeassistant.config_entries",
+    "homeassistant.components.calendar",
+    "homeassistant.components.sensor",
+    "homeassistant.components.diagnostics",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.selector",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.util.dt",
+]
+
+INTEGRATION = [
+    "custom_components.vvs",
+    "custom_components.vvs.config_flow",
+    "custom_components.vvs.calendar",
+    "custom_components.vvs.sensor",
+    "custom_components.vvs.diagnostics",
+]
+
+_MARKER = "--- integration ---"
+
+_SCRIPT = """
+import sys
+import time
+{preload}
+sys.stderr.write("%s\\n")
+sys.stderr.flush()
+start = time.perf_counter()
+{integration}
+print((time.perf_counter() - start) * 1000)
+""" % _MARKER
+
+
+def run_once():
+    script = _SCRIPT.format(
+        preload="\n".join(f"import {module}" for module in PRELOAD),
+        integration="\n".join(f"import {module}" for module in INTEGRATION),
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_ms = float(proc.stdout.strip().splitlines()[-1])
+
+    # Only modules imported after the preload count, the timer starts there
+    modules = {}
+    lines = proc.stderr.splitlines()
+    lines = lines[lines.index(_MARKER) + 1:]
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        # A module can be listed twice (e.g. a submodule its package imported)
+        modules[name.strip()] = modules.get(name.strip(), 0) + int(self_us)
+    return total_ms, modules
+
+
+def run(runs):
+    totals, selfs = [], {}
+    for _ in range(runs):
+        total_ms, modules = run_once()
+        totals.append(total_ms)
+        for name, self_us in modules.items():
+            selfs.setdefault(name, []).append(self_us)
+    return {
+        "total_ms": statistics.median(totals),
+        "modules": len(selfs),
+        "self_ms": {name: statistics.median(values) / 1000 for name, values in selfs.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--save", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    line = f"integration import: {results['total_ms']:.1f} ms, {results['modules']} modules"
+    if baseline:
+        line += (
+            f" (baseline {baseline['total_ms']:.1f} ms, {baseline['modules']} modules, "
+            f"{(results['total_ms'] - baseline['total_ms']) / baseline['total_ms'] * 100:+.1f}%)"
+        )
+    print(line)
+    print(f"{'self ms':>10}  module")
+    slowest = sorted(results["self_ms"].items(), key=lambda item: item[1], reverse=True)
+    for name, self_ms in slowest[: args.top]:
+        print(f"{self_ms:>10.2f}  {name}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
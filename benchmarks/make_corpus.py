@@ -0,0 +1,214 @@
+"""Build the offline response corpus used by the benchmarks.
+
+The files mirror the shape of real EFA responses (``rapidJSON`` for trip
+requests, ``json`` for DM requests). Use ``record.py`` to replace them with
+live recordings when network access is available; the benchmarks work with
+either.
+"""
+
+from datetime import datetime, timedelta
+import json
+import os
+import random
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "corpus")
+
+_STOPS = [
+    ("de:08111:6115", "Stuttgart Hauptbahnhof (tief)", (48.78464, 9.18212)),
+    ("de:08111:6056", "Stuttgart Stadtmitte", (48.77649, 9.17353)),
+    ("de:08111:6052", "Stuttgart Feuersee", (48.77283, 9.16406)),
+    ("de:08111:6008", "Stuttgart Schwabstraße", (48.76741, 9.15858)),
+    ("de:08111:6465", "Stuttgart-Zuffenhausen", (48.83342, 9.16978)),
+    ("de:08111:2201", "Stuttgart Nordbahnhof", (48.80216, 9.18394)),
+    ("de:08111:6333", "Stuttgart-Feuerbach", (48.81602, 9.16839)),
+    ("de:08116:7800", "Esslingen (N)", (48.73734, 9.30553)),
+    ("de:08111:355", "Stuttgart Charlottenplatz", (48.77670, 9.18359)),
+    ("de:08111:6021", "Vaihingen", (48.72608, 9.11584)),
+]
+_LINES = [("S1", "Herrenberg"), ("S2", "Filderstadt"), ("U6", "Fasanenhof"), ("U14", "Remseck")]
+
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _stop(index, planned, delay, arrival):
+    stop_id, name, coord = _STOPS[index % len(_STOPS)]
+    key = "arrivalTime" if arrival else "departureTime"
+    return {
+        "isGlobalId": True,
+        "id": stop_id,
+        "name": name,
+        "disassembledName": name.split(" ", 1)[-1],
+        "type": "platform",
+        "pointType": "",
+        "coord": list(coord),
+        "niveau": 0,
+        "parent": {"id": stop_id, "name": name, "type": "stop"},
+        f"{key}Planned": _iso(planned),
+        f"{key}Estimated": _iso(planned + timedelta(minutes=delay)),
+        "properties": {"platform": str(index % 4 + 1), "platformName": f"Gleis {index % 4 + 1}"},
+    }
+
+
+def _leg(rng, start, origin_index, stops):
+    number, direction = rng.choice(_LINES)
+    delay = rng.choice([0, 0, 0, 1, 2, 5])
+    ride = timedelta(minutes=2 * stops)
+    sequence = [
+        _stop(origin_index + i, start + timedelta(minutes=2 * i), delay, arrival=i > 0)
+        for i in range(stops + 1)
+    ]
+    return {
+        "duration": int(ride.total_seconds()),
+        "isRealtimeControlled": True,
+        "origin": _stop(origin_index, start, delay, arrival=False),
+        "destination": _stop(origin_index + stops, start + ride, delay, arrival=True),
+        "transportation": {
+            "id": f"vvs:1000{number[1:]}: :H:j26",
+            "name": f"S-Bahn {number}" if number.startswith("S") else f"Stadtbahn {number}",
+            "disassembledName": number,
+            "number": number,
+            "description": f"{_STOPS[origin_index % len(_STOPS)][1]} - {direction}",
+            "product": {"id": 0, "class": 1, "name": "S-Bahn", "iconId": 2},
+            "operator": {"code": "DB", "id": "DB", "name": "DB Regio AG"},
+            "destination": {"id": "de:08115:3212", "name": direction, "type": "stop"},
+            "properties": {"trainName": number, "tripCode": rng.randint(1, 9999)},
+        },
+        "stopSequence": sequence,
+        "coords": [[48.7 + i / 1000, 9.1 + i / 1000] for i in range(stops * 12)],
+        "infos": [
+            {
+                "priority": "normal",
+                "id": "vvs_1234",
+                "version": 3,
+                "type": "lineInfo",
+                "urlText": "Bauarbeiten zwischen Schwabstraße und Vaihingen",
+                "content": "Wegen Bauarbeiten verkehren die Züge mit geänderten Fahrzeiten.",
+                "subtitle": "Bauarbeiten",
+                "timestamps": {
+                    "validity": [
+                        {"from": "2026-01-01T00:00:00Z", "to": "2026-12-31T23:59:00Z"}
+                    ]
+                },
+            }
+        ],
+        "footPathInfo": [],
+        "interchange": None,
+        "properties": {},
+    }
+
+
+def trips(count, legs_per_trip, seed=1):
+    rng = random.Random(seed)
+    start = datetime(2026, 3, 2, 7, 0)
+    journeys = []
+    for i in range(count):
+        departure = start + timedelta(minutes=10 * i)
+        legs = []
+        origin_index = 0
+        for _ in range(legs_per_trip):
+            stops = rng.randint(2, 6)
+            legs.append(_leg(rng, departure, origin_index, stops))
+            departure += timedelta(minutes=2 * stops + 4)
+            origin_index += stops
+        journeys.append(
+            {
+                "rating": 0,
+                "isAdditional": False,
+                "interchanges": legs_per_trip - 1,
+                "legs": legs,
+                "fare": {
+                    "tickets": [{"id": "Einzelticket", "priceBrutto": 3.5}],
+                    "zones": [{"net": "vvs", "toLeg": 0, "fromLeg": 0, "zones": ["1", "2"]}],
+                },
+            }
+        )
+    return {"version": "10.2.10.139", "systemMessages": [], "journeys": journeys}
+
+
+def _dm_entry(rng, when, key, delay):
+    number, direction = rng.choice(_LINES)
+    real = when + timedelta(minutes=delay)
+    return {
+        "stopID": "5006115",
+        "x": "9.18212",
+        "y": "48.78464",
+        "mapName": "WGS84[DD.ddddd]",
+        "area": "1",
+        "platform": str(rng.randint(1, 4)),
+        "platformName": f"Gleis {rng.randint(1, 4)}",
+        "stopName": "Hauptbahnhof (tief)",
+        "nameWO": "Hauptbahnhof (tief)",
+        "pointType": "Gleis",
+        "countdown": str(delay + 2),
+        "realtimeStatus": "MONITORED",
+        key: {
+            "year": str(when.year),
+            "month": str(when.month),
+            "day": str(when.day),
+            "weekday": "2",
+            "hour": str(when.hour),
+            "minute": str(when.minute),
+        },
+        "real" + key[0].upper() + key[1:]: {
+            "year": str(real.year),
+            "month": str(real.month),
+            "day": str(real.day),
+            "weekday": "2",
+            "hour": str(real.hour),
+            "minute": str(real.minute),
+        },
+        "servingLine": {
+            "key": "1",
+            "code": "1",
+            "number": number,
+            "symbol": number,
+            "motType": "1",
+            "mtSubCode": "0",
+            "realtime": "1",
+            "direction": direction,
+            "directionFrom": "Kirchheim (T)",
+            "name": "S-Bahn",
+            "liErgRiProj": {"line": "10001", "project": "j26", "direction": "H", "supplement": " ", "network": "ddb"},
+            "destID": "5003212",
+            "stateless": f"ddb:1000{number[1:]}: :H:j26",
+        },
+        "operator": {"code": "DB", "name": "DB Regio AG", "publicCode": "DB"},
+        "lineInfos": None,
+        "stopInfos": None,
+    }
+
+
+def dm(count, list_name, item_name, seed=2):
+    rng = random.Random(seed)
+    start = datetime(2026, 3, 2, 7, 0)
+    entries = [
+        _dm_entry(rng, start + timedelta(minutes=3 * i), "dateTime", rng.choice([0, 0, 1, 3]))
+        for i in range(count)
+    ]
+    if count == 1:  # the DM endpoint returns a single result as a dict
+        return {list_name: {item_name: entries[0]}}
+    return {list_name: entries}
+
+
+CORPUS = {
+    "trips_small": lambda: trips(3, 1),
+    "trips_large": lambda: trips(100, 3),
+    "departures_single": lambda: dm(1, "departureList", "departure"),
+    "departures_list": lambda: dm(40, "departureList", "departure"),
+    "arrivals_list": lambda: dm(40, "arrivalList", "arrival"),
+}
+
+
+def main():
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    for name, build in CORPUS.items():
+        path = os.path.join(CORPUS_DIR, f"{name}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(build(), f, ensure_ascii=False)
+        print(f"{path}: {os.path.getsize(path) / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Record live EFA responses into the benchmark corpus.
+
+Needs network access. Recorded files replace the synthetic ones built by
+``make_corpus.py`` and are picked up by ``run.py`` and the replay server.
+
+    python benchmarks/record.py [station_id] [destination_id]
+"""
+
+import json
+import os
+import sys
+
+# Appended, not prepended: the integration's platform modules (e.g. calendar.py)
+# would shadow the standard library otherwise
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "custom_components", "vvs"))
+
+import vvspy  # noqa: E402
+
+from make_corpus import CORPUS_DIR  # noqa: E402
+
+
+def _save(name, response):
+    response.encoding = "UTF-8"
+    path = os.path.join(CORPUS_DIR, f"{name}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(response.json(), f, ensure_ascii=False)
+    print(f"{path}: {os.path.getsize(path) / 1024:.1f} KiB")
+
+
+def main():
+    station = sys.argv[1] if len(sys.argv) > 1 else "5006115"  # Stuttgart main station
+    destination = sys.argv[2] if len(sys.argv) > 2 else "5006465"  # Zuffenhausen
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+
+    _save("trips_small", vvspy.get_trips(station, destination, limit=3, return_response=True))
+    _save("trips_large", vvspy.get_trips(station, destination, limit=100, return_response=True))
+    _save("departures_single", vvspy.get_departures(station, limit=1, return_response=True))
+    _save("departures_list", vvspy.get_departures(station, limit=40, return_response=True))
+    _save("arrivals_list", vvspy.get_arrivals(station, limit=40, return_response=True))
+
+
+if __name__ == "__main__":
+    main()
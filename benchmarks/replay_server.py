@@ -0,0 +1,92 @@
+"""Local stand-in for the VVS EFA endpoints, serving recorded responses.
+
+Requests are answered from ``corpus/<scenario>.json`` where the scenario is the
+first path segment, e.g. ``/trips_large/mngvvs/XML_TRIP_REQUEST2``. Use
+:class:`ReplayAdapter` to point a ``requests.Session`` (and thereby vvspy) at
+the server without touching vvspy itself.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, urlunsplit
+import os
+import socket
+import threading
+
+from requests.adapters import HTTPAdapter
+
+from make_corpus import CORPUS_DIR
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately, don't let Nagle delay the body
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        scenario = urlsplit(self.path).path.strip("/").split("/", 1)[0]
+        body = self.server.responses.get(scenario)
+        if body is None:
+            self.send_error(404, f"Unknown scenario {scenario}")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """HTTP server answering with the corpus files, kept in memory."""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__((host, port), _ReplayHandler)
+        self.responses = {}
+        for name in os.listdir(CORPUS_DIR):
+            if name.endswith(".json"):
+                with open(os.path.join(CORPUS_DIR, name), "rb") as f:
+                    self.responses[name[: -len(".json")]] = f.read()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter sending every request to the replay server instead."""
+
+    def __init__(self, server_url, scenario, **kwargs):
+        super().__init__(**kwargs)
+        self._server = urlsplit(server_url)
+        self.scenario = scenario
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        request.url = urlunsplit(
+            (
+                self._server.scheme,
+                self._server.netloc,
+                f"/{self.scenario}{url.path}",
+                url.query,
+                "",
+            )
+        )
+        return super().send(request, **kwargs)
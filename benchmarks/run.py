@@ -0,0 +1,200 @@
+"""Offline benchmarks for vvspy fetching and parsing.
+
+Serves the response corpus from a local replay server and measures per
+endpoint:
+
+* end-to-end latency of the public ``vvspy.get_*`` call (HTTP, JSON decode, parse)
+* parse throughput of ``_parse_response`` on the decoded payload
+* peak traced memory while parsing and the memory/blocks retained by the result
+
+    python benchmarks/run.py [--iterations N] [--scenario NAME] [--save out.json] [--compare old.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Appended, not prepended: the integration's platform modules (e.g. calendar.py)
+# would shadow the standard library otherwise
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "custom_components", "vvs"))
+
+import requests  # noqa: E402
+
+import vvspy  # noqa: E402
+from vvspy import arrivals, departures, trip  # noqa: E402
+
+import make_corpus  # noqa: E402
+from replay_server import ReplayAdapter, ReplayServer  # noqa: E402
+
+SCENARIOS = {
+    "trips_small": (
+        lambda session: vvspy.get_trips("5006115", "5006465", limit=100, session=session),
+        trip._parse_response,
+    ),
+    "trips_large": (
+        lambda session: vvspy.get_trips("5006115", "5006465", limit=100, session=session),
+        trip._parse_response,
+    ),
+    "departures_single": (
+        lambda session: vvspy.get_departures("5006115", limit=1, session=session),
+        departures._parse_response,
+    ),
+    "departures_list": (
+        lambda session: vvspy.get_departures("5006115", limit=40, session=session),
+        departures._parse_response,
+    ),
+    "arrivals_list": (
+        lambda session: vvspy.get_arrivals("5006115", limit=40, session=session),
+        arrivals._parse_response,
+    ),
+}
+
+
+def _ensure_corpus():
+    missing = [
+        name
+        for name in make_corpus.CORPUS
+        if not os.path.exists(os.path.join(make_corpus.CORPUS_DIR, f"{name}.json"))
+    ]
+    if missing:
+        print(f"Building missing corpus files: {', '.join(missing)}")
+        make_corpus.main()
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def bench_latency(server, scenario, fetch, iterations):
+    session = requests.Session()
+    session.mount("https://", ReplayAdapter(server.url, scenario))
+    session.mount("http://", ReplayAdapter(server.url, scenario))
+    fetch(session)  # warm up the connection
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fetch(session)
+        timings.append((time.perf_counter() - start) * 1000)
+    session.close()
+    return {
+        "latency_p50_ms": statistics.median(timings),
+        "latency_p95_ms": _percentile(timings, 0.95),
+        "latency_mean_ms": statistics.fmean(timings),
+    }
+
+
+def bench_parse(payload, parse, min_seconds=1.0):
+    items = len(parse(payload))
+    runs = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_seconds:
+        parse(payload)
+        runs += 1
+        elapsed = time.perf_counter() - start
+    return {
+        "parse_ms": elapsed / runs * 1000,
+        "parse_ops_per_s": runs / elapsed,
+        "parse_items_per_s": runs * items / elapsed,
+        "items": items,
+    }
+
+
+def bench_memory(payload, parse):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = parse(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    retained = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del result
+    return {
+        "peak_kib": peak / 1024,
+        "retained_kib": retained / 1024,
+        "retained_blocks": blocks,
+    }
+
+
+def run(iterations, only=None):
+    _ensure_corpus()
+    server = ReplayServer().start()
+    results = {}
+    try:
+        for scenario, (fetch, parse) in SCENARIOS.items():
+            if only and scenario not in only:
+                continue
+            with open(os.path.join(make_corpus.CORPUS_DIR, f"{scenario}.json"), encoding="utf-8") as f:
+                payload = json.load(f)
+            result = {"response_kib": len(server.responses[scenario]) / 1024}
+            result.update(bench_latency(server, scenario, fetch, iterations))
+            result.update(bench_parse(payload, parse))
+            result.update(bench_memory(payload, parse))
+            results[scenario] = result
+    finally:
+        server.stop()
+    return results
+
+
+_COLUMNS = [
+    ("response_kib", "resp KiB", "{:.1f}"),
+    ("items", "items", "{:d}"),
+    ("latency_p50_ms", "p50 ms", "{:.2f}"),
+    ("latency_p95_ms", "p95 ms", "{:.2f}"),
+    ("parse_ms", "parse ms", "{:.3f}"),
+    ("parse_items_per_s", "items/s", "{:.0f}"),
+    ("peak_kib", "peak KiB", "{:.1f}"),
+    ("retained_blocks", "blocks", "{:d}"),
+]
+
+
+def print_table(results, baseline=None):
+    header = f"{'scenario':<20}" + "".join(f"{title:>12}" for _, title, _ in _COLUMNS)
+    print(header)
+    print("-" * len(header))
+    for scenario, result in results.items():
+        line = f"{scenario:<20}"
+        for key, _, fmt in _COLUMNS:
+            line += f"{fmt.format(result[key]):>12}"
+        print(line)
+        if baseline and scenario in baseline:
+            line = f"{'  vs baseline':<20}"
+            for key, _, _ in _COLUMNS:
+                old = baseline[scenario].get(key)
+                if old:
+                    line += f"{(result[key] - old) / old * 100:>+11.1f}%"
+                else:
+                    line += f"{'':>12}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS))
+    parser.add_argument("--save", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.scenario)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,12 @@
 
 from __future__ import annotations
 
+from importlib import import_module
 import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-import os
-import sys
-
-current_path = os.path.dirname(__file__)
-if current_path not in sys.path:
-    sys.path.append(current_path)
-
 from .const import (
     DOMAIN,
     CONF_START,
@@ -21,26 +15,104 @@ from .const import (
     CONF_MAX_CONNECTIONS,
     CONF_ROUTE_TYPE,
     CONF_OFFSET,
+    CONF_BOARD_MODE,
+    CONF_ENTRY_TYPE,
+    CONF_STATION,
+    CONF_BOARD_TYPE,
+    CONF_LINES,
+    CONF_PLATFORM,
+    CONF_DIRECTION,
+    CONF_RECORD_HISTORY,
+    CONF_TRACKER,
+    CONF_MOVE_THRESHOLD,
+    DEFAULT_BOARD_MODE,
+    DEFAULT_MOVE_THRESHOLD,
+    DEFAULT_RECORD_HISTORY,
+    ENTRY_TYPE_BOARD,
+    ENTRY_TYPE_LOCATION,
+    ENTRY_TYPE_MULTI,
+    ENTRY_TYPE_ROUTE,
+    ROUTE_TYPE_COMPARE,
+)
+from .coordinator import (
+    VVSDataUpdateCoordinator,
+    VVSLocationCoordinator,
+    VVSMultiRouteCoordinator,
+    VVSStationBoardCoordinator,
 )
-from .coordinator import VVSDataUpdateCoordinator
+from .history import async_get_history
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[str] = ["sensor"]
+PLATFORMS: list[str] = ["calendar", "sensor"]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up VVS from a config entry."""
-
-    coordinator = VVSDataUpdateCoordinator(
-        hass,
-        start_station=entry.data[CONF_START],
-        dest_station=entry.data[CONF_DESTINATION],
-        limit=entry.data[CONF_MAX_CONNECTIONS],
-        route_type=entry.data[CONF_ROUTE_TYPE],
-        offset=entry.data[CONF_OFFSET],
+    # Station names come from a large enum, don't import it in the event loop
+    await hass.async_add_import_executor_job(
+        import_module, f"{__name__}.vvspy.enums.stations"
     )
 
+    entry_type = entry.data.get(CONF_ENTRY_TYPE, ENTRY_TYPE_ROUTE)
+    if entry_type == ENTRY_TYPE_BOARD:
+        coordinator = VVSStationBoardCoordinator(
+            hass,
+            station=entry.data[CONF_STATION],
+            board_type=entry.data[CONF_BOARD_TYPE],
+            limit=entry.data[CONF_MAX_CONNECTIONS],
+            lines=entry.data.get(CONF_LINES, ""),
+            platform=entry.data.get(CONF_PLATFORM, ""),
+            direction=entry.data.get(CONF_DIRECTION, ""),
+        )
+    elif entry_type == ENTRY_TYPE_LOCATION:
+        coordinator = VVSLocationCoordinator(
+            hass,
+            tracker=entry.data[CONF_TRACKER],
+            dest_station=entry.data[CONF_DESTINATION],
+            limit=entry.data[CONF_MAX_CONNECTIONS],
+            route_type=entry.data[CONF_ROUTE_TYPE],
+            threshold=entry.data.get(CONF_MOVE_THRESHOLD, DEFAULT_MOVE_THRESHOLD),
+        )
+        entry.async_on_unload(coordinator.async_start_pruning())
+        entry.async_on_unload(coordinator.async_track_position())
+        entry.async_on_unload(coordinator.async_release_window)
+    elif entry_type == ENTRY_TYPE_MULTI:
+        coordinator = VVSMultiRouteCoordinator(
+            hass,
+            origins=entry.data[CONF_START],
+            destinations=entry.data[CONF_DESTINATION],
+            limit=entry.data[CONF_MAX_CONNECTIONS],
+            route_type=entry.data[CONF_ROUTE_TYPE],
+        )
+        entry.async_on_unload(coordinator.async_start_pruning())
+    elif entry.data[CONF_ROUTE_TYPE] == ROUTE_TYPE_COMPARE:
+        # One entry requesting every route type (the departure board can't compare)
+        coordinator = VVSMultiRouteCoordinator(
+            hass,
+            origins=[entry.data[CONF_START]],
+            destinations=[entry.data[CONF_DESTINATION]],
+            limit=entry.data[CONF_MAX_CONNECTIONS],
+            route_type=ROUTE_TYPE_COMPARE,
+            offset=entry.data[CONF_OFFSET],
+        )
+        entry.async_on_unload(coordinator.async_start_pruning())
+    else:
+        coordinator = VVSDataUpdateCoordinator(
+            hass,
+            start_station=entry.data[CONF_START],
+            dest_station=entry.data[CONF_DESTINATION],
+            limit=entry.data[CONF_MAX_CONNECTIONS],
+            route_type=entry.data[CONF_ROUTE_TYPE],
+            offset=entry.data[CONF_OFFSET],
+            board_mode=entry.data.get(CONF_BOARD_MODE, DEFAULT_BOARD_MODE),
+        )
+        entry.async_on_unload(coordinator.async_start_pruning())
+        entry.async_on_unload(coordinator.async_release_window)
+
+    if entry.data.get(CONF_RECORD_HISTORY, DEFAULT_RECORD_HISTORY):
+        coordinator.history = await async_get_history(hass)
+
     await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
@@ -0,0 +1,17 @@
+"""Disruption and info messages shared by all VVS entries."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_MESSAGES
+from .vvspy.messages import MessageStore
+
+
+@callback
+def async_get_message_store(hass: HomeAssistant) -> MessageStore:
+    """Return the message store every coordinator feeds and reads its alerts from."""
+    if DATA_MESSAGES not in hass.data:
+        hass.data[DATA_MESSAGES] = MessageStore(dt_util.DEFAULT_TIME_ZONE)
+    return hass.data[DATA_MESSAGES]
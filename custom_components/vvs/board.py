@@ -0,0 +1,104 @@
+"""Station boards shared by all VVS entries using the same stop."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from functools import partial
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from . import vvspy
+from .const import (
+    BOARD_ARRIVALS,
+    BOARD_DEPARTURES,
+    BOARD_LIMIT,
+    BOARD_MAX_AGE,
+    DATA_BOARDS,
+)
+from .scheduler import PRIORITY_BACKGROUND, async_get_scheduler
+from .stats import VVSStatistics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VVSStationBoard:
+    """Departures or arrivals of one stop, fetched with a single DM request per refresh."""
+
+    def __init__(self, hass: HomeAssistant, station_id: str, kind: str) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.station_id = station_id
+        self.kind = kind
+        self._entries: list = []
+        self._limit = 0
+        self._fetched_at: datetime | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_get_entries(
+        self,
+        priority: int = PRIORITY_BACKGROUND,
+        limit: int = BOARD_LIMIT,
+        stats: VVSStatistics | None = None,
+    ) -> list:
+        """Return the board, requesting it only if the cached one is stale or too short.
+
+        Requests (or polls saved by the cache) are accounted in `stats`.
+        """
+        async with self._lock:
+            now = dt_util.utcnow()
+            if (
+                self._fetched_at is None
+                or now - self._fetched_at > BOARD_MAX_AGE
+                or limit > self._limit
+            ):
+                fetch = (
+                    vvspy.get_arrivals
+                    if self.kind == BOARD_ARRIVALS
+                    else vvspy.get_departures
+                )
+                # Keep serving the longest board any entry asked for
+                fetch_limit = max(limit, self._limit)
+                await async_get_scheduler(self.hass).async_acquire(priority)
+                events: list = []
+                try:
+                    self._entries = await self.hass.async_add_executor_job(
+                        partial(self._fetch, fetch, fetch_limit, events)
+                    )
+                finally:
+                    if stats is not None:
+                        stats.record_events(events)
+                self._limit = fetch_limit
+                self._fetched_at = now
+                _LOGGER.debug(
+                    "Fetched %s %s for %s",
+                    len(self._entries),
+                    self.kind,
+                    self.station_id,
+                )
+            elif stats is not None:
+                stats.record_saved()
+            return self._entries[:limit]
+
+    def _fetch(self, fetch, limit: int, events: list) -> list:
+        """Request the board, collecting the request events into `events`."""
+        with vvspy.instrumentation.capture() as captured:
+            try:
+                return fetch(self.station_id, limit=limit)
+            finally:
+                events.extend(captured)
+
+
+@callback
+def async_get_board(
+    hass: HomeAssistant, station_id: str, kind: str = BOARD_DEPARTURES
+) -> VVSStationBoard:
+    """Return the shared board of a stop."""
+    boards: dict[tuple[str, str], VVSStationBoard] = hass.data.setdefault(
+        DATA_BOARDS, {}
+    )
+    if (station_id, kind) not in boards:
+        boards[(station_id, kind)] = VVSStationBoard(hass, station_id, kind)
+    return boards[(station_id, kind)]
@@ -0,0 +1,123 @@
+"""VVS Calendar platform."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import CALENDAR_PLANNED_MAX_AGE, CALENDAR_PLANNED_TRIPS, DOMAIN
+from .coordinator import VVSDataUpdateCoordinator, departure_of
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the VVS calendar of a route."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    # Board entries only know times of day, not journeys
+    if isinstance(coordinator, VVSDataUpdateCoordinator):
+        async_add_entities([VVSCalendar(coordinator, entry)])
+
+
+def _aware(when: datetime) -> datetime:
+    """Aware UTC time of a naive UTC time of the trip models."""
+    return when.replace(tzinfo=timezone.utc)
+
+
+def trip_event(trip, planned: bool = False) -> CalendarEvent:
+    """A calendar event from departure to arrival of a trip."""
+    first, last = trip.connections[0], trip.connections[-1]
+    start = _aware(departure_of(trip))
+    end = _aware(
+        last.destination.arrival_time_estimated
+        or last.destination.arrival_time_planned
+    )
+    lines = [leg.transportation.number for leg in trip.connections]
+    summary = " → ".join(line for line in lines if line) or "Walk"
+    if any(leg.cancelled for leg in trip.connections):
+        summary = f"{summary} (cancelled)"
+
+    details = [f"{first.origin.name} → {last.destination.name}"]
+    if planned:
+        details.append("Planned, no realtime data yet")
+    elif first.origin.delay:
+        details.append(f"Departure delay: {first.origin.delay} min")
+    return CalendarEvent(
+        start=start,
+        # Events need a duration
+        end=max(end, start + timedelta(minutes=1)),
+        summary=summary,
+        description="\n".join(details),
+        location=first.origin.name,
+    )
+
+
+class VVSCalendar(CoordinatorEntity, CalendarEntity):
+    """Upcoming trips of a VVS route as calendar events.
+
+    Events come from the trips the coordinator already fetched (shown and
+    buffered), continued with the planned trips of the offline timetable if
+    there is one. Calendar queries never request the VVS API.
+    """
+
+    def __init__(
+        self, coordinator: VVSDataUpdateCoordinator, entry: ConfigEntry
+    ) -> None:
+        """Initialize the calendar."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_calendar"
+        self._attr_name = (
+            f"{coordinator.start_station_name} to {coordinator.dest_station_name}"
+        )
+        self._attr_icon = "mdi:calendar-clock"
+        self._planned: list = []
+        self._planned_at: datetime | None = None
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the next trip."""
+        trips = self.coordinator.known_trips()
+        return trip_event(trips[0]) if trips else None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the trips between `start_date` and `end_date`."""
+        trips = self.coordinator.known_trips()
+        events = [trip_event(trip) for trip in trips]
+
+        # Continue with planned trips where the fetched ones end
+        last = departure_of(trips[-1]) if trips else dt_util.utcnow().replace(tzinfo=None)
+        if end_date > _aware(last):
+            events.extend(
+                trip_event(trip, planned=True)
+                for trip in await self._async_planned_trips()
+                if departure_of(trip) > last
+            )
+        return [
+            event
+            for event in events
+            if event.end > start_date and event.start < end_date
+        ]
+
+    async def _async_planned_trips(self) -> list:
+        """Planned trips from now on, computed at most once per `CALENDAR_PLANNED_MAX_AGE`."""
+        now = dt_util.utcnow()
+        if (
+            self._planned_at is None
+            or now - self._planned_at > CALENDAR_PLANNED_MAX_AGE
+        ):
+            self._planned = await self.coordinator.async_get_planned_trips(
+                dt_util.as_local(now).replace(tzinfo=None), CALENDAR_PLANNED_TRIPS
+            )
+            self._planned_at = now
+        naive_now = now.replace(tzinfo=None)
+        return [trip for trip in self._planned if departure_of(trip) >= naive_now]
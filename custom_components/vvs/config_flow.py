@@ -1,13 +1,5 @@
 """Config flow for VVS integration."""
 
-import os
-import sys
-
-# Add the current folder to sys.path so 'import vvspy' works
-current_path = os.path.dirname(__file__)
-if current_path not in sys.path:
-    sys.path.append(current_path)
-
 import logging
 import re
 from typing import Any
@@ -17,6 +9,8 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.selector import (
+    EntitySelector,
+    EntitySelectorConfig,
     SelectSelector,
     SelectSelectorConfig,
     SelectSelectorMode,
@@ -24,7 +18,7 @@ from homeassistant.helpers.selector import (
 )
 import homeassistant.helpers.config_validation as cv
 
-from .vvspy.enums.stations import Station
+from . import vvspy
 
 from .const import (
     DOMAIN,
@@ -33,20 +27,53 @@ from .const import (
     CONF_OFFSET,
     CONF_ROUTE_TYPE,
     CONF_MAX_CONNECTIONS,
+    CONF_BOARD_MODE,
+    CONF_ENTRY_TYPE,
+    CONF_STATION,
+    CONF_BOARD_TYPE,
+    CONF_LINES,
+    CONF_PLATFORM,
+    CONF_DIRECTION,
+    CONF_RECORD_HISTORY,
+    CONF_TRACKER,
+    CONF_MOVE_THRESHOLD,
+    CONF_WALKING_TIME,
+    DEFAULT_BOARD_MODE,
+    DEFAULT_BOARD_ENTRIES,
+    DEFAULT_BOARD_TYPE,
     DEFAULT_OFFSET,
     DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MOVE_THRESHOLD,
+    DEFAULT_RECORD_HISTORY,
     DEFAULT_ROUTE_TYPE,
+    DEFAULT_WALKING_TIME,
+    BOARD_TYPE_OPTIONS,
+    ENTRY_TYPE_BOARD,
+    ENTRY_TYPE_LOCATION,
+    ENTRY_TYPE_MULTI,
+    ENTRY_TYPE_ROUTE,
+    MULTI_ROUTE_MAX_PAIRS,
+    NEARBY_STATIONS,
+    ROUTE_TYPE_COMPARE,
     ROUTE_TYPE_OPTIONS,
 )
+from .scheduler import PRIORITY_INTERACTIVE, async_get_scheduler
+from .timetable import async_get_stop_index
 
 _LOGGER = logging.getLogger(__name__)
 
 CONF_START_SEARCH = "start_search"
 CONF_DEST_SEARCH = "dest_search"
+CONF_STATION_SEARCH = "station_search"
+# Menu shortcut to a board of a station near the home zone
+MENU_NEARBY = "nearby"
 
 
 def get_station_matches(search_term: str) -> list[SelectOptionDict]:
     """Search the Station Enum, deduplicate variants, and return options."""
+    # Large enum, imported on first search instead of when the flow is loaded
+    from .vvspy.enums.stations import Station
+
     clean_term = search_term.lower().replace(" ", "_")
 
     matches = []
@@ -68,16 +95,53 @@ def get_station_matches(search_term: str) -> list[SelectOptionDict]:
     return sorted(matches, key=lambda x: x["label"])
 
 
+async def async_get_station_matches(
+    hass: HomeAssistant, search_term: str
+) -> list[SelectOptionDict]:
+    """Search the stations in the executor, the enum is too large for the event loop."""
+    return await hass.async_add_executor_job(get_station_matches, search_term)
+
+
+async def async_get_stations_matches(
+    hass: HomeAssistant, search_terms: str
+) -> list[SelectOptionDict]:
+    """Matches of several comma separated search terms, each term needs a match."""
+    options: dict[str, SelectOptionDict] = {}
+    for term in search_terms.split(","):
+        matches = await async_get_station_matches(hass, term.strip())
+        if not matches:
+            return []
+        options.update((option["value"], option) for option in matches)
+    return sorted(options.values(), key=lambda x: x["label"])
+
+
+async def async_get_nearby_stations(hass: HomeAssistant) -> list[tuple[str, str, float]]:
+    """Stations closest to the home zone, empty without an offline timetable."""
+    index = await async_get_stop_index(hass)
+    if not index:
+        return []
+    return await hass.async_add_executor_job(
+        index.nearest, hass.config.latitude, hass.config.longitude, NEARBY_STATIONS
+    )
+
+
 async def validate_connection(
     hass: HomeAssistant, data: dict[str, Any]
 ) -> dict[str, Any]:
     """Validate that the selected specific stations actually have a connection."""
-    import vvspy
+
+    # Any route type proves the connection, comparing requests all of them
+    route_type = (
+        DEFAULT_ROUTE_TYPE
+        if data[CONF_ROUTE_TYPE] == ROUTE_TYPE_COMPARE
+        else data[CONF_ROUTE_TYPE]
+    )
 
     def _test_connection():
-        return vvspy.get_trips(data[CONF_START], data[CONF_DESTINATION], limit=1, routeType=data[CONF_ROUTE_TYPE])
+        return vvspy.get_trips(data[CONF_START], data[CONF_DESTINATION], limit=1, routeType=route_type)
 
     try:
+        await async_get_scheduler(hass).async_acquire(PRIORITY_INTERACTIVE)
         result = await hass.async_add_executor_job(_test_connection)
     except Exception as err:
         _LOGGER.exception("VVS connection test failed")
@@ -89,6 +153,24 @@ async def validate_connection(
     return {"success": True}
 
 
+async def validate_station(
+    hass: HomeAssistant, data: dict[str, Any]
+) -> dict[str, Any]:
+    """Validate that the board of the selected station can be fetched."""
+
+    def _test_board():
+        return vvspy.get_departures(data[CONF_STATION], limit=1)
+
+    try:
+        await async_get_scheduler(hass).async_acquire(PRIORITY_INTERACTIVE)
+        await hass.async_add_executor_job(_test_board)
+    except Exception as err:
+        _LOGGER.exception("VVS board test failed")
+        raise Exception(f"Connection Error: {str(err)}") from err
+
+    return {"success": True}
+
+
 class VVSConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for VVS."""
 
@@ -97,9 +179,35 @@ class VVSConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self):
         """Initialize the flow state."""
         self._search_data = {}
+        # Stations offered by the nearby step instead of a search, id -> name
+        self._nearby: dict[str, str] = {}
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Step 0: Choose between a route and a station board."""
+        menu_options = [
+            ENTRY_TYPE_ROUTE,
+            ENTRY_TYPE_MULTI,
+            ENTRY_TYPE_BOARD,
+            ENTRY_TYPE_LOCATION,
+        ]
+        if await async_get_nearby_stations(self.hass):
+            menu_options.append(MENU_NEARBY)
+        return self.async_show_menu(step_id="user", menu_options=menu_options)
+
+    async def async_step_nearby(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Board step 1 without a search: offer the stations around the home zone."""
+        self._nearby = {
+            station_id: name
+            for station_id, name, _ in await async_get_nearby_stations(self.hass)
+        }
+        return await self.async_step_select_board()
+
+    async def async_step_route(
+        self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Step 1: Ask user for search terms and validate matches exist."""
         errors = {}
@@ -125,8 +233,8 @@ class VVSConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             if not errors:
                 # 2. Check if matches actually exist
-                start_matches = get_station_matches(start_term)
-                dest_matches = get_station_matches(dest_term)
+                start_matches = await async_get_station_matches(self.hass, start_term)
+                dest_matches = await async_get_station_matches(self.hass, dest_term)
 
                 if not start_matches:
                     errors[CONF_START_SEARCH] = "no_start_matches"
@@ -138,7 +246,7 @@ class VVSConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return await self.async_step_select_stations()
 
         return self.async_show_form(
-            step_id="user",
+            step_id="route",
             data_schema=vol.Schema(
                 {
                     vol.Required(CONF_START_SEARCH, default=default_start): cv.string,
@@ -155,10 +263,20 @@ class VVSConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
 
         # Re-run search to populate dropdowns (fast enough to not need caching)
-        start_options = get_station_matches(self._search_data[CONF_START_SEARCH])
-        dest_options = get_station_matches(self._search_data[CONF_DEST_SEARCH])
+        start_options = await async_get_station_matches(
+            self.hass, self._search_data[CONF_START_SEARCH]
+        )
+        dest_options = await async_get_station_matches(
+            self.hass, self._search_data[CONF_DEST_SEARCH]
+        )
 
-        if user_input is not None:
+        if user_input is not None and (
+            user_input[CONF_ROUTE_TYPE] == ROUTE_TYPE_COMPARE
+            and user_input.get(CONF_BOARD_MODE, DEFAULT_BOARD_MODE)
+        ):
+            # The departure board can't tell the route types apart
+            errors["base"] = "compare_board_mode"
+        elif user_input is not None:
             try:
                 await validate_connection(self.hass, user_input)
 
@@ -181,7 +299,8 @@ class VVSConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
                 return self.async_create_entry(
-                    title=f"{start_label} - {dest_label}", data=user_input
+                    title=f"{start_label} - {dest_label}",
+                    data={CONF_ENTRY_TYPE: ENTRY_TYPE_ROUTE, **user_input},
                 )
             except Exception:
                 errors["base"] = "unknown_error"
@@ -203,6 +322,9 @@ class VVSConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         )
                     ),
                     vol.Optional(CONF_OFFSET, default=DEFAULT_OFFSET): cv.positive_int,
+                    vol.Optional(
+                        CONF_WALKING_TIME, default=DEFAULT_WALKING_TIME
+                    ): cv.positive_int,
                     vol.Optional(
                         CONF_MAX_CONNECTIONS, default=DEFAULT_MAX_CONNECTIONS
                     ): cv.positive_int,
@@ -215,7 +337,354 @@ class VVSConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                             translation_key=CONF_ROUTE_TYPE,
                         )
                     ),
+                    vol.Optional(
+                        CONF_BOARD_MODE, default=DEFAULT_BOARD_MODE
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_RECORD_HISTORY, default=DEFAULT_RECORD_HISTORY
+                    ): cv.boolean,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_board(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Board step 1: Ask user for the station search term."""
+        errors = {}
+        default_station = ""
+
+        if user_input is not None:
+            self._search_data = user_input
+            default_station = user_input[CONF_STATION_SEARCH]
+
+            if len(default_station) < 3:
+                errors[CONF_STATION_SEARCH] = "search_too_short"
+            elif not await async_get_station_matches(self.hass, default_station):
+                errors[CONF_STATION_SEARCH] = "no_station_matches"
+
+            if not errors:
+                return await self.async_step_select_board()
+
+        return self.async_show_form(
+            step_id="board",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_STATION_SEARCH, default=default_station
+                    ): cv.string,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_select_board(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Board step 2: Select the station and what to show."""
+        errors = {}
+
+        if self._nearby:
+            station_options = await self._async_nearby_options()
+        else:
+            station_options = await async_get_station_matches(
+                self.hass, self._search_data[CONF_STATION_SEARCH]
+            )
+
+        if user_input is not None:
+            try:
+                await validate_station(self.hass, user_input)
+
+                station_label = self._nearby.get(user_input[CONF_STATION]) or next(
+                    (
+                        o["label"]
+                        for o in station_options
+                        if o["value"] == user_input[CONF_STATION]
+                    ),
+                    user_input[CONF_STATION],
+                )
+
+                return self.async_create_entry(
+                    title=f"{station_label} ({user_input[CONF_BOARD_TYPE]})",
+                    data={CONF_ENTRY_TYPE: ENTRY_TYPE_BOARD, **user_input},
+                )
+            except Exception:
+                errors["base"] = "unknown_error"
+
+        return self.async_show_form(
+            step_id="select_board",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_STATION): SelectSelector(
+                        SelectSelectorConfig(
+                            options=station_options,
+                            mode=SelectSelectorMode.DROPDOWN,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_BOARD_TYPE, default=DEFAULT_BOARD_TYPE
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=BOARD_TYPE_OPTIONS,
+                            mode=SelectSelectorMode.DROPDOWN,
+                            translation_key=CONF_BOARD_TYPE,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_MAX_CONNECTIONS, default=DEFAULT_BOARD_ENTRIES
+                    ): cv.positive_int,
+                    vol.Optional(CONF_LINES, default=""): cv.string,
+                    vol.Optional(CONF_PLATFORM, default=""): cv.string,
+                    vol.Optional(CONF_DIRECTION, default=""): cv.string,
+                    vol.Optional(
+                        CONF_RECORD_HISTORY, default=DEFAULT_RECORD_HISTORY
+                    ): cv.boolean,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_location(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Location step 1: Choose the tracker and search the destination."""
+        errors = {}
+        default_dest = ""
+
+        if user_input is not None:
+            self._search_data = user_input
+            default_dest = user_input[CONF_DEST_SEARCH]
+
+            if len(default_dest) < 3:
+                errors[CONF_DEST_SEARCH] = "search_too_short"
+            elif not await async_get_station_matches(self.hass, default_dest):
+                errors[CONF_DEST_SEARCH] = "no_dest_matches"
+
+            if not errors:
+                return await self.async_step_select_location()
+
+        return self.async_show_form(
+            step_id="location",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_TRACKER): EntitySelector(
+                        EntitySelectorConfig(domain=["device_tracker", "person"])
+                    ),
+                    vol.Required(CONF_DEST_SEARCH, default=default_dest): cv.string,
                 }
             ),
             errors=errors,
         )
+
+    async def async_step_select_location(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Location step 2: Select the destination and the route options."""
+        errors = {}
+
+        dest_options = await async_get_station_matches(
+            self.hass, self._search_data[CONF_DEST_SEARCH]
+        )
+
+        if user_input is not None:
+            try:
+                # The origin is only known at runtime, check the destination exists
+                await validate_station(
+                    self.hass, {CONF_STATION: user_input[CONF_DESTINATION]}
+                )
+
+                tracker = self._search_data[CONF_TRACKER]
+                state = self.hass.states.get(tracker)
+                dest_label = next(
+                    (
+                        o["label"]
+                        for o in dest_options
+                        if o["value"] == user_input[CONF_DESTINATION]
+                    ),
+                    user_input[CONF_DESTINATION],
+                )
+
+                return self.async_create_entry(
+                    title=f"{state.name if state else tracker} - {dest_label}",
+                    data={
+                        CONF_ENTRY_TYPE: ENTRY_TYPE_LOCATION,
+                        CONF_TRACKER: tracker,
+                        **user_input,
+                    },
+                )
+            except Exception:
+                errors["base"] = "unknown_error"
+
+        return self.async_show_form(
+            step_id="select_location",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_DESTINATION): SelectSelector(
+                        SelectSelectorConfig(
+                            options=dest_options,
+                            mode=SelectSelectorMode.DROPDOWN,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_MAX_CONNECTIONS, default=DEFAULT_MAX_CONNECTIONS
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_ROUTE_TYPE, default=DEFAULT_ROUTE_TYPE
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[
+                                option
+                                for option in ROUTE_TYPE_OPTIONS
+                                if option != ROUTE_TYPE_COMPARE
+                            ],
+                            mode=SelectSelectorMode.DROPDOWN,
+                            translation_key=CONF_ROUTE_TYPE,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_MOVE_THRESHOLD, default=DEFAULT_MOVE_THRESHOLD
+                    ): cv.positive_int,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_multi(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Multi step 1: Search several start and/or destination stations."""
+        errors = {}
+        default_start = ""
+        default_dest = ""
+
+        if user_input is not None:
+            self._search_data = user_input
+            default_start = user_input[CONF_START_SEARCH]
+            default_dest = user_input[CONF_DEST_SEARCH]
+
+            for field, terms, error in (
+                (CONF_START_SEARCH, default_start, "no_start_matches"),
+                (CONF_DEST_SEARCH, default_dest, "no_dest_matches"),
+            ):
+                if any(len(term.strip()) < 3 for term in terms.split(",")):
+                    errors[field] = "search_too_short"
+                elif not await async_get_stations_matches(self.hass, terms):
+                    errors[field] = error
+
+            if not errors:
+                return await self.async_step_select_multi()
+
+        return self.async_show_form(
+            step_id="multi",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_START_SEARCH, default=default_start): cv.string,
+                    vol.Required(CONF_DEST_SEARCH, default=default_dest): cv.string,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_select_multi(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Multi step 2: Select the start and destination stations to combine."""
+        errors = {}
+
+        start_options = await async_get_stations_matches(
+            self.hass, self._search_data[CONF_START_SEARCH]
+        )
+        dest_options = await async_get_stations_matches(
+            self.hass, self._search_data[CONF_DEST_SEARCH]
+        )
+
+        if user_input is not None:
+            pairs = [
+                (start, dest)
+                for start in user_input[CONF_START]
+                for dest in user_input[CONF_DESTINATION]
+                if start != dest
+            ]
+            if not pairs:
+                errors["base"] = "no_pairs"
+            elif (
+                # Comparing requests every other route type for every pair
+                len(pairs) * (len(ROUTE_TYPE_OPTIONS) - 1)
+                if user_input[CONF_ROUTE_TYPE] == ROUTE_TYPE_COMPARE
+                else len(pairs)
+            ) > MULTI_ROUTE_MAX_PAIRS:
+                errors["base"] = "too_many_pairs"
+            else:
+                try:
+                    await validate_connection(
+                        self.hass,
+                        {
+                            CONF_START: pairs[0][0],
+                            CONF_DESTINATION: pairs[0][1],
+                            CONF_ROUTE_TYPE: user_input[CONF_ROUTE_TYPE],
+                        },
+                    )
+
+                    labels = {
+                        o["value"]: o["label"] for o in start_options + dest_options
+                    }
+                    start_label = " / ".join(
+                        labels.get(start, start) for start in user_input[CONF_START]
+                    )
+                    dest_label = " / ".join(
+                        labels.get(dest, dest) for dest in user_input[CONF_DESTINATION]
+                    )
+
+                    return self.async_create_entry(
+                        title=f"{start_label} - {dest_label}",
+                        data={CONF_ENTRY_TYPE: ENTRY_TYPE_MULTI, **user_input},
+                    )
+                except Exception:
+                    errors["base"] = "unknown_error"
+
+        return self.async_show_form(
+            step_id="select_multi",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_START): SelectSelector(
+                        SelectSelectorConfig(
+                            options=start_options,
+                            mode=SelectSelectorMode.DROPDOWN,
+                            multiple=True,
+                        )
+                    ),
+                    vol.Required(CONF_DESTINATION): SelectSelector(
+                        SelectSelectorConfig(
+                            options=dest_options,
+                            mode=SelectSelectorMode.DROPDOWN,
+                            multiple=True,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_MAX_CONNECTIONS, default=DEFAULT_MAX_CONNECTIONS
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_WALKING_TIME, default=DEFAULT_WALKING_TIME
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_ROUTE_TYPE, default=DEFAULT_ROUTE_TYPE
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=list(ROUTE_TYPE_OPTIONS.keys()),
+                            mode=SelectSelectorMode.DROPDOWN,
+                            translation_key=CONF_ROUTE_TYPE,
+                        )
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
+    async def _async_nearby_options(self) -> list[SelectOptionDict]:
+        """Nearby stations with their distance, closest first."""
+        return [
+            {"label": f"{name} ({meters:.0f} m)", "value": station_id}
+            for station_id, name, meters in await async_get_nearby_stations(self.hass)
+            if station_id in self._nearby
+        ]
@@ -9,17 +9,127 @@ CONF_OFFSET = "offset"
 CONF_ROUTE_TYPE = "route_type"
 CONF_MAX_CONNECTIONS = "max_connections"
 CONF_Limit = "limit"
+CONF_BOARD_MODE = "departure_board"
+CONF_ENTRY_TYPE = "entry_type"
+CONF_STATION = "station"
+CONF_BOARD_TYPE = "board_type"
+CONF_LINES = "lines"
+CONF_PLATFORM = "platform"
+CONF_DIRECTION = "direction"
+CONF_RECORD_HISTORY = "record_history"
+CONF_TRACKER = "tracker"
+CONF_MOVE_THRESHOLD = "move_threshold"
+CONF_WALKING_TIME = "walking_time"
+
+# Entry types (entries created before entry types existed are routes)
+ENTRY_TYPE_ROUTE = "route"
+ENTRY_TYPE_BOARD = "board"
+ENTRY_TYPE_LOCATION = "location"
+ENTRY_TYPE_MULTI = "multi"
+
+# Station board contents
+BOARD_DEPARTURES = "departures"
+BOARD_ARRIVALS = "arrivals"
+BOARD_BOTH = "both"
 
 # Default update interval
 SCAN_INTERVAL = timedelta(minutes=2)
 
+# Request budget shared by all entries (token bucket)
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+REQUEST_BUDGET_PER_MINUTE = 20
+REQUEST_BURST = 3
+
+# Refreshes for trips departing within this window get a higher priority
+NEAR_DEPARTURE_WINDOW = timedelta(minutes=15)
+
+# Departure board mode: one DM request per origin stop shared by its routes
+DATA_BOARDS = f"{DOMAIN}_boards"
+BOARD_LIMIT = 40
+BOARD_MAX_AGE = timedelta(seconds=60)
+# Re-check the routing (and learn direct lines) at least this often
+BOARD_RELEARN_INTERVAL = timedelta(hours=1)
+
+# Upcoming trips buffered beyond the configured number, fetched in the background
+PREFETCH_TRIPS = 3
+# How often departed trips are dropped from the display between polls
+PRUNE_INTERVAL = timedelta(minutes=1)
+
+# Routes: one trip window per route shared by its entries, whatever their offset
+DATA_ROUTE_WINDOWS = f"{DOMAIN}_route_windows"
+# Just under the update interval: however its entries are staggered, a route is
+# refreshed once per interval and its other entries poll from the window
+ROUTE_WINDOW_MAX_AGE = SCAN_INTERVAL - timedelta(seconds=10)
+# Top-up requests at most per refresh when the window is too short for an offset
+ROUTE_WINDOW_TOP_UPS = 3
+
+# Board mode for routes with interchanges: planned trips requested at once and
+# kept up to date with the departure board of the origin stop
+PLANNED_TRIP_LIMIT = 10
+PLANNED_MAX_AGE = timedelta(hours=1)
+
+# Planned timetable built from the VVS GTFS feed (in the HA config directory)
+DATA_TIMETABLE = f"{DOMAIN}_timetable"
+TIMETABLE_FILE = "vvs_timetable.db"
+DATA_STOP_INDEX = f"{DOMAIN}_stop_index"
+NEARBY_STATIONS = 10
+
+# Delay history of the entries that opted in (in the HA config directory)
+DATA_HISTORY = f"{DOMAIN}_history"
+HISTORY_FILE = "vvs_history.db"
+HISTORY_KEEP_DAYS = 365
+HISTORY_DIAGNOSTICS_DAYS = 30
+
+# Trips departing later than this rarely have realtime data, their delay is
+# predicted from the recorded history instead
+PREDICTION_HORIZON = timedelta(minutes=30)
+PREDICTOR_TRAINING_DAYS = 60
+PREDICTOR_RETRAIN_INTERVAL = timedelta(hours=6)
+
+# Location-following routes: the origin is the stop nearest to a device tracker/person,
+# or the position itself (EFA walks to a stop) if no stop is this close (meters)
+LOCATION_MAX_STOP_DISTANCE = 1000
+# Request the trips again after this long even if the tracker didn't move
+LOCATION_TRIPS_MAX_AGE = timedelta(minutes=6)
+
+# Routes over several origins/destinations: every pair is a request, pairs whose
+# trips are not shown are only requested again after this long
+MULTI_ROUTE_MAX_PAIRS = 6
+MULTI_ROUTE_MAX_AGE = timedelta(minutes=6)
+
+# Events fired when shown trips or board entries change between polls
+EVENT_TRIP_DELAYED = f"{DOMAIN}_trip_delayed"
+EVENT_TRIP_CANCELLED = f"{DOMAIN}_trip_cancelled"
+EVENT_PLATFORM_CHANGED = f"{DOMAIN}_platform_changed"
+
+# Number of polls/requests the performance statistics are computed over
+STATS_WINDOW = 100
+
 # Mapping for the UI
 ROUTE_TYPE_OPTIONS = {
     "leasttime": "Fastest (Least Time)",
     "leastinterchange": "Least Interchanges",
     "leastwalking": "Least Walking",
+    "compare": "Compare all (merged)",
 }
+# Requests every other route type and merges the trips
+ROUTE_TYPE_COMPARE = "compare"
+BOARD_TYPE_OPTIONS = [BOARD_DEPARTURES, BOARD_ARRIVALS, BOARD_BOTH]
 
 DEFAULT_OFFSET = 0
 DEFAULT_MAX_CONNECTIONS = 3
 DEFAULT_ROUTE_TYPE = "leasttime"
+DEFAULT_BOARD_MODE = False
+DEFAULT_RECORD_HISTORY = False
+DEFAULT_BOARD_TYPE = BOARD_DEPARTURES
+DEFAULT_BOARD_ENTRIES = 10
+DEFAULT_MOVE_THRESHOLD = 200  # meters
+DEFAULT_WALKING_TIME = 0  # minutes
+
+# Calendar of route entries: the fetched trips, continued with up to this many
+# trips of the offline timetable (if built), computed again after this long
+CALENDAR_PLANNED_TRIPS = 30
+CALENDAR_PLANNED_MAX_AGE = timedelta(hours=1)
+
+# Disruption and info messages of all entries, decoded once per message id
+DATA_MESSAGES = f"{DOMAIN}_messages"
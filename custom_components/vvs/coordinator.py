@@ -1,30 +1,221 @@
 """DataUpdateCoordinator for VVS."""
 
-from datetime import timedelta, timezone
+from abc import ABC, abstractmethod
+import asyncio
+from datetime import datetime, timedelta, timezone
+from functools import partial
 import logging
+import time
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
-import os
-import sys
+from . import vvspy
+from .vvspy.diff import TripDiff, diff_trips, journey_key
+from .vvspy.geo import coord_origin, distance
+from .vvspy.history import (
+    DelayHistory,
+    DelayPredictor,
+    departure_observations,
+    trip_observations,
+)
+from .alerts import async_get_message_store
+from .board import async_get_board
+from .events import board_events, departure_events, departure_key, trip_events
+from .const import (
+    BOARD_ARRIVALS,
+    BOARD_BOTH,
+    BOARD_DEPARTURES,
+    BOARD_LIMIT,
+    BOARD_RELEARN_INTERVAL,
+    LOCATION_MAX_STOP_DISTANCE,
+    LOCATION_TRIPS_MAX_AGE,
+    MULTI_ROUTE_MAX_AGE,
+    NEAR_DEPARTURE_WINDOW,
+    PLANNED_MAX_AGE,
+    PLANNED_TRIP_LIMIT,
+    PREDICTION_HORIZON,
+    PREDICTOR_RETRAIN_INTERVAL,
+    PREDICTOR_TRAINING_DAYS,
+    PREFETCH_TRIPS,
+    PRUNE_INTERVAL,
+    ROUTE_TYPE_COMPARE,
+    ROUTE_TYPE_OPTIONS,
+    SCAN_INTERVAL,
+)
+from .scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_NEAR_DEPARTURE,
+    async_get_scheduler,
+)
+from .stats import VVSStatistics
+from .timetable import async_get_stop_index, async_get_timetable
+from .window import VVSRouteWindow, async_get_route_window
 
-current_path = os.path.dirname(__file__)
-if current_path not in sys.path:
-    sys.path.append(current_path)
+_LOGGER = logging.getLogger(__name__)
 
-import vvspy
-from .vvspy.enums.stations import Station
-from .const import SCAN_INTERVAL
 
-_LOGGER = logging.getLogger(__name__)
+def get_station_name(station_id: str) -> str:
+    """Reverse lookup: Find the human name for a station ID."""
+    # Large enum, imported on first use (see async_setup_entry)
+    from .vvspy.enums.stations import Station
+
+    for name, member in Station.__members__.items():
+        if member.value == station_id:
+            return name.replace("_", " ").title()
+    return station_id
+
+
+def get_position(state: State | None) -> tuple[float, float] | None:
+    """Latitude and longitude of a device tracker or person, if it has a position."""
+    if state is None:
+        return None
+    latitude = state.attributes.get(ATTR_LATITUDE)
+    longitude = state.attributes.get(ATTR_LONGITUDE)
+    if latitude is None or longitude is None:
+        return None
+    return float(latitude), float(longitude)
+
+
+def departure_of(trip) -> datetime:
+    """Estimated (or planned) naive UTC departure of a trip."""
+    origin = trip.connections[0].origin
+    return origin.departure_time_estimated or origin.departure_time_planned
+
+
+def unique_trips(trips: list, now: datetime) -> list:
+    """Trips not departed at `now` (UTC), each journey once, sorted by departure."""
+    naive_now = now.replace(tzinfo=None)
+    unique: dict[tuple, Any] = {}
+    for trip in trips:
+        if trip.connections and departure_of(trip) >= naive_now:
+            unique.setdefault(journey_key(trip), trip)
+    return sorted(unique.values(), key=departure_of)
+
+
+class VVSBaseCoordinator(DataUpdateCoordinator, ABC):
+    """Polling shared by all VVS coordinators."""
+
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        """Initialize."""
+        self._scheduler = async_get_scheduler(hass)
+        # Shift this entry's polling phase so all entries don't fire together
+        self._stagger = self._scheduler.async_stagger_offset(SCAN_INTERVAL)
+        self.stats = VVSStatistics()
+        # Set when the entry opted in to recording delays
+        self.history: DelayHistory | None = None
+        self._observations: list = []
+        # Messages of all entries, this entry shows the ones of its lines and stops
+        self.messages = async_get_message_store(hass)
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=name,
+            update_interval=SCAN_INTERVAL,
+            # Entities only update when a poll changed something
+            always_update=False,
+        )
 
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch data from VVS API."""
+        start = time.monotonic()
+        try:
+            data = await self._async_fetch_data()
+        except Exception as err:
+            self.stats.record_failure(err)
+            raise UpdateFailed(f"Error fetching VVS data: {err}") from err
+        finally:
+            self._apply_stagger()
+
+        self.stats.record_success(time.monotonic() - start)
+        if self.history is not None and self._observations:
+            await self._async_record_history()
+
+        self.messages.prune()
+        lines, stops = self._alert_scope(data)
+        alerts = [
+            message.as_dict() for message in self.messages.messages(lines, stops)
+        ]
+        if alerts:
+            data = {**data, "alerts": alerts}
+        return data
+
+    @property
+    @abstractmethod
+    def history_route(self) -> str:
+        """Name the delays of this coordinator are recorded under."""
+
+    @abstractmethod
+    def _alert_scope(self, data: dict[str, Any]) -> tuple[set[str], set[str]]:
+        """Lines and stops whose messages concern this entry."""
+
+    @callback
+    def _async_fire_events(self, events: list[tuple[str, dict[str, Any]]]) -> None:
+        """Fire the events of changed trips, tagged with this entry."""
+        entry_id = self.config_entry.entry_id if self.config_entry else None
+        for event_type, data in events:
+            self.hass.bus.async_fire(
+                event_type, {"entry_id": entry_id, "name": self.name, **data}
+            )
 
-class VVSDataUpdateCoordinator(DataUpdateCoordinator):
+    def _observe(self, observations: list) -> None:
+        """Keep delays seen while parsing, recorded after the poll."""
+        if self.history is not None:
+            self._observations.extend(observations)
+
+    async def _async_record_history(self) -> None:
+        """Write the observed delays, never failing the poll."""
+        observations, self._observations = self._observations, []
+        try:
+            await self.hass.async_add_executor_job(
+                self.history.record, self.history_route, observations
+            )
+        except Exception as err:
+            _LOGGER.warning("%s: could not record delays: %s", self.name, err)
+
+    @abstractmethod
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Fetch and parse the data of this coordinator."""
+
+    async def _async_fetch_instrumented(self, fetch, *args) -> Any:
+        """Run a vvspy call in the executor, accounting its requests in the statistics."""
+        events: list = []
+
+        def _fetch():
+            with vvspy.instrumentation.capture() as captured:
+                try:
+                    return fetch(*args)
+                finally:
+                    events.extend(captured)
+
+        try:
+            return await self.hass.async_add_executor_job(_fetch)
+        finally:
+            self.stats.record_events(events)
+
+    def _apply_stagger(self) -> None:
+        """Delay the first scheduled poll by the stagger offset, then poll regularly."""
+        if self._stagger:
+            self.update_interval = SCAN_INTERVAL + self._stagger
+            self._stagger = None
+        else:
+            self.update_interval = SCAN_INTERVAL
+
+
+class VVSDataUpdateCoordinator(VVSBaseCoordinator):
     """Class to manage fetching VVS data."""
 
+    # Whether the trips come from the window of `start_station` to `dest_station`
+    _window_on_init = True
+
     def __init__(
         self,
         hass: HomeAssistant,
@@ -33,6 +224,7 @@ class VVSDataUpdateCoordinator(DataUpdateCoordinator):
         limit: int,
         route_type: str,
         offset: int,
+        board_mode: bool = False,
     ) -> None:
         """Initialize."""
         self.start_station = start_station
@@ -40,62 +232,398 @@ class VVSDataUpdateCoordinator(DataUpdateCoordinator):
         self.limit = limit
         self.route_type = route_type
         self.offset = offset
+        self.board_mode = board_mode
+
+        self.start_station_name = get_station_name(start_station)
+        self.dest_station_name = get_station_name(dest_station)
+
+        self._next_departure: datetime | None = None
+        # Estimated departures of the trips not cancelled, soonest first (leave-by countdown)
+        self.departures_at: list[datetime] = []
 
-        self.start_station_name = self._get_friendly_name(start_station)
-        self.dest_station_name = self._get_friendly_name(dest_station)
+        # Board mode: (line number, line destination) -> (ride minutes, exit stop)
+        self._direct_lines: dict[tuple[str, str], tuple[float, str]] = {}
+        self._lines_learned_at: datetime | None = None
+        # Board mode: planned trips updated with the realtime data of the board
+        self._overlay: vvspy.RealtimeOverlay | None = None
+        self._planned_at: datetime | None = None
+
+        # Upcoming trips shared with the route's entries with other offsets, keeping
+        # trips beyond `limit` so departed trips are replaced right away
+        self.hass = hass
+        self._window: VVSRouteWindow | None = None
+        self._unregister_window: CALLBACK_TYPE | None = None
+        if self._window_on_init:
+            self._async_use_window(start_station)
+        self._top_up_task: asyncio.Task | None = None
+
+        # Raw trips shown last and what changed with the latest ones
+        self._last_trips: list = []
+        self.trip_changes = TripDiff()
+        # Board mode: departures of the direct lines shown last, by `departure_key`
+        self._last_departures: dict[tuple, Any] = {}
+
+        # Expected delays learned from the recorded history (if enabled)
+        self._predictor: DelayPredictor | None = None
+        self._predictor_trained_at: datetime | None = None
 
         super().__init__(
-            hass,
-            _LOGGER,
-            name=f"VVS {self.start_station_name} to {self.dest_station_name}",
-            update_interval=SCAN_INTERVAL,
+            hass, name=f"VVS {self.start_station_name} to {self.dest_station_name}"
         )
 
-    def _get_friendly_name(self, station_id: str) -> str:
-        """Reverse lookup: Find the human name for a station ID."""
-        for name, member in Station.__members__.items():
-            if member.value == station_id:
-                return name.replace("_", " ").title()
-        return station_id
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Fetch trips from VVS API."""
+        # 1. Prepare search time (Current Local Time + Offset)
+        now_utc = dt_util.now()
+        now_local = dt_util.as_local(now_utc)
+        check_time = now_local + timedelta(minutes=self.offset)
+
+        # Send 'naive' local time to API so it searches for "20:01" not "19:01"
+        check_time_naive = check_time.replace(tzinfo=None)
+
+        priority = self._request_priority(now_utc)
+
+        if self._predictor_due(now_utc):
+            await self._async_train_predictor(now_utc)
+
+        if self.board_mode and self._board_usable(now_utc):
+            board = async_get_board(self.hass, self.start_station)
+            departures = await board.async_get_entries(priority, stats=self.stats)
+            parsed = self._parse_departures(departures, check_time)
+            if len(parsed["trips"]) >= self.limit:
+                return parsed
+            _LOGGER.debug(
+                "%s: departure board has too few direct departures, "
+                "falling back to a trip request",
+                self.name,
+            )
+
+        if self.board_mode and self._overlay_usable(now_utc, check_time):
+            board = async_get_board(self.hass, self.start_station)
+            departures = await board.async_get_entries(priority, stats=self.stats)
+            trips = self._overlay.apply(departures)
+            return self._parse_trips(self._upcoming(trips, check_time))
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from VVS API."""
         try:
-            # 1. Prepare search time (Current Local Time + Offset)
-            now_utc = dt_util.now()
-            now_local = dt_util.as_local(now_utc)
-            check_time = now_local + timedelta(minutes=self.offset)
+            if self.board_mode:
+                # Keep more trips, so later polls only need the board
+                trips, planned_locally = await self._async_get_plan(
+                    check_time_naive, priority
+                )
+                self._learn_direct_lines(trips, now_utc)
+                self._overlay = vvspy.RealtimeOverlay(trips, dt_util.DEFAULT_TIME_ZONE)
+                self._planned_at = now_utc
+                if planned_locally:
+                    # The board adds the realtime data to the timetable's trips
+                    board = async_get_board(self.hass, self.start_station)
+                    departures = await board.async_get_entries(
+                        priority, stats=self.stats
+                    )
+                    trips = self._overlay.apply(departures)
+            else:
+                trips = await self._window.async_get_trips(
+                    check_time, self.limit, priority, self.stats
+                )
+        except Exception as err:
+            return await self._async_planned_data(check_time_naive, err)
+
+        if self.board_mode:
+            trips = self._upcoming(trips, check_time)
+        elif self._window_short(check_time):
+            self._async_schedule_top_up()
+
+        if not trips:
+            self._next_departure = None
+            self.departures_at = []
+            return {}
+
+        return self._parse_trips(trips)
+
+    async def _async_get_plan(self, check_time, priority: int) -> tuple[list, bool]:
+        """Planned trips for the realtime overlay and whether they are from the timetable.
+
+        With an offline timetable the trips are planned locally and no trip
+        request is made, otherwise they are requested (naive local `check_time`).
+        """
+        trips = await self.async_get_planned_trips(check_time, PLANNED_TRIP_LIMIT)
+        if trips:
+            self.stats.record_saved()
+            return trips, True
+        await self._scheduler.async_acquire(priority)
+        trips = await self._async_fetch_instrumented(
+            self._get_trips_internal, check_time, PLANNED_TRIP_LIMIT
+        )
+        return trips, False
+
+    async def _async_planned_data(self, check_time, err: Exception) -> dict[str, Any]:
+        """Answer from the offline timetable if the API failed, re-raise otherwise."""
+        trips = await self.async_get_planned_trips(check_time, self.limit)
+        if not trips:
+            raise err
 
-            # Send 'naive' local time to API so it searches for "20:01" not "19:01"
-            check_time_naive = check_time.replace(tzinfo=None)
+        if self.board_mode:
+            # The board may still answer and add the delays of the first legs
+            board = async_get_board(self.hass, self.start_station)
+            try:
+                departures = await board.async_get_entries(stats=self.stats)
+            except Exception as board_err:
+                _LOGGER.debug("%s: departure board failed too: %s", self.name, board_err)
+            else:
+                overlay = vvspy.RealtimeOverlay(trips, dt_util.DEFAULT_TIME_ZONE)
+                trips = overlay.apply(departures)
+
+        _LOGGER.warning(
+            "%s: VVS API failed (%s), showing planned trips from the timetable",
+            self.name,
+            err,
+        )
+        self.stats.record_saved()
+        # Planned delays of 0 must not overwrite the observed ones in the history
+        return {**self._parse_trips(trips, observe=False), "source": "timetable"}
+
+    @property
+    def history_route(self) -> str:
+        """Name the delays of this route are recorded under."""
+        return f"{self.start_station}-{self.dest_station}"
+
+    def _alert_scope(self, data: dict[str, Any]) -> tuple[set[str], set[str]]:
+        """The lines of the shown trips, the start and destination stop."""
+        lines = {
+            line for trip in data.get("trips", []) for line in trip["transports"] if line
+        }
+        return lines, {self.start_station, self.dest_station}
+
+    def known_trips(self) -> list:
+        """Upcoming trips already fetched (shown and buffered), without any request."""
+        now = dt_util.utcnow()
+        if self.board_mode:
+            buffered = self._overlay.trips if self._overlay is not None else []
+        elif self._window is not None:
+            buffered = self._window.buffer.upcoming(now)
+        else:
+            buffered = []
+        return unique_trips([*self._last_trips, *buffered], now)
+
+    async def async_get_planned_trips(self, check_time: datetime, limit: int) -> list:
+        """Planned trips from the offline timetable (naive local `check_time`), if any."""
+        timetable = await async_get_timetable(self.hass)
+        if timetable is None:
+            return []
+        return await self.hass.async_add_executor_job(
+            timetable.get_trips, self.start_station, self.dest_station, check_time, limit
+        )
 
-            trips = await self.hass.async_add_executor_job(
-                self._get_trips_internal, check_time_naive
+    @callback
+    def _async_use_window(self, start_station: str, **kwargs) -> None:
+        """Take the trips from the shared window of a route, leaving the previous one."""
+        self.async_release_window()
+        self._window = async_get_route_window(
+            self.hass, start_station, self.dest_station, self.route_type, **kwargs
+        )
+        self._unregister_window = self._window.async_register(
+            self.offset, self.limit + PREFETCH_TRIPS
+        )
+
+    @callback
+    def async_release_window(self) -> None:
+        """Stop sizing the shared window's requests for this entry."""
+        if self._unregister_window is not None:
+            self._unregister_window()
+            self._unregister_window = None
+
+    def _check_time(self) -> datetime:
+        """Local time trips are searched from."""
+        return dt_util.now() + timedelta(minutes=self.offset)
+
+    @callback
+    def async_start_pruning(self) -> CALLBACK_TYPE:
+        """Drop departed trips every minute instead of waiting for the next poll."""
+        return async_track_time_interval(self.hass, self._async_prune, PRUNE_INTERVAL)
+
+    @callback
+    def _async_prune(self, _now: datetime) -> None:
+        """Replace departed trips with buffered ones."""
+        # Board mode and the timetable fallback don't use the buffer
+        if self.board_mode or not self.data or self.data.get("source"):
+            return
+        self._async_publish_buffer()
+        if self._window_short(self._check_time()):
+            self._async_schedule_top_up()
+
+    def _window_short(self, check_time: datetime) -> bool:
+        """Whether fewer than `limit` plus the prefetched trips are left in the window."""
+        return len(self._window.trips(check_time)) < self.limit + PREFETCH_TRIPS
+
+    def _buffered_trips(self, check_time: datetime) -> list:
+        """The `limit` trips to show from the buffer, without any request."""
+        return self._window.trips(check_time)[: self.limit]
+
+    @callback
+    def _async_publish_buffer(self) -> None:
+        """Show the upcoming buffered trips without waiting for the next poll."""
+        trips = self._buffered_trips(self._check_time())
+        # The trips were observed when fetched, nothing new to record or diff
+        data = {**(self.data or {}), **self._parse_trips(trips, observe=False)}
+        if data != self.data:
+            self.data = data
+            self.async_update_listeners()
+
+    @callback
+    def _async_schedule_top_up(self) -> None:
+        """Fetch the trips following the buffered ones in the background."""
+        if self._top_up_task is None or self._top_up_task.done():
+            self._top_up_task = self.hass.async_create_background_task(
+                self._async_top_up(), f"{self.name} prefetch"
             )
 
-            if not trips:
-                return {}
+    async def _async_top_up(self) -> None:
+        """Top up the buffer, publishing the trips if it was running short."""
+        try:
+            added = await self._window.async_fill(
+                self._check_time(), self.limit + PREFETCH_TRIPS, stats=self.stats
+            )
+        except Exception as err:
+            _LOGGER.debug("%s: prefetching trips failed: %s", self.name, err)
+            return
+        if added and self.data is not None and not self.data.get("source"):
+            self._async_publish_buffer()
 
-            return self._parse_trips(trips)
+    def _predictor_due(self, now: datetime) -> bool:
+        """Whether delays are recorded and the predictor wasn't trained recently."""
+        return self.history is not None and (
+            self._predictor_trained_at is None
+            or now - self._predictor_trained_at > PREDICTOR_RETRAIN_INTERVAL
+        )
 
+    async def _async_train_predictor(self, now: datetime) -> None:
+        """Learn the expected delays of this route from its recorded history."""
+        self._predictor_trained_at = now
+        try:
+            self._predictor = await self.hass.async_add_executor_job(
+                DelayPredictor.train,
+                self.history,
+                self.history_route,
+                PREDICTOR_TRAINING_DAYS,
+            )
         except Exception as err:
-            raise UpdateFailed(f"Error fetching VVS data: {err}") from err
+            _LOGGER.warning("%s: could not learn expected delays: %s", self.name, err)
+            return
+        _LOGGER.debug(
+            "%s: learned expected delays from %s departures",
+            self.name,
+            self._predictor.samples,
+        )
+
+    def _request_priority(self, now: datetime) -> int:
+        """Prefer refreshes for trips that are about to depart."""
+        if (
+            self._next_departure is not None
+            and self._next_departure - now <= NEAR_DEPARTURE_WINDOW
+        ):
+            return PRIORITY_NEAR_DEPARTURE
+        return PRIORITY_BACKGROUND
+
+    def _board_usable(self, now: datetime) -> bool:
+        """Whether direct lines are known and were learned recently enough."""
+        return bool(self._direct_lines) and (
+            now - self._lines_learned_at <= BOARD_RELEARN_INTERVAL
+        )
+
+    def _overlay_usable(self, now: datetime, check_time: datetime) -> bool:
+        """Whether the planned trips are recent and still cover `limit` trips."""
+        return (
+            self._overlay is not None
+            and now - self._planned_at <= PLANNED_MAX_AGE
+            and len(self._upcoming(self._overlay.trips, check_time)) >= self.limit
+        )
+
+    def _upcoming(self, trips, check_time: datetime) -> list:
+        """The first `limit` trips not departed before `check_time`."""
+        upcoming = []
+        for trip in trips or []:
+            if not trip.connections:
+                continue
+            departure = trip.connections[0].origin.departure_time_estimated
+            if departure.replace(tzinfo=timezone.utc) < check_time:
+                continue
+            upcoming.append(trip)
+            if len(upcoming) >= self.limit:
+                break
+        return upcoming
+
+    def _learn_direct_lines(self, raw_trips, now: datetime) -> None:
+        """Remember the lines that connect both stations without interchanges.
+
+        Only routes whose best trip is direct are served from the departure
+        board, routes that need interchanges keep using trip requests.
+        """
+        self._direct_lines = {}
+        self._lines_learned_at = now
 
-    def _get_trips_internal(self, check_time):
+        for index, trip in enumerate(raw_trips or []):
+            legs = trip.connections
+            is_direct = (
+                legs
+                and legs[0].transportation.number
+                and not any(leg.transportation.number for leg in legs[1:])
+            )
+            if not is_direct:
+                if index == 0:
+                    self._direct_lines = {}
+                    return
+                continue
+
+            transportation = legs[0].transportation
+            ride = (
+                legs[-1].destination.arrival_time_planned
+                - legs[0].origin.departure_time_planned
+            ).total_seconds() / 60
+            line_destination = transportation.destination or {}
+            for destination in (line_destination.get("id"), line_destination.get("name")):
+                if destination:
+                    self._direct_lines[(transportation.number, destination)] = (
+                        ride,
+                        legs[0].destination.name,
+                    )
+
+    def _get_trips_internal(self, check_time, limit):
         """Wrapper to call vvspy synchronously."""
         return vvspy.get_trips(
             self.start_station,
             self.dest_station,
             check_time=check_time,
-            limit=self.limit,
+            limit=limit,
             routeType=self.route_type,
         )
 
-    def _parse_trips(self, raw_trips) -> dict:
-        """Parse the raw vvspy objects into a clean dictionary."""
+    def _parse_trips(self, raw_trips, observe: bool = True) -> dict:
+        """Parse the raw vvspy objects into a clean dictionary.
+
+        Unless `observe` is False (trips not freshly fetched), delays are recorded
+        in the history, messages indexed and the changes since the previous poll
+        fired as events.
+        """
+        if observe:
+            self._observe(trip_observations(raw_trips))
+            self.messages.add_trips(raw_trips)
+            self.trip_changes = diff_trips(self._last_trips, raw_trips)
+            self._last_trips = list(raw_trips)
+            if self.trip_changes:
+                _LOGGER.debug("%s: %s", self.name, self.trip_changes)
+                self._async_fire_events(trip_events(self.trip_changes))
+
         parsed_data = {"trips": []}
+        self._next_departure = None
+        self.departures_at = []
+
+        predictions = (
+            self._predictor.predict_trips(raw_trips)
+            if self._predictor is not None
+            else [None] * len(raw_trips)
+        )
+        horizon = dt_util.now() + PREDICTION_HORIZON
 
-        for trip in raw_trips:
+        for trip, prediction in zip(raw_trips, predictions):
             if not trip.connections:
                 continue
 
@@ -110,38 +638,577 @@ class VVSDataUpdateCoordinator(DataUpdateCoordinator):
 
             duration = (arrival_planned - departure_planned).total_seconds() / 60
 
-            # --- TIMEZONE FIX ---
-            # The API returns Naive UTC (e.g. 19:01)
-            # 1. Force UTC timezone onto the naive object
-            dep_utc = departure_planned.replace(tzinfo=timezone.utc)
-            arr_utc = arrival_planned.replace(tzinfo=timezone.utc)
-
-            # 2. Convert to HA Local Time (e.g. 19:01 UTC -> 20:01 CET)
-            local_dep = dt_util.as_local(dep_utc)
-            local_arr = dt_util.as_local(arr_utc)
-
-            # 3. Format string
-            dep_str = local_dep.strftime("%H:%M")
-            arr_str = local_arr.strftime("%H:%M")
-            # --------------------
+            # The API returns naive UTC times
+            local_dep = dt_util.as_local(departure_planned.replace(tzinfo=timezone.utc))
+            local_arr = dt_util.as_local(arrival_planned.replace(tzinfo=timezone.utc))
 
             trip_info = {
-                "departure": dep_str,
+                "departure": local_dep.strftime("%H:%M"),
                 "departure_delay": first_leg.origin.delay or 0,
-                "arrival": arr_str,
+                "arrival": local_arr.strftime("%H:%M"),
                 "arrival_delay": last_leg.destination.delay or 0,
                 "duration": int(duration),
+                "cancelled": any(leg.cancelled for leg in trip.connections),
+                "expected_delay": None,
+                "expected_delay_confidence": None,
                 "transports": [],
                 "via": [],
+                "realtime": [],
             }
 
-            for connection in trip.connections:
-                if connection.transportation:
-                    trip_info["transports"].append(connection.transportation.number)
+            # Realtime data is better than any prediction
+            if prediction is not None and (
+                local_dep > horizon or not first_leg.is_realtime_controlled
+            ):
+                trip_info["expected_delay"], trip_info["expected_delay_confidence"] = (
+                    prediction
+                )
 
-                if connection.destination:
-                    trip_info["via"].append(connection.destination.name)
+            for connection in trip.connections:
+                trip_info["transports"].append(connection.transportation.number)
+                trip_info["via"].append(connection.destination.name)
+                trip_info["realtime"].append(bool(connection.is_realtime_controlled))
 
             parsed_data["trips"].append(trip_info)
 
+            if self._next_departure is None or local_dep < self._next_departure:
+                self._next_departure = local_dep
+            if not trip_info["cancelled"]:
+                self.departures_at.append(
+                    local_dep + timedelta(minutes=trip_info["departure_delay"])
+                )
+
+        self.departures_at.sort()
+        return parsed_data
+
+    def _parse_departures(self, departures, check_time: datetime) -> dict:
+        """Build trips from the board departures of the learned direct lines."""
+        # Board departures are no journeys, they are diffed by `departure_key` instead
+        self.trip_changes = TripDiff()
+        self._last_trips = []
+        self.messages.add_departures(departures, self.start_station)
+        parsed_data = {"trips": []}
+        self._next_departure = None
+        self.departures_at = []
+        shown: dict[tuple, Any] = {}
+
+        for departure in departures:
+            if departure.datetime is None:
+                continue
+
+            line = departure.serving_line
+            learned = self._direct_lines.get(
+                (line.number, line.dest_id)
+            ) or self._direct_lines.get((line.number, line.direction))
+            if learned is None:
+                continue
+            ride, exit_stop = learned
+
+            # The DM endpoint returns naive local times (unlike trip requests)
+            local_dep = departure.datetime.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+            if local_dep + timedelta(minutes=departure.delay) < check_time:
+                continue
+            # Cancelled departures aren't shown, but their cancellation is an event
+            shown[departure_key(departure)] = departure
+            if departure.cancelled:
+                continue
+            local_arr = local_dep + timedelta(minutes=ride)
+
+            self._observe(
+                departure_observations(
+                    [departure], dt_util.DEFAULT_TIME_ZONE, self.start_station
+                )
+            )
+            parsed_data["trips"].append(
+                {
+                    "departure": local_dep.strftime("%H:%M"),
+                    "departure_delay": departure.delay,
+                    # No realtime for the exit stop, assume the delay carries over
+                    "arrival": local_arr.strftime("%H:%M"),
+                    "arrival_delay": departure.delay,
+                    "duration": int(ride),
+                    "cancelled": False,
+                    "expected_delay": None,
+                    "expected_delay_confidence": None,
+                    "transports": [line.number],
+                    "via": [exit_stop],
+                    "realtime": [bool(line.real_time)],
+                }
+            )
+
+            if self._next_departure is None or local_dep < self._next_departure:
+                self._next_departure = local_dep
+            self.departures_at.append(local_dep + timedelta(minutes=departure.delay))
+
+            if len(parsed_data["trips"]) >= self.limit:
+                break
+
+        self.departures_at.sort()
+        events = departure_events(self._last_departures, shown)
+        self._last_departures = shown
+        if events:
+            self._async_fire_events(events)
         return parsed_data
+
+
+class VVSLocationCoordinator(VVSDataUpdateCoordinator):
+    """Trips from the current position of a device tracker or person.
+
+    The origin is the stop nearest to the position (from the offline timetable),
+    or the position itself if there is no timetable or no stop close by.
+    Trips are only requested again when the tracker moved more than `threshold`
+    meters to a different origin, the buffered trips run out or are older than
+    `LOCATION_TRIPS_MAX_AGE`; all other polls are answered from the buffer.
+    """
+
+    # The window is the origin's, known once the position is
+    _window_on_init = False
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        tracker: str,
+        dest_station: str,
+        limit: int,
+        route_type: str,
+        threshold: float,
+    ) -> None:
+        """Initialize."""
+        self.tracker = tracker
+        self.threshold = threshold
+        # Position and origin the buffered trips were requested for
+        self._position: tuple[float, float] | None = None
+        self._origin: dict[str, Any] | None = None
+        self._fetched_at: datetime | None = None
+
+        super().__init__(
+            hass,
+            start_station=tracker,
+            dest_station=dest_station,
+            limit=limit,
+            route_type=route_type,
+            offset=0,
+        )
+
+        state = hass.states.get(tracker)
+        self.start_station_name = (
+            state.name if state is not None else tracker.split(".", 1)[-1]
+        )
+        self.name = f"VVS {self.start_station_name} to {self.dest_station_name}"
+
+    @callback
+    def async_track_position(self) -> CALLBACK_TYPE:
+        """Refresh as soon as the tracker moved beyond the threshold."""
+        return async_track_state_change_event(
+            self.hass, [self.tracker], self._async_position_changed
+        )
+
+    @callback
+    def _async_position_changed(self, event: Event) -> None:
+        """Request a refresh if the new position is far enough from the last one."""
+        position = get_position(event.data["new_state"])
+        if position is not None and self._moved(position):
+            self.hass.async_create_task(self.async_request_refresh())
+
+    def _moved(self, position: tuple[float, float]) -> bool:
+        """Whether the trips were requested more than `threshold` meters away."""
+        return (
+            self._position is None
+            or distance(*self._position, *position) > self.threshold
+        )
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Serve the buffered trips unless the origin changed or they ran out."""
+        position = get_position(self.hass.states.get(self.tracker))
+        if position is None:
+            raise Exception(f"{self.tracker} has no position")
+
+        now = dt_util.utcnow()
+        origin_changed = self._moved(position) and await self._async_set_origin(
+            position
+        )
+        if (
+            not origin_changed
+            and self._fetched_at is not None
+            and now - self._fetched_at <= LOCATION_TRIPS_MAX_AGE
+            and len(self._window.trips(now)) >= self.limit
+        ):
+            self.stats.record_saved()
+            trips = self._window.trips(now)[: self.limit]
+            # Observed when fetched, nothing new to record or diff
+            return {**self._parse_trips(trips, observe=False), "origin": self._origin}
+
+        data = await super()._async_fetch_data()
+        if not data.get("source"):
+            self._fetched_at = now
+        self._position = position
+        return {**data, "origin": self._origin}
+
+    async def _async_set_origin(self, position: tuple[float, float]) -> bool:
+        """Route from the stop nearest to `position`, return whether the origin changed."""
+        latitude, longitude = position
+        index = await async_get_stop_index(self.hass)
+        nearby = (
+            await self.hass.async_add_executor_job(
+                index.nearest, latitude, longitude, 1, LOCATION_MAX_STOP_DISTANCE
+            )
+            if index
+            else []
+        )
+        if nearby:
+            origin, name, meters = nearby[0]
+            route_kwargs = {}
+        else:
+            origin, name, meters = coord_origin(latitude, longitude), None, 0
+            route_kwargs = {"type_origin": "coord"}
+
+        self._origin = {
+            "id": origin,
+            "name": name,
+            "distance": round(meters),
+            "latitude": latitude,
+            "longitude": longitude,
+        }
+        if origin == self.start_station:
+            self._position = position
+            return False
+
+        _LOGGER.debug("%s: routing from %s (%s)", self.name, name or origin, position)
+        self.start_station = origin
+        self._async_use_window(origin, **route_kwargs)
+        self._fetched_at = None
+        return True
+
+    async def _async_planned_data(self, check_time, err: Exception) -> dict[str, Any]:
+        """The timetable only knows stops, not positions."""
+        if self._origin is None or self._origin["name"] is None:
+            raise err
+        return await super()._async_planned_data(check_time, err)
+
+    async def async_get_planned_trips(self, check_time: datetime, limit: int) -> list:
+        """No planned trips from a position."""
+        if self._origin is None or self._origin["name"] is None:
+            return []
+        return await super().async_get_planned_trips(check_time, limit)
+
+
+def get_route_types(route_type: str) -> list[str]:
+    """The routeType variants to request, all of them to compare."""
+    if route_type == ROUTE_TYPE_COMPARE:
+        return [option for option in ROUTE_TYPE_OPTIONS if option != ROUTE_TYPE_COMPARE]
+    return [route_type]
+
+
+class VVSMultiRouteCoordinator(VVSDataUpdateCoordinator):
+    """Fastest trips over several origins, destinations and/or route types.
+
+    Every origin/destination/route type combination keeps its own cached trips.
+    A poll only requests the combinations whose trips are shown (their realtime
+    data matters), that ran short of trips or that are older than
+    `MULTI_ROUTE_MAX_AGE`, all at once over one connection pool. The trips of
+    all combinations are merged, journeys found for several route types are
+    kept once, and ranked by arrival. Pruning re-ranks the cached trips every
+    minute; if every request fails, the offline timetable answers.
+    """
+
+    # Every combination keeps its own trips instead
+    _window_on_init = False
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        origins: list[str],
+        destinations: list[str],
+        limit: int,
+        route_type: str,
+        offset: int = 0,
+    ) -> None:
+        """Initialize."""
+        self.origins = origins
+        self.destinations = destinations
+        self.routes = [
+            (origin, destination, variant)
+            for origin in origins
+            for destination in destinations
+            if origin != destination
+            for variant in get_route_types(route_type)
+        ]
+        # (origin, destination, route type) -> (trips, fetched at)
+        self._cache: dict[tuple[str, str, str], tuple[list, datetime]] = {}
+        self._shown: set[tuple[str, str, str]] = set()
+
+        super().__init__(
+            hass,
+            start_station=origins[0],
+            dest_station=destinations[0],
+            limit=limit,
+            route_type=route_type,
+            offset=offset,
+        )
+
+        self.start_station_name = " / ".join(map(get_station_name, origins))
+        self.dest_station_name = " / ".join(map(get_station_name, destinations))
+        self.name = f"VVS {self.start_station_name} to {self.dest_station_name}"
+
+    @property
+    def history_route(self) -> str:
+        """Name the delays of these routes are recorded under."""
+        return f"{','.join(self.origins)}-{','.join(self.destinations)}"
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Request the stale routes concurrently and rank the trips of all routes."""
+        now = dt_util.utcnow()
+        check_time = self._check_time()
+        stale = [route for route in self.routes if self._stale(route, check_time)]
+
+        if self._predictor_due(now):
+            await self._async_train_predictor(now)
+
+        if stale:
+            priority = self._request_priority(now)
+            local_check_time = dt_util.as_local(check_time).replace(tzinfo=None)
+            try:
+                # One batch is one poll: it takes a single slot of the shared
+                # budget, so a multi entry can't drain it for the other entries
+                await self._scheduler.async_acquire(priority)
+                results = await self._async_fetch_instrumented(
+                    partial(
+                        vvspy.get_trips_many,
+                        [
+                            {
+                                "origin_station_id": origin,
+                                "destination_station_id": destination,
+                                "routeType": variant,
+                            }
+                            for origin, destination, variant in stale
+                        ],
+                        check_time=local_check_time,
+                        # Keep a few more, pruning replaces departed trips with them
+                        limit=self.limit + PREFETCH_TRIPS,
+                    )
+                )
+                for route, result in zip(stale, results):
+                    if result.ok:
+                        self._cache[route] = (result.trips or [], now)
+                    else:
+                        _LOGGER.debug(
+                            "%s: %s failed: %s", self.name, route, result.error
+                        )
+                if not self._cache:
+                    raise results[0].error
+            except Exception as err:
+                return await self._async_planned_data(local_check_time, err)
+        else:
+            self.stats.record_saved()
+
+        trips = self._rank(check_time)
+        if not trips:
+            self._next_departure = None
+            self.departures_at = []
+            return {}
+        return self._parse_trips(trips)
+
+    def _alert_scope(self, data: dict[str, Any]) -> tuple[set[str], set[str]]:
+        """The lines of the shown trips and every origin and destination."""
+        lines, _ = super()._alert_scope(data)
+        return lines, {*self.origins, *self.destinations}
+
+    def known_trips(self) -> list:
+        """Upcoming cached trips of all routes."""
+        return unique_trips(
+            [trip for trips, _ in self._cache.values() for trip in trips],
+            dt_util.utcnow(),
+        )
+
+    async def async_get_planned_trips(self, check_time: datetime, limit: int) -> list:
+        """Planned trips of every origin and destination pair, by departure."""
+        timetable = await async_get_timetable(self.hass)
+        if timetable is None:
+            return []
+        pairs = {(origin, destination) for origin, destination, _ in self.routes}
+        trips = []
+        for origin, destination in pairs:
+            trips.extend(
+                await self.hass.async_add_executor_job(
+                    timetable.get_trips, origin, destination, check_time, limit
+                )
+            )
+        return sorted(trips, key=departure_of)[:limit]
+
+    def _check_time(self) -> datetime:
+        """UTC time trips are searched from, the cached trips use UTC."""
+        return dt_util.utcnow() + timedelta(minutes=self.offset)
+
+    def _window_short(self, check_time: datetime) -> bool:
+        """Whether a route whose trips are shown ran short of trips."""
+        return any(
+            len(self._upcoming_of(route, check_time)) < self.limit
+            for route in self._shown
+        )
+
+    def _buffered_trips(self, check_time: datetime) -> list:
+        """The cached trips of all routes arriving first."""
+        return self._rank(check_time)
+
+    async def _async_top_up(self) -> None:
+        """Poll early, requesting the routes that ran short."""
+        await self.async_request_refresh()
+
+    def _upcoming_of(self, route: tuple[str, str, str], check_time: datetime) -> list:
+        """Cached trips of a route not departed before `check_time` (UTC)."""
+        naive_check_time = check_time.replace(tzinfo=None)
+        trips, _ = self._cache.get(route, ([], None))
+        return [
+            trip
+            for trip in trips
+            if trip.connections
+            and trip.connections[0].origin.departure_time_estimated >= naive_check_time
+        ]
+
+    def _stale(self, route: tuple[str, str, str], check_time: datetime) -> bool:
+        """Whether the trips of a route need to be requested again."""
+        if route not in self._cache:
+            return True
+        age = dt_util.utcnow() - self._cache[route][1]
+        return (
+            age > MULTI_ROUTE_MAX_AGE
+            # Shown trips get fresh realtime data on every poll
+            or (route in self._shown and age >= SCAN_INTERVAL / 2)
+            or len(self._upcoming_of(route, check_time)) < self.limit
+        )
+
+    def _rank(self, check_time: datetime) -> list:
+        """The `limit` upcoming trips of all routes arriving first, each journey once."""
+        candidates = sorted(
+            (
+                (
+                    trip.connections[-1].destination.arrival_time_estimated
+                    or trip.connections[-1].destination.arrival_time_planned,
+                    route,
+                    trip,
+                )
+                for route in self.routes
+                for trip in self._upcoming_of(route, check_time)
+            ),
+            key=lambda candidate: candidate[0],
+        )
+        ranked = []
+        seen = set()
+        for candidate in candidates:
+            # Route types often find the same journey
+            key = journey_key(candidate[2])
+            if key not in seen:
+                seen.add(key)
+                ranked.append(candidate)
+                if len(ranked) >= self.limit:
+                    break
+        self._shown = {route for _, route, _ in ranked}
+        return [trip for _, _, trip in ranked]
+
+
+class VVSStationBoardCoordinator(VVSBaseCoordinator):
+    """Class to manage fetching the departures and/or arrivals of one stop."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        station: str,
+        board_type: str,
+        limit: int,
+        lines: str = "",
+        platform: str = "",
+        direction: str = "",
+    ) -> None:
+        """Initialize."""
+        self.station = station
+        self.station_name = get_station_name(station)
+        self.kinds = (
+            [BOARD_DEPARTURES, BOARD_ARRIVALS]
+            if board_type == BOARD_BOTH
+            else [board_type]
+        )
+        self.limit = limit
+        self.lines = {line.strip().casefold() for line in lines.split(",") if line.strip()}
+        self.platform = platform.strip().casefold()
+        self.direction = direction.strip().casefold()
+
+        super().__init__(hass, name=f"VVS {self.station_name} board")
+
+    @property
+    def history_route(self) -> str:
+        """Name the delays of this board are recorded under."""
+        return self.station
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Fetch the board(s) from the DM endpoint."""
+        # Filters drop entries, so ask for a longer board to still fill `limit`
+        filtered = bool(self.lines or self.platform or self.direction)
+        fetch_limit = max(self.limit, BOARD_LIMIT) if filtered else self.limit
+
+        data = {}
+        for kind in self.kinds:
+            board = async_get_board(self.hass, self.station, kind)
+            entries = await board.async_get_entries(
+                PRIORITY_BACKGROUND, fetch_limit, stats=self.stats
+            )
+            self.messages.add_departures(entries, self.station)
+            data[kind] = self._parse_board(entries, kind)
+            if self.data:
+                self._async_fire_events(
+                    board_events(kind, self.data.get(kind), data[kind])
+                )
+            if kind == BOARD_DEPARTURES:
+                self._observe(
+                    departure_observations(
+                        entries, dt_util.DEFAULT_TIME_ZONE, self.station
+                    )
+                )
+        return data
+
+    def _alert_scope(self, data: dict[str, Any]) -> tuple[set[str], set[str]]:
+        """The lines on the board and the stop itself."""
+        lines = {item["line"] for kind in self.kinds for item in data.get(kind, [])}
+        return {line for line in lines if line}, {self.station}
+
+    def _parse_board(self, entries, kind: str) -> list[dict[str, Any]]:
+        """Filter the raw vvspy departures/arrivals into a clean list."""
+        board = []
+
+        for entry in entries:
+            if entry.datetime is None:
+                continue
+
+            line = entry.serving_line
+            if self.lines and not self.lines & {
+                (line.number or "").casefold(),
+                (line.symbol or "").casefold(),
+            }:
+                continue
+            if self.platform and self.platform not in (
+                (entry.platform or "").casefold(),
+                (entry.platform_name or "").casefold(),
+            ):
+                continue
+            # Arrivals are filtered by where they come from
+            towards = line.direction_from if kind == BOARD_ARRIVALS else line.direction
+            if self.direction and self.direction not in (towards or "").casefold():
+                continue
+
+            board.append(
+                {
+                    "line": line.number,
+                    "from" if kind == BOARD_ARRIVALS else "direction": towards,
+                    "platform": entry.platform_name or entry.platform,
+                    # The DM endpoint already returns local times
+                    "planned": entry.datetime.strftime("%H:%M"),
+                    "estimated": entry.real_datetime.strftime("%H:%M"),
+                    "delay": entry.delay,
+                    "cancelled": entry.cancelled,
+                    "realtime": line.real_time,
+                }
+            )
+
+            if len(board) >= self.limit:
+                break
+
+        return board
@@ -0,0 +1,50 @@
+"""Diagnostics support for VVS."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_TRACKER, DOMAIN, HISTORY_DIAGNOSTICS_DAYS
+
+# Location entries must not leak where the tracked person is; the origin
+# (a coordinate when no stop is close by) is left out as a whole
+TO_REDACT = {ATTR_LATITUDE, ATTR_LONGITUDE, CONF_TRACKER, "origin"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    delays = None
+    if coordinator.history is not None:
+        delays = {
+            by: await hass.async_add_executor_job(
+                partial(
+                    coordinator.history.delay_percentiles,
+                    coordinator.history_route,
+                    by=by,
+                    days=HISTORY_DIAGNOSTICS_DAYS,
+                )
+            )
+            for by in ("line", "hour", "weekday")
+        }
+
+    return {
+        "entry": {"title": entry.title, "data": async_redact_data(entry.data, TO_REDACT)},
+        "coordinator": {
+            "name": coordinator.name,
+            "update_interval": coordinator.update_interval,
+            "last_update_success": coordinator.last_update_success,
+        },
+        "statistics": coordinator.stats.as_dict(),
+        "delays": delays,
+        "data": async_redact_data(coordinator.data, TO_REDACT),
+    }
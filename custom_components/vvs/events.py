@@ -0,0 +1,179 @@
+"""Events for delayed, cancelled and re-platformed trips, computed from poll diffs."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BOARD_ARRIVALS,
+    EVENT_PLATFORM_CHANGED,
+    EVENT_TRIP_CANCELLED,
+    EVENT_TRIP_DELAYED,
+)
+from .vvspy.diff import TripDiff, platform
+
+
+def _hhmm(when: datetime) -> str:
+    """Local HH:MM of a naive UTC time of the trip models."""
+    return dt_util.as_local(when.replace(tzinfo=timezone.utc)).strftime("%H:%M")
+
+
+def _trip_data(trip) -> dict[str, Any]:
+    """The fields identifying a trip in every event."""
+    first = trip.connections[0]
+    ridden = next(
+        (leg for leg in trip.connections if leg.transportation.number), first
+    )
+    return {
+        "line": ridden.transportation.number,
+        "stop": first.origin.name,
+        "departure": _hhmm(first.origin.departure_time_planned),
+    }
+
+
+def trip_events(changes: TripDiff) -> list[tuple[str, dict[str, Any]]]:
+    """Events of the journeys that got cancelled, delayed or changed platform."""
+    events = [(EVENT_TRIP_CANCELLED, _trip_data(trip)) for trip in changes.cancelled]
+    cancelled = {id(trip) for trip in changes.cancelled}
+
+    for old, new in changes.delayed:
+        delays = (
+            new.connections[0].origin.delay,
+            new.connections[-1].destination.delay,
+        )
+        previous = (
+            old.connections[0].origin.delay,
+            old.connections[-1].destination.delay,
+        )
+        # Estimates move by seconds, only whole minutes are worth an event
+        if id(new) in cancelled or delays == previous:
+            continue
+        events.append(
+            (
+                EVENT_TRIP_DELAYED,
+                {
+                    **_trip_data(new),
+                    "delay": delays[0],
+                    "previous_delay": previous[0],
+                    "arrival_delay": delays[1],
+                },
+            )
+        )
+
+    for old, new in changes.platform_changed:
+        for old_leg, new_leg in zip(old.connections, new.connections):
+            if platform(old_leg.origin) != platform(new_leg.origin):
+                events.append(
+                    (
+                        EVENT_PLATFORM_CHANGED,
+                        {
+                            **_trip_data(new),
+                            "line": new_leg.transportation.number,
+                            "stop": new_leg.origin.name,
+                            "platform": platform(new_leg.origin),
+                            "previous_platform": platform(old_leg.origin),
+                        },
+                    )
+                )
+    return events
+
+
+def departure_key(departure) -> tuple:
+    """Identity of a departure board entry across polls."""
+    line = departure.serving_line
+    return line.number, departure.datetime, line.direction
+
+
+def departure_events(
+    old: dict[tuple, Any], new: dict[tuple, Any]
+) -> list[tuple[str, dict[str, Any]]]:
+    """Events of the departures of a route served from the board (by `departure_key`).
+
+    The payloads match `trip_events`; the board has no realtime data for the exit
+    stop, so the arrival delay is the departure delay.
+    """
+    events = []
+    for key, departure in new.items():
+        before = old.get(key)
+        if before is None:
+            continue
+        data = {
+            "line": departure.serving_line.number,
+            "stop": departure.stop_name,
+            "departure": departure.datetime.strftime("%H:%M"),
+        }
+        if departure.cancelled and not before.cancelled:
+            events.append((EVENT_TRIP_CANCELLED, data))
+        elif departure.delay != before.delay:
+            events.append(
+                (
+                    EVENT_TRIP_DELAYED,
+                    {
+                        **data,
+                        "delay": departure.delay,
+                        "previous_delay": before.delay,
+                        "arrival_delay": departure.delay,
+                    },
+                )
+            )
+        platform_now = departure.platform_name or departure.platform
+        platform_before = before.platform_name or before.platform
+        if platform_now != platform_before:
+            events.append(
+                (
+                    EVENT_PLATFORM_CHANGED,
+                    {
+                        **data,
+                        "platform": platform_now,
+                        "previous_platform": platform_before,
+                    },
+                )
+            )
+    return events
+
+
+def board_events(
+    kind: str, old: list[dict[str, Any]] | None, new: list[dict[str, Any]]
+) -> list[tuple[str, dict[str, Any]]]:
+    """Events of the board entries that got cancelled, delayed or changed platform."""
+    towards = "from" if kind == BOARD_ARRIVALS else "direction"
+
+    def _key(item: dict[str, Any]) -> tuple:
+        return item["line"], item["planned"], item.get(towards)
+
+    previous = {_key(item): item for item in old or []}
+    events = []
+    for item in new:
+        before = previous.get(_key(item))
+        if before is None:
+            continue
+        data = {
+            "board": kind,
+            "line": item["line"],
+            towards: item.get(towards),
+            "planned": item["planned"],
+        }
+        if item["cancelled"] and not before["cancelled"]:
+            events.append((EVENT_TRIP_CANCELLED, data))
+        elif item["delay"] != before["delay"]:
+            events.append(
+                (
+                    EVENT_TRIP_DELAYED,
+                    {**data, "delay": item["delay"], "previous_delay": before["delay"]},
+                )
+            )
+        if item["platform"] != before["platform"]:
+            events.append(
+                (
+                    EVENT_PLATFORM_CHANGED,
+                    {
+                        **data,
+                        "platform": item["platform"],
+                        "previous_platform": before["platform"],
+                    },
+                )
+            )
+    return events
@@ -0,0 +1,28 @@
+"""Delay history recorded by VVS entries that opted in."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_HISTORY, HISTORY_FILE, HISTORY_KEEP_DAYS
+from .vvspy.history import DelayHistory
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_get_history(hass: HomeAssistant) -> DelayHistory:
+    """Return the shared delay history, opening (and pruning) it on first use."""
+    lock: asyncio.Lock = hass.data.setdefault(f"{DATA_HISTORY}_lock", asyncio.Lock())
+    async with lock:
+        if DATA_HISTORY not in hass.data:
+            history = await hass.async_add_executor_job(
+                DelayHistory, hass.config.path(HISTORY_FILE), dt_util.DEFAULT_TIME_ZONE
+            )
+            pruned = await hass.async_add_executor_job(history.prune, HISTORY_KEEP_DAYS)
+            _LOGGER.debug("Pruned %s old delay observations", pruned)
+            hass.data[DATA_HISTORY] = history
+        return hass.data[DATA_HISTORY]
@@ -0,0 +1,113 @@
+"""Process-wide request scheduler for the VVS API."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import heapq
+import itertools
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DATA_SCHEDULER,
+    REQUEST_BUDGET_PER_MINUTE,
+    REQUEST_BURST,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lower value = served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NEAR_DEPARTURE = 1
+PRIORITY_BACKGROUND = 2
+
+# Fractional part of n * 0.618... spreads any number of slots evenly over [0, 1)
+# without knowing in advance how many coordinators will register.
+_GOLDEN_RATIO_CONJUGATE = 0.6180339887498949
+
+
+class VVSRequestScheduler:
+    """Token bucket limiter with a priority queue shared by all VVS entries."""
+
+    def __init__(
+        self, hass: HomeAssistant, requests_per_minute: float, burst: int
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._rate = requests_per_minute / 60
+        self._burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._release_handle: asyncio.TimerHandle | None = None
+        self._registered = 0
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._last_refill) * self._rate
+        )
+        self._last_refill = now
+
+    async def async_acquire(self, priority: int = PRIORITY_BACKGROUND) -> None:
+        """Wait until a request with the given priority may be sent."""
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        future = self.hass.loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        _LOGGER.debug(
+            "VVS request budget exhausted, queued request (priority %s, %s waiting)",
+            priority,
+            len(self._waiters),
+        )
+        self._schedule_release()
+        await future
+
+    @callback
+    def _schedule_release(self) -> None:
+        """Wake up the queue as soon as the next token is available."""
+        if self._release_handle is not None:
+            return
+        delay = max(0.0, (1 - self._tokens) / self._rate)
+        self._release_handle = self.hass.loop.call_later(delay, self._release)
+
+    @callback
+    def _release(self) -> None:
+        """Hand out available tokens to the highest priority waiters."""
+        self._release_handle = None
+        self._refill()
+
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():  # caller was cancelled while waiting
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+
+        if self._waiters:
+            self._schedule_release()
+
+    @callback
+    def async_stagger_offset(self, interval: timedelta) -> timedelta:
+        """Return the start offset within `interval` for a newly set up coordinator."""
+        slot = self._registered
+        self._registered += 1
+        return interval * ((slot * _GOLDEN_RATIO_CONJUGATE) % 1)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> VVSRequestScheduler:
+    """Return the scheduler shared by all VVS entries."""
+    if DATA_SCHEDULER not in hass.data:
+        hass.data[DATA_SCHEDULER] = VVSRequestScheduler(
+            hass, REQUEST_BUDGET_PER_MINUTE, REQUEST_BURST
+        )
+    return hass.data[DATA_SCHEDULER]
@@ -2,14 +2,88 @@
 
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import math
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import BOARD_ARRIVALS, CONF_WALKING_TIME, DEFAULT_WALKING_TIME, DOMAIN
+from .coordinator import (
+    VVSBaseCoordinator,
+    VVSDataUpdateCoordinator,
+    VVSStationBoardCoordinator,
+)
+from .stats import VVSStatistics, percentile
+
+
+@dataclass(frozen=True, kw_only=True)
+class VVSStatisticsSensorEntityDescription(SensorEntityDescription):
+    """Describes a VVS diagnostic sensor."""
+
+    value_fn: Callable[[VVSStatistics], Any]
+
 
-from .const import DOMAIN
-from .coordinator import VVSDataUpdateCoordinator
+STATISTICS_SENSORS: tuple[VVSStatisticsSensorEntityDescription, ...] = (
+    VVSStatisticsSensorEntityDescription(
+        key="request_latency",
+        name="request latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda stats: percentile(stats.request_ms, 0.5),
+    ),
+    VVSStatisticsSensorEntityDescription(
+        key="request_latency_p90",
+        name="request latency p90",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda stats: percentile(stats.request_ms, 0.9),
+    ),
+    VVSStatisticsSensorEntityDescription(
+        key="response_size",
+        name="response size",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: percentile(stats.response_bytes, 0.5),
+    ),
+    VVSStatisticsSensorEntityDescription(
+        key="update_failures",
+        name="update failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.update_failures,
+    ),
+    VVSStatisticsSensorEntityDescription(
+        key="polls_saved",
+        name="polls saved",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.polls_saved,
+    ),
+    VVSStatisticsSensorEntityDescription(
+        key="last_success",
+        name="last successful update",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda stats: stats.last_success,
+    ),
+)
 
 
 async def async_setup_entry(
@@ -18,8 +92,26 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the VVS sensor."""
-    coordinator: VVSDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([VVSSensor(coordinator, entry)])
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    entities: list[SensorEntity] = [
+        VVSStatisticsSensor(coordinator, entry, description)
+        for description in STATISTICS_SENSORS
+    ]
+    if isinstance(coordinator, VVSStationBoardCoordinator):
+        entities.extend(
+            VVSBoardSensor(coordinator, entry, kind) for kind in coordinator.kinds
+        )
+    else:
+        entities.append(VVSSensor(coordinator, entry))
+        entities.append(
+            VVSLeaveBySensor(
+                coordinator,
+                entry,
+                entry.data.get(CONF_WALKING_TIME, DEFAULT_WALKING_TIME),
+            )
+        )
+    entities.append(VVSAlertsSensor(coordinator, entry))
+    async_add_entities(entities)
 
 
 class VVSSensor(CoordinatorEntity, SensorEntity):
@@ -44,10 +136,13 @@ class VVSSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self):
         """Return the state of the sensor (next departure time)."""
-        if not self.coordinator.data or not self.coordinator.data.get("trips"):
+        if not self.coordinator.data:
             return None
 
-        return self.coordinator.data["trips"][0]["departure"]
+        for trip in self.coordinator.data.get("trips", []):
+            if not trip["cancelled"]:
+                return trip["departure"]
+        return None
 
     @property
     def extra_state_attributes(self):
@@ -55,3 +150,211 @@ class VVSSensor(CoordinatorEntity, SensorEntity):
         if not self.coordinator.data:
             return {}
         return self.coordinator.data
+
+
+class VVSLeaveBySensor(CoordinatorEntity, SensorEntity):
+    """Minutes left until leaving for the next departure, counted down locally.
+
+    The leave-by time is the estimated departure of the first trip that can
+    still be caught minus the walking time. It is anchored on every coordinator
+    update and again when the countdown runs out; in between the state changes
+    exactly when another minute has passed, without any request.
+    """
+
+    _attr_icon = "mdi:walk"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+
+    def __init__(
+        self, coordinator: VVSDataUpdateCoordinator, entry: ConfigEntry, walking_time: int
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_leave_by"
+        self._attr_name = (
+            f"{coordinator.start_station_name} to {coordinator.dest_station_name} leave in"
+        )
+        self._walking_time = timedelta(minutes=walking_time)
+        self._departure: datetime | None = None
+        self._leave_at: datetime | None = None
+        self._unsub_tick: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Start counting down."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_cancel_tick)
+        self._async_anchor()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Anchor the countdown on the refreshed next departure."""
+        self._async_anchor()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_anchor(self) -> None:
+        """Pick the first trip still catchable and schedule the next change of the state."""
+        now = dt_util.utcnow()
+        self._departure = next(
+            (
+                departure
+                for departure in self.coordinator.departures_at
+                if departure - self._walking_time > now
+            ),
+            None,
+        )
+        self._leave_at = (
+            self._departure - self._walking_time if self._departure else None
+        )
+        self._async_schedule_tick()
+
+    @callback
+    def _async_schedule_tick(self) -> None:
+        """Wake up when the minutes left drop by one."""
+        self._async_cancel_tick()
+        if self._leave_at is None:
+            return
+        minutes_left = self.native_value
+        if not minutes_left:
+            return
+        self._unsub_tick = async_track_point_in_utc_time(
+            self.hass,
+            self._async_tick,
+            self._leave_at - timedelta(minutes=minutes_left - 1),
+        )
+
+    @callback
+    def _async_tick(self, _now: datetime) -> None:
+        """Count down one minute, moving on to the next trip once time is up."""
+        self._unsub_tick = None
+        if self.native_value:
+            self._async_schedule_tick()
+        else:
+            self._async_anchor()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_cancel_tick(self) -> None:
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the whole minutes left (0 once it's time to go)."""
+        if self._leave_at is None:
+            return None
+        seconds = (self._leave_at - dt_util.utcnow()).total_seconds()
+        return max(0, math.ceil(seconds / 60))
+
+    @property
+    def extra_state_attributes(self):
+        """Return the leave-by and departure time."""
+        if self._leave_at is None:
+            return {}
+        return {
+            "leave_at": self._leave_at.isoformat(),
+            "departure": self._departure.isoformat(),
+            "walking_time": int(self._walking_time.total_seconds() // 60),
+        }
+
+
+class VVSBoardSensor(CoordinatorEntity, SensorEntity):
+    """Representation of the departures or arrivals at a VVS stop."""
+
+    def __init__(
+        self,
+        coordinator: VVSStationBoardCoordinator,
+        entry: ConfigEntry,
+        kind: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._entry = entry
+        self._kind = kind
+        self._attr_unique_id = f"{entry.entry_id}_{kind}"
+        self._attr_name = f"{coordinator.station_name} {kind.title()}"
+        self._attr_icon = "mdi:bus-clock" if kind == BOARD_ARRIVALS else "mdi:bus-side"
+
+    @property
+    def native_value(self):
+        """Return the estimated time of the next departure/arrival."""
+        if not self.coordinator.data:
+            return None
+
+        for item in self.coordinator.data.get(self._kind, []):
+            if not item["cancelled"]:
+                return item["estimated"]
+        return None
+
+    @property
+    def extra_state_attributes(self):
+        """Return the board."""
+        if not self.coordinator.data:
+            return {}
+        return {self._kind: self.coordinator.data.get(self._kind, [])}
+
+
+class VVSAlertsSensor(CoordinatorEntity, SensorEntity):
+    """Number of current disruption and info messages concerning a VVS entry."""
+
+    _attr_icon = "mdi:alert-circle-outline"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: VVSBaseCoordinator, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_alerts"
+        self._attr_name = f"{entry.title} alerts"
+
+    @property
+    def native_value(self):
+        """Return the number of current messages."""
+        if self.coordinator.data is None:
+            return None
+        return len(self.coordinator.data.get("alerts", []))
+
+    @property
+    def extra_state_attributes(self):
+        """Return the messages, most important first."""
+        if not self.coordinator.data:
+            return {}
+        return {"alerts": self.coordinator.data.get("alerts", [])}
+
+
+class VVSStatisticsSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor exposing the performance statistics of a VVS entry."""
+
+    entity_description: VVSStatisticsSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: VVSBaseCoordinator,
+        entry: ConfigEntry,
+        description: VVSStatisticsSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_name = f"{entry.title} {description.name}"
+
+    async def async_added_to_hass(self) -> None:
+        """Update after every poll, also those the coordinator doesn't publish."""
+        await super().async_added_to_hass()
+        # Polls returning unchanged data don't notify the coordinator's listeners
+        self.async_on_remove(
+            self.coordinator.stats.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def available(self) -> bool:
+        """Statistics stay available when updates fail."""
+        return True
+
+    @property
+    def native_value(self):
+        """Return the statistic."""
+        return self.entity_description.value_fn(self.coordinator.stats)
@@ -0,0 +1,140 @@
+"""Rolling performance statistics of a VVS coordinator."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.util import dt as dt_util
+
+from .const import STATS_WINDOW
+
+
+def percentile(values: deque[float], fraction: float) -> float | None:
+    """Return the value below which `fraction` of the values fall."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _summary(values: deque[float], digits: int = 1) -> dict[str, float | None]:
+    """Percentiles of a window, rounded for display."""
+    summary = {}
+    for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        value = percentile(values, fraction)
+        summary[name] = None if value is None else round(value, digits)
+    return summary
+
+
+class VVSStatistics:
+    """Latency, size and error statistics over the last `STATS_WINDOW` polls."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.update_ms: deque[float] = deque(maxlen=STATS_WINDOW)
+        self.request_ms: deque[float] = deque(maxlen=STATS_WINDOW)
+        self.parse_ms: deque[float] = deque(maxlen=STATS_WINDOW)
+        self.response_bytes: deque[int] = deque(maxlen=STATS_WINDOW)
+
+        self.updates = 0
+        self.update_failures = 0
+        self.requests = 0
+        self.request_errors = 0
+        self.retries = 0
+        self.bytes_total = 0
+        self.cache_hits = 0
+        self.polls_saved = 0
+
+        self.last_success: datetime | None = None
+        self.last_failure: datetime | None = None
+        self.last_error: str | None = None
+
+        self._listeners: list[Callable[[], None]] = []
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call `update_callback` after every poll, even if its data didn't change.
+
+        Returns the callback removing the listener again.
+        """
+        self._listeners.append(update_callback)
+
+        @callback
+        def _async_remove() -> None:
+            self._listeners.remove(update_callback)
+
+        return _async_remove
+
+    def _notify(self) -> None:
+        """Tell the listeners the statistics changed."""
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def record_events(self, events: list) -> None:
+        """Account the vvspy request events captured during a poll."""
+        for event in events:
+            if event.cache_hit:
+                self.cache_hits += 1
+                continue
+            self.requests += 1
+            self.retries += event.retries
+            if event.error is not None:
+                self.request_errors += 1
+            self.request_ms.append(event.total_time * 1000)
+            if event.parse_time is not None:
+                self.parse_ms.append(event.parse_time * 1000)
+            if event.response_bytes is not None:
+                self.response_bytes.append(event.response_bytes)
+                self.bytes_total += event.response_bytes
+
+    def record_saved(self) -> None:
+        """Count a poll answered without an API request."""
+        self.polls_saved += 1
+
+    def record_success(self, seconds: float) -> None:
+        """Count a successful poll taking `seconds` (including queueing)."""
+        self.updates += 1
+        self.update_ms.append(seconds * 1000)
+        self.last_success = dt_util.utcnow()
+        self._notify()
+
+    def record_failure(self, err: Exception) -> None:
+        """Count a failed poll."""
+        self.updates += 1
+        self.update_failures += 1
+        self.last_failure = dt_util.utcnow()
+        self.last_error = str(err)
+        self._notify()
+
+    @property
+    def failure_rate(self) -> float | None:
+        """Share of failed polls."""
+        if not self.updates:
+            return None
+        return round(self.update_failures / self.updates, 3)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {
+            "window": STATS_WINDOW,
+            "update_ms": _summary(self.update_ms),
+            "request_ms": _summary(self.request_ms),
+            "parse_ms": _summary(self.parse_ms, 2),
+            "response_bytes": _summary(self.response_bytes, 0),
+            "updates": self.updates,
+            "update_failures": self.update_failures,
+            "failure_rate": self.failure_rate,
+            "requests": self.requests,
+            "request_errors": self.request_errors,
+            "retries": self.retries,
+            "bytes_total": self.bytes_total,
+            "cache_hits": self.cache_hits,
+            "polls_saved": self.polls_saved,
+            "last_success": self.last_success,
+            "last_failure": self.last_failure,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,42 @@
+"""Offline timetable answering planned trips when the VVS API cannot."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_STOP_INDEX, DATA_TIMETABLE, TIMETABLE_FILE
+from .vvspy.geo import StopIndex
+from .vvspy.timetable import Timetable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_get_timetable(hass: HomeAssistant) -> Timetable | None:
+    """Return the shared timetable, or None if no timetable file was built."""
+    lock: asyncio.Lock = hass.data.setdefault(f"{DATA_TIMETABLE}_lock", asyncio.Lock())
+    async with lock:
+        if DATA_TIMETABLE not in hass.data:
+            path = hass.config.path(TIMETABLE_FILE)
+            timetable = None
+            if await hass.async_add_executor_job(os.path.exists, path):
+                try:
+                    timetable = await hass.async_add_executor_job(Timetable, path)
+                except Exception:
+                    _LOGGER.exception("Could not open the VVS timetable %s", path)
+            hass.data[DATA_TIMETABLE] = timetable
+        return hass.data[DATA_TIMETABLE]
+
+
+async def async_get_stop_index(hass: HomeAssistant) -> StopIndex | None:
+    """Return the shared index of the timetable's stations, or None without a timetable."""
+    if DATA_STOP_INDEX not in hass.data:
+        timetable = await async_get_timetable(hass)
+        index = None
+        if timetable is not None:
+            index = await hass.async_add_executor_job(StopIndex.from_timetable, timetable)
+        hass.data[DATA_STOP_INDEX] = index
+    return hass.data[DATA_STOP_INDEX]
@@ -1,23 +1,74 @@
+from __future__ import annotations
+
 from datetime import datetime as __datetime
+from importlib import import_module as __import_module
 from typing import List as __List
 from typing import Union as __Union, TYPE_CHECKING
-from requests.models import Response as __Response
-from requests import Session
 import logging as __logging
 
 if TYPE_CHECKING:
-    from .enums import Station
+    from requests import Session
+    from requests.models import Response as __Response
 
-from .models import Arrival as __Arrival
-from .models import Departure as __Departure
-from .models import Trip as __Trip
-from .trip import get_trips
-from .departures import get_departures
-from .arrivals import get_arrivals
+    from . import history, instrumentation, timetable
+    from .batch import get_trips_many, async_get_trips_many
+    from .enums import Station
+    from .models import Arrival as __Arrival
+    from .models import Departure as __Departure
+    from .models import Trip as __Trip
+    from .overlay import RealtimeOverlay
+    from .prefetch import TripBuffer
+    from .trip import get_trips
+    from .departures import get_departures
+    from .arrivals import get_arrivals
 
 
 __logger = __logging.getLogger("vvspy")
 
+# Imported on first access, so ``import vvspy`` neither loads requests nor
+# every model (and the station enum is only loaded by ``vvspy.enums``)
+_LAZY_ATTRIBUTES = {
+    "get_trips": ".trip",
+    "get_departures": ".departures",
+    "get_arrivals": ".arrivals",
+    "get_trips_many": ".batch",
+    "async_get_trips_many": ".batch",
+    "RealtimeOverlay": ".overlay",
+    "TripBuffer": ".prefetch",
+    "Session": "requests",
+}
+_LAZY_SUBMODULES = {
+    "arrivals",
+    "batch",
+    "departures",
+    "diff",
+    "enums",
+    "geo",
+    "history",
+    "instrumentation",
+    "messages",
+    "models",
+    "overlay",
+    "prefetch",
+    "timetable",
+    "trip",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(__import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    elif name in _LAZY_SUBMODULES:
+        value = __import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _LAZY_SUBMODULES)
+
 
 def departures_now(
     station_id: __Union[str, int, "Station"],
@@ -34,6 +85,8 @@ def departures_now(
     Returns none on webrequest errors or no results found.
 
     """
+    from .departures import get_departures
+
     return get_departures(
         station_id=station_id,
         check_time=__datetime.now(),
@@ -61,6 +114,8 @@ def get_departure(
     Returns none on webrequest errors or no results found.
 
     """
+    from .departures import get_departures
+
     try:
         if return_resp:
             return get_departures(
@@ -109,6 +164,8 @@ def get_arrival(
     Returns none on webrequest errors or no results found.
 
     """
+    from .arrivals import get_arrivals
+
     try:
         if return_resp:
             return get_arrivals(
@@ -158,6 +215,8 @@ def get_trip(
     Returns none on webrequest errors or no results found.
 
     """
+    from .trip import get_trips
+
     try:
         if return_resp:
             return get_trips(
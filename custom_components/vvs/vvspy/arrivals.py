@@ -8,6 +8,7 @@ import logging as __logging
 
 if TYPE_CHECKING:
     from .enums import Station
+from .instrumentation import record
 from .models import Arrival
 
 _API_URL = "http://www3.vvs.de/vvs/widget/XML_DM_REQUEST?"
@@ -101,35 +102,36 @@ def get_arrivals(
         "itdTripDateTimeDepArr": "arr",
     }
 
-    if session:
-        r = session.get(_API_URL, **{**request_params, **{"params": params}})
-    else:
-        r = requests.get(_API_URL, **{**request_params, **{"params": params}})
-
-    __logger.debug(
-        f"Request took {r.elapsed.total_seconds()}s and returned {r.status_code}"
-    )
-
-    if r.status_code != 200:
-        __logger.error("Error in API request")
-        __logger.error(f"Request: {r.status_code}")
-        __logger.error(f"{r.text}")
-        raise Exception(f"Error in API request: {r.status_code}")
-
-    if return_response:
-        return r
-
-    __logger.debug("Initializing parsing of response...")
-
-    try:
-        r.encoding = "UTF-8"
-        return _parse_response(r.json())
-    except json.decoder.JSONDecodeError as e:
-        __logger.error(
-            "Error in API request. Received invalid JSON. Status code: %s",
-            r.status_code,
+    with record("arrivals") as event:
+        r = event.get(_API_URL, session, request_params, params)
+
+        __logger.debug(
+            f"Request took {r.elapsed.total_seconds()}s and returned {r.status_code}"
         )
-        raise e
+
+        if r.status_code != 200:
+            __logger.error("Error in API request")
+            __logger.error(f"Request: {r.status_code}")
+            __logger.error(f"{r.text}")
+            raise Exception(f"Error in API request: {r.status_code}")
+
+        if return_response:
+            return r
+
+        __logger.debug("Initializing parsing of response...")
+
+        try:
+            r.encoding = "UTF-8"
+            with event.parsing():
+                arrivals = _parse_response(r.json())
+            event.items = len(arrivals)
+            return arrivals
+        except json.decoder.JSONDecodeError as e:
+            __logger.error(
+                "Error in API request. Received invalid JSON. Status code: %s",
+                r.status_code,
+            )
+            raise e
 
 
 def _parse_response(result: dict) -> List[Arrival]:
@@ -0,0 +1,218 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from enum import Enum
+from typing import Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
+import asyncio
+import logging as __logging
+
+import requests
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    from .enums import Station
+from .instrumentation import captures, forward
+from .models import Trip
+from .trip import get_trips
+
+__logger = __logging.getLogger("vvspy")
+
+RouteSpec = Union[
+    dict,
+    Tuple[Union[str, int, "Station"], Union[str, int, "Station"]],
+]
+
+
+class TripResult:
+    r"""
+
+        Result of one route of a :func:`get_trips_many` call.
+
+        Attributes
+        -----------
+
+        route :class:`dict`
+            The route spec as passed to :func:`vvspy.get_trips`
+            (``origin_station_id``, ``destination_station_id`` and extra kwargs).
+        trips Optional[List[:class:`Trip`]]
+            Trips found for this route, ``None`` if the request failed.
+        error Optional[:class:`Exception`]
+            Exception raised while fetching this route.
+    """
+
+    def __init__(self, route: dict, trips: List[Trip] = None, error: Exception = None):
+        self.route = route
+        self.trips = trips
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __str__(self):
+        status = f"{len(self.trips or [])} trips" if self.ok else f"error: {self.error}"
+        return f"{self.route.get('origin_station_id')} -> {self.route.get('destination_station_id')} ({status})"
+
+
+def _normalize_route(route: RouteSpec) -> dict:
+    if isinstance(route, dict):
+        if "origin_station_id" not in route or "destination_station_id" not in route:
+            raise ValueError(
+                "Route specs need 'origin_station_id' and 'destination_station_id'"
+            )
+        return dict(route)
+    origin, destination = route
+    return {"origin_station_id": origin, "destination_station_id": destination}
+
+
+def _hashable(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (str, int, float, bool, datetime)) or value is None:
+        return value
+    return repr(value)
+
+
+def _route_key(route: dict) -> tuple:
+    r"""Identity of a route spec, used to send identical routes only once."""
+    return tuple(sorted((k, _hashable(v)) for k, v in route.items()))
+
+
+def _create_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _dedupe(routes: Iterable[RouteSpec], **kwargs) -> Tuple[List[dict], List[tuple], dict]:
+    normalized = [{**kwargs, **_normalize_route(route)} for route in routes]
+    keys = [_route_key(route) for route in normalized]
+    unique = {}
+    for key, route in zip(keys, normalized):
+        unique.setdefault(key, route)
+    return normalized, keys, unique
+
+
+def _fetch(route: dict, session: requests.Session, event_lists: List[list] = ()) -> TripResult:
+    # Requests run in worker threads, report them to the caller's captures
+    with forward(list(event_lists)):
+        try:
+            return TripResult(route, trips=get_trips(session=session, **route))
+        except Exception as e:  # reported per route, the other routes keep going
+            __logger.error(f"Error fetching trips for route {route}: {e}")
+            return TripResult(route, error=e)
+
+
+def _collect(normalized: List[dict], keys: List[tuple], fetched: dict) -> List[TripResult]:
+    return [
+        TripResult(route, trips=fetched[key].trips, error=fetched[key].error)
+        for key, route in zip(keys, normalized)
+    ]
+
+
+def get_trips_many(
+    routes: Iterable[RouteSpec],
+    max_workers: int = 4,
+    session: Optional[requests.Session] = None,
+    **kwargs,
+) -> List[TripResult]:
+    r"""
+
+    Fetch trips for several routes concurrently.
+    Identical routes are requested only once, all requests share one connection pool.
+
+    Returns: List[:class:`vvspy.batch.TripResult`] in the order of ``routes``.
+    Errors are reported per route and never raised.
+
+    Examples
+    --------
+    Basic usage:
+
+    .. code-block:: python
+
+        results = vvspy.get_trips_many(
+            [
+                ("5006115", "5006465"),  # Stuttgart main station to Zuffenhausen
+                {"origin_station_id": "5006115", "destination_station_id": "5000355", "routeType": "leastinterchange"},
+            ],
+            limit=3,
+        )
+        for result in results:
+            print(result.trips if result.ok else result.error)
+
+    Parameters
+    ----------
+        routes List[Union[:class:`tuple`, :class:`dict`]]
+            ``(origin, destination)`` tuples or dicts of :func:`vvspy.get_trips` arguments.
+        max_workers Optional[:class:`int`]
+            Maximum number of requests in flight.
+            default 4
+        session Optional[:class:`requests.Session`]
+            if set, uses a given requests.session object for requests.
+            Its connection pool should allow ``max_workers`` connections.
+        kwargs Optional[:class:`dict`]
+            Passed to every :func:`vvspy.get_trips` call, route specs take precedence.
+    """
+    normalized, keys, unique = _dedupe(routes, **kwargs)
+    if not unique:
+        return []
+
+    own_session = session is None
+    if own_session:
+        session = _create_session(max_workers)
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as executor:
+            futures = {
+                key: executor.submit(_fetch, route, session, captures())
+                for key, route in unique.items()
+            }
+            fetched = {key: future.result() for key, future in futures.items()}
+    finally:
+        if own_session:
+            session.close()
+
+    __logger.debug(f"Fetched {len(unique)} unique routes for {len(normalized)} requested")
+    return _collect(normalized, keys, fetched)
+
+
+async def async_get_trips_many(
+    routes: Iterable[RouteSpec],
+    max_concurrency: int = 4,
+    session: Optional[requests.Session] = None,
+    executor: Optional[ThreadPoolExecutor] = None,
+    **kwargs,
+) -> List[TripResult]:
+    r"""
+
+    Same as `get_trips_many`
+    But awaitable, running at most ``max_concurrency`` requests at once in ``executor``
+    (the event loop's default executor if not set).
+
+    Returns: List[:class:`vvspy.batch.TripResult`] in the order of ``routes``.
+
+    """
+    normalized, keys, unique = _dedupe(routes, **kwargs)
+    if not unique:
+        return []
+
+    own_session = session is None
+    if own_session:
+        session = _create_session(max_concurrency)
+
+    loop = asyncio.get_running_loop()
+    active = captures()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded_fetch(route: dict) -> TripResult:
+        async with semaphore:
+            return await loop.run_in_executor(executor, _fetch, route, session, active)
+
+    try:
+        results = await asyncio.gather(*(_bounded_fetch(route) for route in unique.values()))
+    finally:
+        if own_session:
+            session.close()
+
+    return _collect(normalized, keys, dict(zip(unique.keys(), results)))
@@ -8,7 +8,8 @@ import logging as __logging
 
 if TYPE_CHECKING:
     from .enums import Station
-from vvspy.models import Departure
+from .instrumentation import record
+from .models import Departure
 
 __API_URL = "http://www3.vvs.de/vvs/widget/XML_DM_REQUEST?"
 __logger = __logging.getLogger("vvspy")
@@ -99,35 +100,36 @@ def get_departures(
         "itdTimeMinute": check_time.strftime("%M"),
     }
 
-    if session:
-        r = session.get(__API_URL, **{**request_params, **{"params": params}})
-    else:
-        r = requests.get(__API_URL, **{**request_params, **{"params": params}})
-
-    __logger.debug(
-        f"Request took {r.elapsed.total_seconds()}s and returned {r.status_code}"
-    )
-
-    if r.status_code != 200:
-        __logger.error("Error in API request")
-        __logger.error(f"Request: {r.status_code}")
-        __logger.error(f"{r.text}")
-        raise Exception(f"Error in API request: {r.status_code}")
-
-    if return_response:
-        return r
-
-    __logger.debug("Initializing parsing of response...")
-
-    try:
-        r.encoding = "UTF-8"
-        return _parse_response(r.json())
-    except json.decoder.JSONDecodeError as e:
-        __logger.error(
-            "Error in API request. Received invalid JSON. Status code: %s",
-            r.status_code,
+    with record("departures") as event:
+        r = event.get(__API_URL, session, request_params, params)
+
+        __logger.debug(
+            f"Request took {r.elapsed.total_seconds()}s and returned {r.status_code}"
         )
-        raise e
+
+        if r.status_code != 200:
+            __logger.error("Error in API request")
+            __logger.error(f"Request: {r.status_code}")
+            __logger.error(f"{r.text}")
+            raise Exception(f"Error in API request: {r.status_code}")
+
+        if return_response:
+            return r
+
+        __logger.debug("Initializing parsing of response...")
+
+        try:
+            r.encoding = "UTF-8"
+            with event.parsing():
+                departures = _parse_response(r.json())
+            event.items = len(departures)
+            return departures
+        except json.decoder.JSONDecodeError as e:
+            __logger.error(
+                "Error in API request. Received invalid JSON. Status code: %s",
+                r.status_code,
+            )
+            raise e
 
 
 def _parse_response(result: dict) -> List[Departure]:
@@ -0,0 +1,138 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import Trip
+
+
+def _stop_id(stop) -> Optional[str]:
+    r"""Station id of a stop, platforms may change between requests."""
+    parent = stop.parent if isinstance(stop.parent, dict) else {}
+    return parent.get("id") or stop.id
+
+
+def journey_key(trip: Trip) -> tuple:
+    r"""
+
+    Stable identity of a journey across requests: vehicle journey (transportation id),
+    planned departure and station of every leg ridden. Walks are left out,
+    they differ between requests while the vehicles stay the same.
+
+    Returns: :class:`tuple`, equal for the same journey in two results.
+
+    """
+    legs = [leg for leg in trip.connections if leg.transportation.number] or trip.connections[:1]
+    return tuple(
+        (
+            leg.transportation.id or leg.transportation.number,
+            leg.origin.departure_time_planned,
+            _stop_id(leg.origin),
+        )
+        for leg in legs
+    )
+
+
+def _times(trip: Trip) -> tuple:
+    return tuple(
+        (leg.origin.departure_time_estimated, leg.destination.arrival_time_estimated)
+        for leg in trip.connections
+    )
+
+
+def platform(stop) -> Optional[str]:
+    r"""Platform of a leg's origin or destination, ``None`` if unknown."""
+    properties = stop.properties or {}
+    return properties.get("platformName") or properties.get("platform")
+
+
+def _platforms(trip: Trip) -> tuple:
+    return tuple(platform(leg.origin) for leg in trip.connections)
+
+
+def _cancelled(trip: Trip) -> bool:
+    return any(leg.cancelled for leg in trip.connections)
+
+
+class TripDiff:
+    r"""
+
+        Changes between two results of the same route, see :func:`diff_trips`.
+
+        Attributes
+        -----------
+
+        added List[:class:`vvspy.models.Trip`]
+            journeys only in the new result.
+        removed List[:class:`vvspy.models.Trip`]
+            journeys only in the old result (departed or no longer suggested).
+        delayed List[Tuple[:class:`vvspy.models.Trip`, :class:`vvspy.models.Trip`]]
+            ``(old, new)`` journeys whose estimated times changed.
+        cancelled List[:class:`vvspy.models.Trip`]
+            journeys cancelled since the old result (new trip).
+        platform_changed List[Tuple[:class:`vvspy.models.Trip`, :class:`vvspy.models.Trip`]]
+            ``(old, new)`` journeys departing from another platform at any leg.
+        unchanged :class:`int`
+            number of journeys in both results without changes.
+    """
+
+    def __init__(self):
+        self.added: List[Trip] = []
+        self.removed: List[Trip] = []
+        self.delayed: List[Tuple[Trip, Trip]] = []
+        self.cancelled: List[Trip] = []
+        self.platform_changed: List[Tuple[Trip, Trip]] = []
+        self.unchanged = 0
+
+    def __bool__(self):
+        return bool(
+            self.added or self.removed or self.delayed or self.cancelled or self.platform_changed
+        )
+
+    def __str__(self):
+        return (
+            f"+{len(self.added)} -{len(self.removed)} "
+            f"{len(self.delayed)} delayed, {len(self.cancelled)} cancelled, "
+            f"{len(self.platform_changed)} platform changes, {self.unchanged} unchanged"
+        )
+
+
+def diff_trips(old: Optional[Iterable[Trip]], new: Optional[Iterable[Trip]]) -> TripDiff:
+    r"""
+
+    Compare two results of the same route in linear time, matching journeys by :func:`journey_key`.
+
+    Returns: :class:`TripDiff`, falsy if nothing changed.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        before = vvspy.get_trips("5006115", "5006465", limit=5)
+        after = vvspy.get_trips("5006115", "5006465", limit=5)
+        for old, new in vvspy.diff.diff_trips(before, after).delayed:
+            print(new.connections[0].origin.delay - old.connections[0].origin.delay)
+
+    """
+    diff = TripDiff()
+    previous: Dict[tuple, Trip] = {
+        journey_key(trip): trip for trip in old or [] if trip.connections
+    }
+    for trip in new or []:
+        if not trip.connections:
+            continue
+        before = previous.pop(journey_key(trip), None)
+        if before is None:
+            diff.added.append(trip)
+            continue
+        changed = False
+        if _cancelled(trip) and not _cancelled(before):
+            diff.cancelled.append(trip)
+            changed = True
+        if _times(trip) != _times(before):
+            diff.delayed.append((before, trip))
+            changed = True
+        if _platforms(trip) != _platforms(before):
+            diff.platform_changed.append((before, trip))
+            changed = True
+        diff.unchanged += not changed
+    diff.removed.extend(previous.values())
+    return diff
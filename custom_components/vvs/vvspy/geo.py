@@ -0,0 +1,242 @@
+from array import array
+from math import asin, cos, floor, radians, sin, sqrt
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+import csv
+import heapq
+import logging as __logging
+
+if TYPE_CHECKING:
+    from .timetable import Timetable
+
+_logger = __logging.getLogger("vvspy")
+
+EARTH_RADIUS_M = 6371008.8
+_METERS_PER_DEGREE = radians(1) * EARTH_RADIUS_M
+
+# stop id, name, distance in meters
+NearbyStop = Tuple[str, str, float]
+
+
+def distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    r"""Great-circle distance in meters between two WGS84 coordinates."""
+    phi1, phi2 = radians(lat1), radians(lat2)
+    a = sin((phi2 - phi1) / 2) ** 2 + cos(phi1) * cos(phi2) * sin(radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * asin(min(1.0, sqrt(a)))
+
+
+def coord_origin(lat: float, lon: float) -> str:
+    r"""
+
+    EFA name of a WGS84 position, to route from (or to) a position instead of a stop.
+
+    .. code-block:: python
+
+        vvspy.get_trips(vvspy.geo.coord_origin(48.7784, 9.1800), "5006465", type_origin="coord")
+
+    """
+    return f"{lon:.5f}:{lat:.5f}:WGS84[DD.ddddd]"
+
+
+class StopIndex:
+    r"""
+
+        Grid index over stop coordinates, answering nearest-stop and radius queries.
+
+        Stops are bucketed into square cells of about ``cell_size`` meters.
+        Queries only look at the cells around the position, so they take
+        microseconds for all ~20k VVS stops.
+
+        The station enum carries no coordinates; build the index from the stops of
+        a GTFS feed, either a :class:`vvspy.timetable.Timetable` or a ``stops.txt``.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            index = vvspy.geo.StopIndex.from_csv("stops.txt")
+            for stop_id, name, meters in index.nearest(48.7784, 9.1800, k=3):
+                print(f"{name} ({meters:.0f} m)")
+
+        Attributes
+        -----------
+
+        ids List[:class:`str`]
+            stop ids.
+        names List[:class:`str`]
+            stop names.
+        lats :class:`array.array`
+            latitudes.
+        lons :class:`array.array`
+            longitudes.
+        cell_size :class:`float`
+            edge length of the grid cells in meters.
+    """
+
+    def __init__(self, stops: Iterable[Tuple[str, str, float, float]], cell_size: float = 1000.0):
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.lats = array("d")
+        self.lons = array("d")
+        for stop_id, name, lat, lon in stops:
+            if lat is None or lon is None:
+                continue
+            self.ids.append(stop_id)
+            self.names.append(name)
+            self.lats.append(float(lat))
+            self.lons.append(float(lon))
+
+        self.cell_size = cell_size
+        # Longitude degrees shrink towards the poles, fine for an area the size of a region
+        reference = sum(self.lats) / len(self.lats) if self.lats else 0.0
+        self._lon_scale = cos(radians(reference))
+        self._cell_lat = cell_size / _METERS_PER_DEGREE
+        self._cell_lon = self._cell_lat / self._lon_scale
+
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        for i, (lat, lon) in enumerate(zip(self.lats, self.lons)):
+            self._cells.setdefault(self._cell(lat, lon), []).append(i)
+        # Extent of the occupied cells, no stop lies beyond it
+        rows = [row for row, _ in self._cells]
+        cols = [col for _, col in self._cells]
+        self._bounds = (min(rows), max(rows), min(cols), max(cols)) if self._cells else None
+
+    @classmethod
+    def from_timetable(cls, timetable: "Timetable", **kwargs) -> "StopIndex":
+        r"""Index of the stations of a :class:`vvspy.timetable.Timetable`."""
+        return cls(timetable.stations(), **kwargs)
+
+    @classmethod
+    def from_csv(cls, path: str, **kwargs) -> "StopIndex":
+        r"""
+
+        Index of a CSV file with a header row, like the GTFS ``stops.txt``.
+        Columns are ``stop_id``, ``stop_name``, ``stop_lat`` and ``stop_lon``
+        (or ``id``, ``name``, ``lat`` and ``lon``).
+
+        """
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+
+        def _value(row, *names):
+            for name in names:
+                if row.get(name) not in (None, ""):
+                    return row[name]
+            return None
+
+        stops = []
+        for row in rows:
+            lat, lon = _value(row, "stop_lat", "lat"), _value(row, "stop_lon", "lon")
+            stops.append(
+                (
+                    _value(row, "stop_id", "id"),
+                    _value(row, "stop_name", "name"),
+                    float(lat) if lat is not None else None,
+                    float(lon) if lon is not None else None,
+                )
+            )
+        _logger.debug(f"Indexed {len(stops)} stops from {path}")
+        return cls(stops, **kwargs)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return floor(lat / self._cell_lat), floor(lon / self._cell_lon)
+
+    def _meters(self, i: int, lat: float, lon: float) -> float:
+        r"""Equirectangular distance, exact enough within a region and cheaper than haversine."""
+        dy = (self.lats[i] - lat) * _METERS_PER_DEGREE
+        dx = (self.lons[i] - lon) * _METERS_PER_DEGREE * self._lon_scale
+        return sqrt(dx * dx + dy * dy)
+
+    def _max_ring(self, center: Tuple[int, int]) -> int:
+        r"""Ring around ``center`` reaching the farthest occupied cell."""
+        row, col = center
+        min_row, max_row, min_col, max_col = self._bounds
+        return max(row - min_row, max_row - row, col - min_col, max_col - col, 0)
+
+    def _ring(self, center: Tuple[int, int], ring: int) -> Iterable[int]:
+        row, col = center
+        if ring == 0:
+            yield from self._cells.get(center, ())
+            return
+        # Only the part of the ring within the occupied extent
+        min_row, max_row, min_col, max_col = self._bounds
+        cols = range(max(col - ring, min_col), min(col + ring, max_col) + 1)
+        for edge_row in (row - ring, row + ring):
+            if min_row <= edge_row <= max_row:
+                for c in cols:
+                    yield from self._cells.get((edge_row, c), ())
+        rows = range(max(row - ring + 1, min_row), min(row + ring - 1, max_row) + 1)
+        for edge_col in (col - ring, col + ring):
+            if min_col <= edge_col <= max_col:
+                for r in rows:
+                    yield from self._cells.get((r, edge_col), ())
+
+    def nearest(self, lat: float, lon: float, k: int = 5, max_distance: Optional[float] = None) -> List[NearbyStop]:
+        r"""
+
+        The ``k`` stops closest to a position.
+
+        Returns: List of ``(stop id, name, meters)``, closest first.
+
+        Parameters
+        ----------
+            lat :class:`float`
+                WGS84 latitude.
+            lon :class:`float`
+                WGS84 longitude.
+            k :class:`int`
+                number of stops.
+                default 5
+            max_distance Optional[:class:`float`]
+                ignore stops farther away (meters).
+        """
+        if not self.ids or k <= 0:
+            return []
+        center = self._cell(lat, lon)
+        best: List[Tuple[float, int]] = []  # max-heap of the k closest by negated distance
+        k = min(k, len(self.ids))
+        ring = 0
+        max_ring = self._max_ring(center)
+        while ring <= max_ring:
+            for i in self._ring(center, ring):
+                meters = self._meters(i, lat, lon)
+                if len(best) < k:
+                    heapq.heappush(best, (-meters, i))
+                elif meters < -best[0][0]:
+                    heapq.heapreplace(best, (-meters, i))
+            # Cells of later rings are at least `ring` cells away
+            reach = ring * self.cell_size
+            if len(best) == k and (k == len(self.ids) or -best[0][0] <= reach):
+                break
+            if max_distance is not None and reach > max_distance:
+                break
+            ring += 1
+
+        return [
+            (self.ids[i], self.names[i], meters)
+            for meters, i in sorted((-negated, i) for negated, i in best)
+            if max_distance is None or meters <= max_distance
+        ]
+
+    def within(self, lat: float, lon: float, radius: float) -> List[NearbyStop]:
+        r"""
+
+        All stops within ``radius`` meters of a position.
+
+        Returns: List of ``(stop id, name, meters)``, closest first.
+
+        """
+        if not self.ids:
+            return []
+        center = self._cell(lat, lon)
+        rings = min(int(radius // self.cell_size) + 1, self._max_ring(center))
+        found = []
+        for ring in range(rings + 1):
+            for i in self._ring(center, ring):
+                meters = self._meters(i, lat, lon)
+                if meters <= radius:
+                    found.append((meters, i))
+        return [(self.ids[i], self.names[i], meters) for meters, i in sorted(found)]
@@ -0,0 +1,459 @@
+from datetime import datetime, timedelta, timezone, tzinfo
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+import logging as __logging
+import sqlite3
+import threading
+
+from .models import Connection, Departure, Trip
+
+_logger = __logging.getLogger("vvspy")
+
+SCHEMA_VERSION = 1
+
+# stop id, line number, planned departure (naive UTC), delay in minutes, cancelled
+Observation = Tuple[str, str, datetime, int, bool]
+
+GROUPS = {
+    "hour": "hour",
+    "weekday": "weekday",
+    "line": "line",
+    "stop": "stop",
+    "day": "day",
+}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def global_stop_id(stop_id: Optional[str]) -> Optional[str]:
+    r"""Global station id (``"de:08111:6115"``) of a station or one of its platforms (``"de:08111:6115:1:2"``)."""
+    if stop_id and stop_id.startswith("de:"):
+        return ":".join(stop_id.split(":")[:3])
+    return stop_id
+
+
+def leg_stop(connection: Connection) -> str:
+    r"""Global station id a leg departs from (the station of its platform)."""
+    return global_stop_id(connection.origin.id) or (connection.origin.parent or {}).get("id")
+
+
+def trip_observations(trips: Iterable[Trip]) -> List[Observation]:
+    r"""
+
+    Departure delays of all public transport legs of trips.
+    Legs without realtime data are left out, their delay of 0 is only the plan.
+
+    """
+    observations = []
+    for trip in trips or []:
+        for connection in trip.connections:
+            number = connection.transportation.number
+            if not number or connection.origin.departure_time_planned is None:
+                continue
+            if not (connection.is_realtime_controlled or connection.cancelled):
+                continue
+            observations.append(
+                (
+                    leg_stop(connection),
+                    number,
+                    connection.origin.departure_time_planned,
+                    connection.origin.delay,
+                    connection.cancelled,
+                )
+            )
+    return observations
+
+
+def departure_observations(
+    departures: Iterable[Departure], tz: tzinfo = None, stop: Optional[str] = None
+) -> List[Observation]:
+    r"""
+
+    Delays of departure board entries, whose times are local (``tz``, default ``Europe/Berlin``).
+    Entries without realtime data are left out.
+
+    Boards only carry the numeric EFA stop id (e.g. ``"5006115"``), pass the station id
+    the board was requested for as ``stop`` (e.g. ``"de:08111:6115"``) to record them
+    under the same stop as :func:`trip_observations`.
+
+    """
+    tz = tz or ZoneInfo("Europe/Berlin")
+    stop = global_stop_id(stop)
+    observations = []
+    for departure in departures or []:
+        if departure.datetime is None or not departure.serving_line.number:
+            continue
+        if not (departure.serving_line.real_time or departure.cancelled):
+            continue
+        planned = departure.datetime.replace(tzinfo=tz).astimezone(timezone.utc).replace(tzinfo=None)
+        observations.append(
+            (stop or departure.stop_id, departure.serving_line.number, planned, departure.delay, departure.cancelled)
+        )
+    return observations
+
+
+def _percentile(histogram: List[Tuple[int, int]], count: int, fraction: float) -> int:
+    r"""Percentile of a sorted ``(delay, count)`` histogram."""
+    rank = min(count - 1, int(fraction * count))
+    seen = 0
+    for delay, n in histogram:
+        seen += n
+        if seen > rank:
+            return delay
+    return histogram[-1][0]
+
+
+class DelayHistory:
+    r"""
+
+        Local store of observed delays, per route, stop and line.
+
+        Every departure is stored once (the last observation before it departed wins)
+        as a row of small integers in SQLite. Lines and stops are stored once in a
+        name table, local hour, weekday and day are precomputed, so aggregations
+        only group integers and read histograms instead of sorting raw delays.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            history = vvspy.history.DelayHistory("vvs_history.db")
+            history.record("home-work", vvspy.history.trip_observations(trips))
+            print(history.delay_percentiles("home-work", by="hour"))
+
+        Attributes
+        -----------
+
+        path :class:`str`
+            path of the SQLite database, created if missing.
+        timezone :class:`datetime.tzinfo`
+            timezone hours, weekdays and days are counted in.
+            default ``Europe/Berlin``
+    """
+
+    def __init__(self, db_path: str, tz: tzinfo = None):
+        self.path = db_path
+        self.timezone = tz or ZoneInfo("Europe/Berlin")
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._names: Dict[str, int] = {}
+        with self._lock, self._db:
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS names (idx INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+                CREATE TABLE IF NOT EXISTS observations (
+                    route INTEGER NOT NULL,
+                    stop INTEGER NOT NULL,
+                    line INTEGER NOT NULL,
+                    planned INTEGER NOT NULL,
+                    day INTEGER NOT NULL,
+                    hour INTEGER NOT NULL,
+                    weekday INTEGER NOT NULL,
+                    delay INTEGER NOT NULL,
+                    cancelled INTEGER NOT NULL,
+                    PRIMARY KEY (route, stop, line, planned)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS observations_day ON observations (day);
+                """
+            )
+            self._db.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),)
+            )
+            for idx, name in self._db.execute("SELECT idx, name FROM names"):
+                self._names[name] = idx
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _name(self, name: str) -> int:
+        idx = self._names.get(name)
+        if idx is None:
+            self._db.execute("INSERT OR IGNORE INTO names (name) VALUES (?)", (name,))
+            idx = self._db.execute("SELECT idx FROM names WHERE name = ?", (name,)).fetchone()[0]
+            self._names[name] = idx
+        return idx
+
+    def record(self, route: str, observations: Iterable[Observation]) -> int:
+        r"""
+
+        Store observations of a route, replacing earlier observations of the same departure.
+
+        Returns: number of observations written.
+
+        Parameters
+        ----------
+            route :class:`str`
+                name the observations are grouped by, e.g. ``"5006115-5006465"``.
+            observations List[Tuple[:class:`str`, :class:`str`, :class:`datetime.datetime`, :class:`int`, :class:`bool`]]
+                ``(stop id, line, planned departure in naive UTC, delay, cancelled)``,
+                see :func:`trip_observations` and :func:`departure_observations`.
+        """
+        rows = []
+        with self._lock, self._db:
+            route_idx = self._name(route)
+            for stop, line, planned, delay, cancelled in observations:
+                local = planned.replace(tzinfo=timezone.utc).astimezone(self.timezone)
+                rows.append(
+                    (
+                        route_idx,
+                        self._name(str(stop)),
+                        self._name(str(line)),
+                        int((planned - _EPOCH).total_seconds() // 60),
+                        local.toordinal(),
+                        local.hour,
+                        local.weekday(),
+                        int(delay or 0),
+                        int(bool(cancelled)),
+                    )
+                )
+            self._db.executemany(
+                """
+                INSERT INTO observations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (route, stop, line, planned)
+                DO UPDATE SET delay = excluded.delay, cancelled = excluded.cancelled
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def prune(self, keep_days: int) -> int:
+        r"""Delete the observations of days older than ``keep_days``, returns the number deleted."""
+        oldest = (datetime.now(self.timezone) - timedelta(days=keep_days)).toordinal()
+        with self._lock, self._db:
+            return self._db.execute("DELETE FROM observations WHERE day < ?", (oldest,)).rowcount
+
+    def _index_names(self) -> Dict[int, str]:
+        return {idx: name for name, idx in self._names.items()}
+
+    def histogram(
+        self, route: Optional[str] = None, days: Optional[int] = None
+    ) -> List[Tuple[str, str, int, int, int, int]]:
+        r"""
+
+        Delays of departures that were not cancelled, counted per stop, line, hour, weekday and delay.
+
+        Returns: List of ``(stop id, line, hour, weekday, delay, count)``.
+
+        """
+        where, params = ["cancelled = 0"], []
+        with self._lock:
+            if route is not None:
+                if route not in self._names:
+                    return []
+                where.append("route = ?")
+                params.append(self._names[route])
+            if days is not None:
+                where.append("day >= ?")
+                params.append((datetime.now(self.timezone) - timedelta(days=days)).toordinal())
+            rows = self._db.execute(
+                "SELECT stop, line, hour, weekday, delay, COUNT(*) FROM observations "
+                f"WHERE {' AND '.join(where)} GROUP BY 1, 2, 3, 4, 5",
+                params,
+            ).fetchall()
+        names = self._index_names()
+        return [(names[stop], names[line], hour, weekday, delay, count) for stop, line, hour, weekday, delay, count in rows]
+
+    def delay_percentiles(
+        self,
+        route: Optional[str] = None,
+        by: str = "hour",
+        line: Optional[str] = None,
+        stop: Optional[str] = None,
+        days: Optional[int] = None,
+        percentiles: Sequence[float] = (0.5, 0.9, 0.99),
+    ) -> Dict[object, dict]:
+        r"""
+
+        Delay statistics grouped by hour, weekday, line, stop or day.
+
+        Returns: ``{group: {"count", "cancelled", "mean", "p50", "p90", ...}}``.
+        Groups are the local hour (0-23), weekday (0 is Monday), line, stop id
+        or :class:`datetime.date`. Cancelled departures count only as cancelled.
+
+        Parameters
+        ----------
+            route Optional[:class:`str`]
+                only observations of this route.
+            by :class:`str`
+                ``"hour"``, ``"weekday"``, ``"line"``, ``"stop"`` or ``"day"``.
+                default ``"hour"``
+            line Optional[:class:`str`]
+                only departures of this line.
+            stop Optional[:class:`str`]
+                only departures at this stop.
+            days Optional[:class:`int`]
+                only the last ``days`` days.
+            percentiles List[:class:`float`]
+                default ``(0.5, 0.9, 0.99)``
+        """
+        if by not in GROUPS:
+            raise ValueError(f"Cannot group delays by {by!r}, use one of {', '.join(GROUPS)}")
+
+        where, params = ["1"], []
+        with self._lock:
+            for column, name in (("route", route), ("line", line), ("stop", stop)):
+                if name is not None:
+                    if name not in self._names:
+                        return {}
+                    where.append(f"{column} = ?")
+                    params.append(self._names[name])
+            if days is not None:
+                where.append("day >= ?")
+                params.append((datetime.now(self.timezone) - timedelta(days=days)).toordinal())
+
+            rows = self._db.execute(
+                f"SELECT {GROUPS[by]}, cancelled, delay, COUNT(*) FROM observations "
+                f"WHERE {' AND '.join(where)} GROUP BY 1, 2, 3 ORDER BY 1, 2, 3",
+                params,
+            ).fetchall()
+
+        names = self._index_names()
+        histograms: Dict[object, List[Tuple[int, int]]] = {}
+        cancelled: Dict[object, int] = {}
+        for group, is_cancelled, delay, count in rows:
+            if by in ("line", "stop"):
+                group = names.get(group, group)
+            elif by == "day":
+                group = datetime.fromordinal(group).date()
+            histograms.setdefault(group, [])
+            if is_cancelled:
+                cancelled[group] = cancelled.get(group, 0) + count
+            else:
+                histograms[group].append((delay, count))
+
+        result = {}
+        for group, histogram in histograms.items():
+            count = sum(n for _, n in histogram)
+            stats = {"count": count, "cancelled": cancelled.get(group, 0), "mean": None}
+            for fraction in percentiles:
+                stats[f"p{round(fraction * 100):g}"] = None
+            if count:
+                stats["mean"] = round(sum(delay * n for delay, n in histogram) / count, 2)
+                for fraction in percentiles:
+                    stats[f"p{round(fraction * 100):g}"] = _percentile(histogram, count, fraction)
+            result[group] = stats
+        return result
+
+
+class DelayPredictor:
+    r"""
+
+        Expected delays of departures without realtime data, learned from a :class:`DelayHistory`.
+
+        The expected delay is the median delay observed for the same stop, line,
+        hour and weekday. Keys with fewer than ``min_samples`` observations back off
+        to (stop, line, hour), (line, hour) and finally (line).
+        The confidence is the share of observations within ``tolerance`` minutes of
+        the expected delay, scaled down for keys with few observations.
+
+        Training reads one histogram query, predictions are dict lookups,
+        so predicting a whole response costs microseconds.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            predictor = vvspy.history.DelayPredictor.train(history, "home-work", days=60)
+            for trip, prediction in zip(trips, predictor.predict_trips(trips)):
+                if prediction:
+                    print(f"{trip} expected {prediction[0]} min late ({prediction[1]:.0%})")
+
+        Attributes
+        -----------
+
+        timezone :class:`datetime.tzinfo`
+            timezone hours and weekdays are counted in.
+        samples :class:`int`
+            number of observations the predictor was trained on.
+    """
+
+    LEVELS = (
+        ("stop", "line", "hour", "weekday"),
+        ("stop", "line", "hour"),
+        ("line", "hour"),
+        ("line",),
+    )
+
+    def __init__(self, tz: tzinfo = None, min_samples: int = 10, tolerance: int = 2):
+        self.timezone = tz or ZoneInfo("Europe/Berlin")
+        self.min_samples = min_samples
+        self.tolerance = tolerance
+        self.samples = 0
+        self._expected: Dict[tuple, Tuple[int, float]] = {}
+
+    @classmethod
+    def train(
+        cls,
+        history: DelayHistory,
+        route: Optional[str] = None,
+        days: Optional[int] = 60,
+        min_samples: int = 10,
+        tolerance: int = 2,
+    ) -> "DelayPredictor":
+        r"""Learn expected delays from the last ``days`` days of ``route`` (all routes if not set)."""
+        predictor = cls(history.timezone, min_samples, tolerance)
+        predictor.fit(history.histogram(route, days))
+        return predictor
+
+    def fit(self, rows: Iterable[Tuple[str, str, int, int, int, int]]) -> None:
+        r"""Learn from ``(stop id, line, hour, weekday, delay, count)`` rows, see :meth:`DelayHistory.histogram`."""
+        histograms: Dict[tuple, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.samples = 0
+        for stop, line, hour, weekday, delay, count in rows:
+            values = {"stop": stop, "line": line, "hour": hour, "weekday": weekday}
+            self.samples += count
+            for level, fields in enumerate(self.LEVELS):
+                histograms[(level, *(values[field] for field in fields))][delay] += count
+
+        self._expected = {}
+        for key, counts in histograms.items():
+            total = sum(counts.values())
+            if total < self.min_samples:
+                continue
+            histogram = sorted(counts.items())
+            expected = _percentile(histogram, total, 0.5)
+            within = sum(n for delay, n in histogram if abs(delay - expected) <= self.tolerance)
+            confidence = within / (total + self.min_samples)
+            self._expected[key] = (expected, round(confidence, 2))
+
+    def predict(self, keys: Iterable[Tuple[str, str, datetime]]) -> List[Optional[Tuple[int, float]]]:
+        r"""
+
+        Expected delays of departures.
+
+        Returns: ``(expected delay in minutes, confidence 0-1)`` per key, ``None`` if unknown.
+
+        Parameters
+        ----------
+            keys List[Tuple[:class:`str`, :class:`str`, :class:`datetime.datetime`]]
+                ``(stop id, line, planned departure in naive UTC)``.
+        """
+        predictions = []
+        for stop, line, planned in keys:
+            local = planned.replace(tzinfo=timezone.utc).astimezone(self.timezone)
+            values = {"stop": stop, "line": line, "hour": local.hour, "weekday": local.weekday()}
+            prediction = None
+            for level, fields in enumerate(self.LEVELS):
+                prediction = self._expected.get((level, *(values[field] for field in fields)))
+                if prediction is not None:
+                    break
+            predictions.append(prediction)
+        return predictions
+
+    def predict_trips(self, trips: Iterable[Trip]) -> List[Optional[Tuple[int, float]]]:
+        r"""Expected departure delays of the first public transport leg of each trip."""
+        keys, positions = [], []
+        trips = list(trips or [])
+        for position, trip in enumerate(trips):
+            connection = next((leg for leg in trip.connections if leg.transportation.number), None)
+            if connection is not None:
+                keys.append((leg_stop(connection), connection.transportation.number, connection.origin.departure_time_planned))
+                positions.append(position)
+        predictions: List[Optional[Tuple[int, float]]] = [None] * len(trips)
+        for position, prediction in zip(positions, self.predict(keys)):
+            predictions[position] = prediction
+        return predictions
@@ -0,0 +1,227 @@
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+import logging as __logging
+import threading
+import time
+
+import requests
+
+__logger = __logging.getLogger("vvspy")
+
+_listeners: List[Callable[["RequestEvent"], None]] = []
+_local = threading.local()
+
+
+class RequestEvent:
+    r"""
+
+        Timing and size of one vvspy API call, passed to every listener.
+
+        Attributes
+        -----------
+
+        endpoint :class:`str`
+            ``"trip"``, ``"departures"`` or ``"arrivals"``.
+        url Optional[:class:`str`]
+            Requested URL including the query string.
+        status_code Optional[:class:`int`]
+            HTTP status code of the response.
+        dns_time Optional[:class:`float`]
+            seconds spent resolving the host. ``None``, requests does not expose it.
+        connect_time Optional[:class:`float`]
+            seconds spent connecting. ``None``, requests does not expose it.
+        ttfb Optional[:class:`float`]
+            seconds from sending the request until the response headers were parsed.
+        download_time Optional[:class:`float`]
+            seconds spent reading the response body.
+        request_time Optional[:class:`float`]
+            seconds spent in the HTTP request overall (``ttfb`` + ``download_time``).
+        parse_time Optional[:class:`float`]
+            seconds spent decoding the JSON and building the model objects.
+        total_time :class:`float`
+            seconds the whole call took.
+        response_bytes Optional[:class:`int`]
+            size of the (decompressed) response body.
+        items Optional[:class:`int`]
+            number of trips/departures/arrivals decoded.
+        legs Optional[:class:`int`]
+            number of connections decoded (trip requests only).
+        cache_hit :class:`bool`
+            whether the result was served from a cache instead of the API.
+        retries :class:`int`
+            number of retries urllib3 needed for the request.
+        error Optional[:class:`Exception`]
+            exception the call raised, if any.
+    """
+
+    def __init__(self, endpoint: str, **kwargs):
+        self.endpoint = endpoint
+        self.url = kwargs.get("url")
+        self.status_code = kwargs.get("status_code")
+        self.dns_time = kwargs.get("dns_time")
+        self.connect_time = kwargs.get("connect_time")
+        self.ttfb = kwargs.get("ttfb")
+        self.download_time = kwargs.get("download_time")
+        self.request_time = kwargs.get("request_time")
+        self.parse_time = kwargs.get("parse_time")
+        self.total_time = kwargs.get("total_time", 0.0)
+        self.response_bytes = kwargs.get("response_bytes")
+        self.items = kwargs.get("items")
+        self.legs = kwargs.get("legs")
+        self.cache_hit = kwargs.get("cache_hit", False)
+        self.retries = kwargs.get("retries", 0)
+        self.error = kwargs.get("error")
+
+    def get(
+        self, url: str, session: Optional[requests.Session], request_params: dict, params: dict
+    ) -> requests.Response:
+        r"""Send the GET request and record its timing and size."""
+        start = time.perf_counter()
+        if session:
+            r = session.get(url, **{**request_params, **{"params": params}})
+        else:
+            r = requests.get(url, **{**request_params, **{"params": params}})
+        self.request_time = time.perf_counter() - start
+
+        self.url = r.url
+        self.status_code = r.status_code
+        self.ttfb = r.elapsed.total_seconds()
+        self.download_time = max(0.0, self.request_time - self.ttfb)
+        self.response_bytes = len(r.content)
+        retries = getattr(r.raw, "retries", None)
+        self.retries = len(retries.history) if retries is not None else 0
+        return r
+
+    @contextmanager
+    def parsing(self):
+        r"""Record the time spent in the wrapped block as parse time."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.parse_time = time.perf_counter() - start
+
+    def as_dict(self) -> dict:
+        return {
+            key: (repr(value) if key == "error" and value is not None else value)
+            for key, value in vars(self).items()
+        }
+
+    def __str__(self):
+        return (
+            f"[{self.endpoint}] {self.status_code} in {self.total_time * 1000:.1f}ms "
+            f"({self.response_bytes} bytes, {self.items} items)"
+        )
+
+
+def add_listener(callback: Callable[[RequestEvent], None]) -> Callable[[], None]:
+    r"""
+
+    Register a callback receiving a :class:`RequestEvent` after every API call.
+    Callbacks run in the calling thread and must be fast and thread-safe.
+
+    Returns: a function removing the callback again.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        remove = vvspy.instrumentation.add_listener(lambda event: metrics.observe(event.total_time))
+
+    """
+    _listeners.append(callback)
+    return lambda: remove_listener(callback)
+
+
+def remove_listener(callback: Callable[[RequestEvent], None]) -> None:
+    try:
+        _listeners.remove(callback)
+    except ValueError:
+        pass
+
+
+def _remove(stack: List[List[RequestEvent]], events: List[RequestEvent]) -> None:
+    r"""Remove ``events`` itself from ``stack``, other captures may hold equal (e.g. empty) lists."""
+    for i in range(len(stack) - 1, -1, -1):
+        if stack[i] is events:
+            del stack[i]
+            return
+
+
+@contextmanager
+def capture():
+    r"""
+
+    Collect the events of all API calls made by this thread inside the block.
+
+    .. code-block:: python
+
+        with vvspy.instrumentation.capture() as events:
+            vvspy.get_trips("5006115", "5006465")
+        print(events[0].total_time)
+
+    """
+    events: List[RequestEvent] = []
+    stack = getattr(_local, "captures", None)
+    if stack is None:
+        stack = _local.captures = []
+    stack.append(events)
+    try:
+        yield events
+    finally:
+        _remove(stack, events)
+
+
+def captures() -> List[List[RequestEvent]]:
+    r"""The event lists of the captures active in this thread, see :func:`forward`."""
+    return list(getattr(_local, "captures", None) or [])
+
+
+@contextmanager
+def forward(event_lists: List[List[RequestEvent]]):
+    r"""
+
+    Collect the events of this thread into captures of another thread,
+    e.g. in the worker threads of :func:`vvspy.get_trips_many`.
+
+    .. code-block:: python
+
+        active = vvspy.instrumentation.captures()
+        executor.submit(lambda: ...)  # worker: with vvspy.instrumentation.forward(active): ...
+
+    """
+    stack = getattr(_local, "captures", None)
+    if stack is None:
+        stack = _local.captures = []
+    stack.extend(event_lists)
+    try:
+        yield
+    finally:
+        for events in event_lists:
+            _remove(stack, events)
+
+
+def emit(event: RequestEvent) -> None:
+    r"""Pass an event to all listeners, e.g. to report cache hits from outside vvspy."""
+    for events in getattr(_local, "captures", None) or []:
+        events.append(event)
+    for callback in list(_listeners):
+        try:
+            callback(event)
+        except Exception as e:  # a broken listener must not break requests
+            __logger.error(f"Error in instrumentation listener {callback}: {e}")
+
+
+@contextmanager
+def record(endpoint: str):
+    r"""Create a :class:`RequestEvent` for the wrapped API call and emit it when done."""
+    event = RequestEvent(endpoint)
+    start = time.perf_counter()
+    try:
+        yield event
+    except Exception as e:
+        event.error = e
+        raise
+    finally:
+        event.total_time = time.perf_counter() - start
+        emit(event)
@@ -0,0 +1,313 @@
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+import logging as __logging
+import threading
+
+_logger = __logging.getLogger("vvspy")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _as_list(value) -> list:
+    if not value:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+class Message:
+    r"""
+
+        A disruption or info message, decoded once however many legs and departures carry it.
+
+        Attributes
+        -----------
+
+        id :class:`str`
+            message id.
+        version Optional[:class:`int`]
+            newer versions replace older ones.
+        priority Optional[:class:`str`]
+            e.g. ``"normal"`` or ``"high"``.
+        title Optional[:class:`str`]
+            short text, e.g. ``"Bauarbeiten"``.
+        content Optional[:class:`str`]
+            full text.
+        valid_from Optional[:class:`datetime.datetime`]
+            naive UTC time the message is valid from.
+        valid_to Optional[:class:`datetime.datetime`]
+            naive UTC time the message is valid until.
+        lines Set[:class:`str`]
+            line numbers the message was seen for.
+        stops Set[:class:`str`]
+            stop ids the message was seen for.
+        seen Optional[:class:`datetime.datetime`]
+            naive UTC time the message was last part of a response.
+    """
+
+    def __init__(self, message_id: str, **kwargs):
+        self.id = message_id
+        self.version = kwargs.get("version")
+        self.priority = kwargs.get("priority")
+        self.title = kwargs.get("title")
+        self.content = kwargs.get("content")
+        self.valid_from: Optional[datetime] = kwargs.get("valid_from")
+        self.valid_to: Optional[datetime] = kwargs.get("valid_to")
+        self.lines = set()
+        self.stops = set()
+        self.seen: Optional[datetime] = None
+
+    def active(self, now: datetime) -> bool:
+        r"""Whether the message is valid at ``now`` (naive UTC)."""
+        return (self.valid_from is None or self.valid_from <= now) and (
+            self.valid_to is None or now <= self.valid_to
+        )
+
+    def as_dict(self) -> dict:
+        r"""The message as a plain dict, validity times UTC-aware."""
+        return {
+            "id": self.id,
+            "priority": self.priority,
+            "title": self.title,
+            "content": self.content,
+            "valid_from": self.valid_from and self.valid_from.replace(tzinfo=timezone.utc),
+            "valid_to": self.valid_to and self.valid_to.replace(tzinfo=timezone.utc),
+            "lines": sorted(self.lines),
+            "stops": sorted(self.stops),
+        }
+
+    def __str__(self):
+        return f"[{self.priority}] {self.title or self.content}"
+
+
+class MessageStore:
+    r"""
+
+        Disruption and info messages of trips, departures and arrivals, deduplicated by id.
+
+        The same message is attached to every leg and every departure it concerns,
+        in every response. The store decodes each message (id and version) once and
+        only records the lines and stops it was seen for afterwards. Messages no
+        response carried for ``max_unseen`` are dropped by :meth:`prune`, as are
+        expired ones. All methods are thread-safe.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            store = vvspy.messages.MessageStore()
+            store.add_trips(vvspy.get_trips("5006115", "5006465"))
+            store.add_departures(vvspy.get_departures("5006115"))
+            for message in store.messages(lines={"S1"}):
+                print(message)
+
+        Attributes
+        -----------
+
+        timezone :class:`datetime.tzinfo`
+            timezone of the validity times of the departure board messages.
+            default ``Europe/Berlin``
+        max_unseen :class:`datetime.timedelta`
+            messages withdrawn (or without end of validity) are dropped after this long.
+            default 30 minutes
+    """
+
+    def __init__(self, tz: tzinfo = None, max_unseen: timedelta = timedelta(minutes=30)):
+        self.timezone = tz or ZoneInfo("Europe/Berlin")
+        self.max_unseen = max_unseen
+        self._messages: Dict[str, Message] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._messages)
+
+    def _time(self, value: Optional[str]) -> Optional[datetime]:
+        r"""Naive UTC time of a trip (ISO, UTC) or departure board (local) timestamp."""
+        if not value:
+            return None
+        try:
+            if value.endswith("Z"):
+                return datetime.strptime(value[:-1], "%Y-%m-%dT%H:%M:%S")
+            local = datetime.fromisoformat(value).replace(tzinfo=self.timezone)
+        except ValueError:
+            _logger.debug(f"Unknown message time {value}")
+            return None
+        return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+    @staticmethod
+    def _identify_trip_info(info: dict) -> Tuple[Optional[str], Optional[int]]:
+        r"""Id and version of a message of a trip leg (rapidJSON)."""
+        return info.get("id"), info.get("version")
+
+    def _decode_trip_info(self, info: dict) -> dict:
+        r"""Fields of a message of a trip leg."""
+        validity = _as_list((info.get("timestamps") or {}).get("validity"))
+        return {
+            "priority": info.get("priority"),
+            "title": info.get("urlText") or info.get("subtitle"),
+            "content": info.get("content"),
+            "valid_from": self._time(validity[0].get("from")) if validity else None,
+            "valid_to": self._time(validity[-1].get("to")) if validity else None,
+        }
+
+    @staticmethod
+    def _identify_board_info(info: dict) -> Tuple[Optional[str], Optional[int]]:
+        r"""Id and version of a message of a departure board entry (``lineInfo``/``stopInfo``)."""
+        params = {param.get("name"): param.get("value") for param in _as_list(info.get("paramList"))}
+        version = params.get("infoVersion")
+        return (
+            params.get("infoID") or info.get("infoLinkURL"),
+            int(version) if version and str(version).isdigit() else None,
+        )
+
+    def _decode_board_info(self, info: dict) -> dict:
+        r"""Fields of a message of a departure board entry."""
+        params = {param.get("name"): param.get("value") for param in _as_list(info.get("paramList"))}
+        text = info.get("infoText") or {}
+        return {
+            "priority": params.get("priority") or info.get("infoPriority"),
+            "title": info.get("infoLinkText") or text.get("subject") or text.get("subtitle"),
+            "content": text.get("content") or text.get("wmlText"),
+            "valid_from": self._time(params.get("ValidFrom")),
+            "valid_to": self._time(params.get("ValidTo")),
+        }
+
+    def _add(
+        self,
+        identify,
+        decode,
+        info: dict,
+        now: datetime,
+        line: Optional[str] = None,
+        stop: Optional[str] = None,
+    ) -> bool:
+        r"""Record a message, decoding it only if its id and version are new."""
+        message_id, version = identify(info)
+        if not message_id:
+            return False
+        message = self._messages.get(message_id)
+        decoded = False
+        if message is None or (version or 0) > (message.version or 0):
+            previous = message
+            message = Message(message_id, version=version, **decode(info))
+            if previous is not None:
+                message.lines, message.stops = previous.lines, previous.stops
+            self._messages[message_id] = message
+            decoded = True
+        message.seen = now
+        if line:
+            message.lines.add(line)
+        if stop:
+            message.stops.add(stop)
+        return decoded
+
+    def add_trips(self, trips: Iterable) -> int:
+        r"""
+
+        Record the messages of the legs of trips.
+
+        Returns: number of messages decoded (new or newer versions).
+
+        """
+        added = 0
+        now = _utcnow()
+        with self._lock:
+            for trip in trips or []:
+                for leg in trip.connections:
+                    for info in _as_list(leg.infos):
+                        added += self._add(
+                            self._identify_trip_info,
+                            self._decode_trip_info,
+                            info,
+                            now,
+                            line=leg.transportation.number,
+                        )
+        return added
+
+    def add_departures(self, departures: Iterable, stop: Optional[str] = None) -> int:
+        r"""
+
+        Record the line and stop messages of departures or arrivals.
+
+        Parameters
+        ----------
+            departures Iterable[:class:`Departure`]
+                departures or arrivals of one board.
+            stop Optional[:class:`str`]
+                station id the board was requested for (e.g. ``"de:08111:6115"``),
+                the stop messages are recorded under. Boards only carry the numeric
+                EFA stop id (e.g. ``"5006115"``) trips don't use.
+                default ``stop_id`` of each departure
+
+        Returns: number of messages decoded (new or newer versions).
+
+        """
+        added = 0
+        now = _utcnow()
+        with self._lock:
+            for departure in departures or []:
+                for infos, line, entry_stop in (
+                    (departure.line_infos, departure.serving_line.number, None),
+                    (departure.stop_infos, None, stop or departure.stop_id),
+                ):
+                    if isinstance(infos, dict):
+                        infos = infos.get("lineInfo") or infos.get("stopInfo") or infos
+                    for info in _as_list(infos):
+                        added += self._add(
+                            self._identify_board_info,
+                            self._decode_board_info,
+                            info,
+                            now,
+                            line=line,
+                            stop=entry_stop,
+                        )
+        return added
+
+    def messages(
+        self,
+        lines: Iterable[str] = None,
+        stops: Iterable[str] = None,
+        now: datetime = None,
+    ) -> List[Message]:
+        r"""
+
+        The messages valid at ``now`` concerning any of ``lines`` or ``stops``
+        (all valid messages if neither is given), highest priority first.
+
+        Parameters
+        ----------
+            lines Optional[Iterable[:class:`str`]]
+                line numbers.
+            stops Optional[Iterable[:class:`str`]]
+                stop ids.
+            now Optional[:class:`datetime.datetime`]
+                naive UTC time.
+                default ``now``
+        """
+        now = now or _utcnow()
+        lines = set(lines or ())
+        stops = set(stops or ())
+        with self._lock:
+            found = [
+                message for message in self._messages.values()
+                if message.active(now)
+                and (not (lines or stops) or message.lines & lines or message.stops & stops)
+            ]
+        return sorted(found, key=lambda message: (message.priority != "high", message.id))
+
+    def prune(self, now: datetime = None) -> int:
+        r"""Drop expired messages and those not seen for ``max_unseen``, returns how many."""
+        now = now or _utcnow()
+        unseen = now - self.max_unseen
+        with self._lock:
+            expired = [
+                message_id for message_id, message in self._messages.items()
+                if (message.valid_to is not None and message.valid_to < now)
+                or (message.seen is not None and message.seen < unseen)
+            ]
+            for message_id in expired:
+                del self._messages[message_id]
+        return len(expired)
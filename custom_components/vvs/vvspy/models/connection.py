@@ -20,6 +20,10 @@ class Connection:
             seconds this connection takes
         is_realtime_controlled :class:`bool`
             whether or not this connection has realtime tracking
+        realtime_status List[:class:`str`]
+            realtime flags of this connection (e.g. ``MONITORED``, ``TRIP_CANCELLED``)
+        cancelled :class:`bool`
+            whether this connection is cancelled
         origin :class:`Origin`
             Origin, where this connection starts
         destination :class:`Destination`
@@ -45,6 +49,8 @@ class Connection:
     def __init__(self, **kwargs):
         self.duration = kwargs.get("duration")
         self.is_realtime_controlled = kwargs.get("isRealtimeControlled", False)
+        self.realtime_status = kwargs.get("realtimeStatus", [])
+        self.cancelled = "TRIP_CANCELLED" in self.realtime_status
         self.origin = Origin(**kwargs.get("origin"))
         self.destination = Destination(**kwargs.get("destination"))
         self.transportation = Transportation(**kwargs.get("transportation"))
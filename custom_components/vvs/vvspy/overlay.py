@@ -0,0 +1,132 @@
+from copy import copy
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Dict, Iterable, List, Tuple
+from zoneinfo import ZoneInfo
+import logging as __logging
+
+from .models import Departure, Trip
+
+_logger = __logging.getLogger("vvspy")
+
+LegRef = Tuple[int, int]
+
+
+class RealtimeOverlay:
+    r"""
+
+        Planned trips kept for the day, updated with the realtime data of departure boards.
+
+        Planned times of a trip rarely change, only delays and cancellations do.
+        Instead of requesting the whole trips again, pass the (much smaller) departure
+        board of the stops the trips depart from to :meth:`apply`.
+        Legs are matched by line number and planned departure time. Only trips whose
+        realtime data changed are rebuilt, all other objects are shared with the
+        previous result and nothing is parsed again.
+
+        Boards carry no realtime data for the exit stop of a leg,
+        its delay is assumed to carry over to the arrival.
+        Legs no board entry was applied to keep the delays they were planned
+        with, but are no longer marked ``is_realtime_controlled``: their data
+        is as old as the plan.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            overlay = vvspy.RealtimeOverlay(vvspy.get_trips("5006115", "5006465", limit=10))
+            # every poll
+            trips = overlay.apply(vvspy.get_departures("5006115", limit=40))
+
+        Attributes
+        -----------
+
+        planned List[:class:`Trip`]
+            trips as passed in, with the realtime flag of their legs cleared.
+        trips List[:class:`Trip`]
+            trips with all realtime data applied so far.
+        timezone :class:`datetime.tzinfo`
+            timezone of the board times, trips use UTC.
+            default ``Europe/Berlin``
+    """
+
+    def __init__(self, trips: List[Trip], tz: tzinfo = None):
+        self.planned = [self._as_planned(trip) for trip in trips or []]
+        self.trips = list(self.planned)
+        self.timezone = tz or ZoneInfo("Europe/Berlin")
+
+        self._realtime: Dict[LegRef, Tuple[int, bool]] = {}
+        self._legs: Dict[Tuple[str, datetime], List[LegRef]] = {}
+        for i, trip in enumerate(self.planned):
+            for j, connection in enumerate(trip.connections):
+                number = connection.transportation.number
+                planned = connection.origin.departure_time_planned
+                if number and planned:
+                    key = (number, planned.replace(second=0, microsecond=0))
+                    self._legs.setdefault(key, []).append((i, j))
+
+    @staticmethod
+    def _as_planned(trip: Trip) -> Trip:
+        r"""Shallow copy of ``trip`` whose legs are not marked realtime controlled."""
+        if not any(connection.is_realtime_controlled for connection in trip.connections):
+            return trip
+        trip = copy(trip)
+        trip.connections = [copy(connection) for connection in trip.connections]
+        for connection in trip.connections:
+            connection.is_realtime_controlled = False
+        return trip
+
+    def _utc(self, local: datetime) -> datetime:
+        r"""Board times are naive local times, trip times naive UTC."""
+        return local.replace(tzinfo=self.timezone).astimezone(timezone.utc).replace(tzinfo=None)
+
+    def apply(self, entries: Iterable[Departure]) -> List[Trip]:
+        r"""
+
+        Apply the delays and cancellations of board entries to the trips departing with them.
+
+        Returns: List[:class:`vvspy.models.Trip`], see :attr:`trips`.
+
+        Parameters
+        ----------
+            entries List[:class:`vvspy.models.Departure`]
+                Departures of one or more stops, e.g. from :func:`vvspy.get_departures`.
+        """
+        changed = set()
+        for entry in entries or []:
+            if entry.datetime is None:
+                continue
+            key = (entry.serving_line.number, self._utc(entry.datetime))
+            for ref in self._legs.get(key, ()):
+                state = (entry.delay, entry.cancelled)
+                if self._realtime.get(ref) != state:
+                    self._realtime[ref] = state
+                    changed.add(ref[0])
+
+        for i in changed:
+            self.trips[i] = self._rebuild(i)
+        _logger.debug(f"Realtime overlay updated {len(changed)} of {len(self.trips)} trips")
+        return self.trips
+
+    def _rebuild(self, i: int) -> Trip:
+        r"""Shallow copy of planned trip ``i`` with the known realtime data of its legs."""
+        trip = copy(self.planned[i])
+        trip.connections = list(trip.connections)
+        for j, connection in enumerate(trip.connections):
+            state = self._realtime.get((i, j))
+            if state is None:
+                continue
+            delay, cancelled = state
+            shift = timedelta(minutes=delay)
+
+            connection = copy(connection)
+            connection.origin = copy(connection.origin)
+            connection.destination = copy(connection.destination)
+            connection.origin.departure_time_estimated = connection.origin.departure_time_planned + shift
+            connection.origin.delay = delay
+            connection.destination.arrival_time_estimated = connection.destination.arrival_time_planned + shift
+            connection.destination.delay = delay
+            connection.cancelled = cancelled
+            connection.is_realtime_controlled = True
+            trip.connections[j] = connection
+        return trip
@@ -0,0 +1,199 @@
+from datetime import datetime, timezone, tzinfo
+from typing import List, Optional, Union, TYPE_CHECKING
+from zoneinfo import ZoneInfo
+import logging as __logging
+import threading
+
+import requests
+
+if TYPE_CHECKING:
+    from .enums import Station
+from .diff import journey_key
+from .models import Trip
+from .trip import get_trips
+
+_logger = __logging.getLogger("vvspy")
+
+
+def _utc(when: Optional[datetime]) -> datetime:
+    r"""Naive UTC time like the trip models use, ``now`` if ``when`` is not set."""
+    if when is None:
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+    if when.tzinfo is not None:
+        return when.astimezone(timezone.utc).replace(tzinfo=None)
+    return when
+
+
+class TripBuffer:
+    r"""
+
+        Sorted buffer of the upcoming trips of one route, fetched ahead of time.
+
+        :meth:`fetch` requests the trips from now on and refreshes their realtime data.
+        :meth:`top_up` requests the trips following the last buffered one,
+        until ``size`` upcoming trips are buffered. Departed trips are dropped,
+        so :meth:`upcoming` keeps returning trips while the buffer is topped up
+        in the background. All methods are thread-safe.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            buffer = vvspy.TripBuffer("5006115", "5006465", size=6)
+            buffer.fetch(limit=3)
+            buffer.top_up()
+            print(buffer.upcoming()[:3])
+
+        Attributes
+        -----------
+
+        origin_station_id Union[:class:`str`, :class:`int`, :class:`vvspy.enums.Station`]
+            station id of the origin.
+        destination_station_id Union[:class:`str`, :class:`int`, :class:`vvspy.enums.Station`]
+            station id of the destination.
+        size :class:`int`
+            number of upcoming trips to keep.
+        timezone :class:`datetime.tzinfo`
+            timezone the API expects ``check_time`` in.
+            default ``Europe/Berlin``
+        kwargs :class:`dict`
+            passed to every :func:`vvspy.get_trips` call (e.g. ``routeType``).
+    """
+
+    def __init__(
+        self,
+        origin_station_id: Union[str, int, "Station"],
+        destination_station_id: Union[str, int, "Station"],
+        size: int = 6,
+        tz: tzinfo = None,
+        session: requests.Session = None,
+        **kwargs,
+    ):
+        self.origin_station_id = origin_station_id
+        self.destination_station_id = destination_station_id
+        self.size = size
+        self.timezone = tz or ZoneInfo("Europe/Berlin")
+        self.session = session
+        self.kwargs = kwargs
+        self._trips: List[Trip] = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._trips)
+
+    def _get_trips(self, check_time: datetime, limit: int) -> List[Trip]:
+        local = check_time.replace(tzinfo=timezone.utc).astimezone(self.timezone).replace(tzinfo=None)
+        return get_trips(
+            self.origin_station_id,
+            self.destination_station_id,
+            check_time=local,
+            limit=limit,
+            session=self.session,
+            **self.kwargs,
+        ) or []
+
+    def merge(self, trips: List[Trip], window_end: datetime = None) -> int:
+        r"""
+
+        Add trips to the buffer, replacing buffered trips with the same legs
+        (their realtime data is newer).
+
+        Returns: number of trips that were not buffered before.
+
+        Parameters
+        ----------
+            trips List[:class:`vvspy.models.Trip`]
+                trips to add.
+            window_end Optional[:class:`datetime.datetime`]
+                naive UTC time. Buffered trips departing until then which are
+                missing in ``trips`` are dropped, the API no longer suggests them.
+        """
+        with self._lock:
+            buffered = {
+                journey_key(trip): trip for trip in self._trips
+                if window_end is None or trip.connections[0].origin.departure_time_planned > window_end
+            }
+            added = 0
+            for trip in trips or []:
+                if not trip.connections:
+                    continue
+                key = journey_key(trip)
+                added += key not in buffered
+                buffered[key] = trip
+            self._trips = sorted(
+                buffered.values(), key=lambda trip: trip.connections[0].origin.departure_time_planned
+            )
+        return added
+
+    def upcoming(self, now: datetime = None, after: datetime = None) -> List[Trip]:
+        r"""
+
+        Drop departed trips and return the buffered ones, sorted by departure.
+
+        Parameters
+        ----------
+            now Optional[:class:`datetime.datetime`]
+                aware or naive UTC time.
+                default ``now``
+            after Optional[:class:`datetime.datetime`]
+                aware or naive UTC time, only return the trips departing from then on
+                (e.g. for an offset) without dropping the trips before.
+                default ``now``
+        """
+        now = _utc(now)
+        after = _utc(after) if after is not None else now
+        with self._lock:
+            self._trips = [
+                trip for trip in self._trips
+                if trip.connections[0].origin.departure_time_estimated >= now
+            ]
+            return [
+                trip for trip in self._trips
+                if trip.connections[0].origin.departure_time_estimated >= after
+            ]
+
+    def missing(self, now: datetime = None) -> int:
+        r"""Number of trips needed to fill the buffer again."""
+        return max(0, self.size - len(self.upcoming(now)))
+
+    def fetch(self, check_time: datetime = None, limit: int = None) -> List[Trip]:
+        r"""
+
+        Request the trips from ``check_time`` on and merge them into the buffer.
+
+        Returns: List[:class:`vvspy.models.Trip`] as returned by the API.
+
+        Parameters
+        ----------
+            check_time Optional[:class:`datetime.datetime`]
+                aware or naive UTC time.
+                default ``now``
+            limit Optional[:class:`int`]
+                default ``size``
+        """
+        trips = self._get_trips(_utc(check_time), limit or self.size)
+        departures = [trip.connections[0].origin.departure_time_planned for trip in trips if trip.connections]
+        self.merge(trips, window_end=max(departures) if departures else None)
+        return trips
+
+    def top_up(self, now: datetime = None) -> int:
+        r"""
+
+        Request the trips following the last buffered one until ``size`` trips are buffered.
+
+        Returns: number of trips added, ``0`` if the buffer was full or the API had no later trips.
+
+        """
+        upcoming = self.upcoming(now)
+        missing = self.size - len(upcoming)
+        if missing <= 0:
+            return 0
+        if not upcoming:
+            return self.merge(self._get_trips(_utc(now), self.size))
+
+        # The API returns trips departing at check_time as well, ask for one more
+        last_departure = upcoming[-1].connections[0].origin.departure_time_planned
+        added = self.merge(self._get_trips(last_departure, missing + 1))
+        _logger.debug(f"Topped up {added} of {missing} missing trips after {last_departure}")
+        return added
@@ -0,0 +1,508 @@
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta, timezone
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+from zoneinfo import ZoneInfo
+import csv
+import io
+import logging as __logging
+import os
+import sqlite3
+import threading
+import zipfile
+
+if TYPE_CHECKING:
+    from .enums import Station
+from .models import Trip
+
+_logger = __logging.getLogger("vvspy")
+
+SCHEMA_VERSION = 1
+MIN_TRANSFER_SECONDS = 120  # changing platforms within one station
+SEARCH_HORIZON_SECONDS = 6 * 3600  # same as the searchLimitMinutes of get_trips
+_DAY = 86400
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+CREATE TABLE stops (
+    idx INTEGER PRIMARY KEY, stop_id TEXT UNIQUE, name TEXT, parent_id TEXT, lat REAL, lon REAL
+);
+CREATE TABLE routes (
+    idx INTEGER PRIMARY KEY, route_id TEXT UNIQUE, short_name TEXT, long_name TEXT, type INTEGER
+);
+CREATE TABLE trips (
+    idx INTEGER PRIMARY KEY, trip_id TEXT UNIQUE, route_idx INTEGER, service_id TEXT, headsign TEXT
+);
+CREATE TABLE calendar (
+    service_id TEXT PRIMARY KEY, weekdays INTEGER, start_date INTEGER, end_date INTEGER
+) WITHOUT ROWID;
+CREATE TABLE calendar_dates (
+    service_id TEXT, date INTEGER, exception_type INTEGER, PRIMARY KEY (service_id, date)
+) WITHOUT ROWID;
+CREATE TABLE connections (
+    trip_idx INTEGER, seq INTEGER, dep_stop INTEGER, arr_stop INTEGER, dep_time INTEGER, arr_time INTEGER,
+    PRIMARY KEY (trip_idx, seq)
+) WITHOUT ROWID;
+"""
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+def _read_gtfs(gtfs_path: str, name: str) -> Iterator[dict]:
+    if os.path.isdir(gtfs_path):
+        path = os.path.join(gtfs_path, name)
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            yield from csv.DictReader(f)
+        return
+    with zipfile.ZipFile(gtfs_path) as archive:
+        if name not in archive.namelist():
+            return
+        with archive.open(name) as raw:
+            yield from csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""))
+
+
+def _seconds(value: str) -> Optional[int]:
+    if not value:
+        return None
+    hours, minutes, seconds = value.strip().split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def build_timetable(gtfs_path: str, db_path: str) -> None:
+    r"""
+
+    Ingest a GTFS feed into a compact, indexed timetable file for :class:`Timetable`.
+
+    Stops, routes and trips are stored once and referenced by integer index,
+    stop times are stored as connections (one row per ride between two consecutive stops).
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        vvspy.timetable.build_timetable("vvs_gtfs.zip", "vvs_timetable.db")
+
+    Parameters
+    ----------
+        gtfs_path :class:`str`
+            GTFS feed as zip file or extracted directory.
+        db_path :class:`str`
+            Timetable file to create. An existing file is replaced.
+    """
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    db = sqlite3.connect(tmp_path)
+    try:
+        db.executescript(_SCHEMA)
+
+        agency_tz = next(
+            (row.get("agency_timezone") for row in _read_gtfs(gtfs_path, "agency.txt")),
+            None,
+        )
+        db.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [("schema_version", str(SCHEMA_VERSION)), ("timezone", agency_tz or "Europe/Berlin")],
+        )
+
+        stop_idx: Dict[str, int] = {}
+        stops = []
+        for row in _read_gtfs(gtfs_path, "stops.txt"):
+            stop_idx[row["stop_id"]] = len(stops)
+            stops.append(
+                (
+                    len(stops),
+                    row["stop_id"],
+                    row.get("stop_name"),
+                    row.get("parent_station") or None,
+                    float(row["stop_lat"]) if row.get("stop_lat") else None,
+                    float(row["stop_lon"]) if row.get("stop_lon") else None,
+                )
+            )
+        db.executemany("INSERT INTO stops VALUES (?, ?, ?, ?, ?, ?)", stops)
+
+        route_idx: Dict[str, int] = {}
+        for row in _read_gtfs(gtfs_path, "routes.txt"):
+            route_idx[row["route_id"]] = len(route_idx)
+            db.execute(
+                "INSERT INTO routes VALUES (?, ?, ?, ?, ?)",
+                (
+                    route_idx[row["route_id"]],
+                    row["route_id"],
+                    row.get("route_short_name"),
+                    row.get("route_long_name"),
+                    int(row.get("route_type") or 3),
+                ),
+            )
+
+        trip_idx: Dict[str, int] = {}
+        for row in _read_gtfs(gtfs_path, "trips.txt"):
+            trip_idx[row["trip_id"]] = len(trip_idx)
+            db.execute(
+                "INSERT INTO trips VALUES (?, ?, ?, ?, ?)",
+                (
+                    trip_idx[row["trip_id"]],
+                    row["trip_id"],
+                    route_idx.get(row["route_id"]),
+                    row["service_id"],
+                    row.get("trip_headsign"),
+                ),
+            )
+
+        db.executemany(
+            "INSERT INTO calendar VALUES (?, ?, ?, ?)",
+            (
+                (
+                    row["service_id"],
+                    sum(1 << i for i, day in enumerate(_WEEKDAYS) if row.get(day) == "1"),
+                    int(row["start_date"]),
+                    int(row["end_date"]),
+                )
+                for row in _read_gtfs(gtfs_path, "calendar.txt")
+            ),
+        )
+        db.executemany(
+            "INSERT OR REPLACE INTO calendar_dates VALUES (?, ?, ?)",
+            (
+                (row["service_id"], int(row["date"]), int(row["exception_type"]))
+                for row in _read_gtfs(gtfs_path, "calendar_dates.txt")
+            ),
+        )
+
+        # stop_times.txt is not guaranteed to be ordered, let SQLite pair consecutive stops
+        db.execute(
+            "CREATE TEMP TABLE stop_times (trip_idx INTEGER, seq INTEGER, stop INTEGER, arr INTEGER, dep INTEGER)"
+        )
+        db.executemany(
+            "INSERT INTO stop_times VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    trip_idx[row["trip_id"]],
+                    int(row["stop_sequence"]),
+                    stop_idx[row["stop_id"]],
+                    _seconds(row.get("arrival_time")),
+                    _seconds(row.get("departure_time")),
+                )
+                for row in _read_gtfs(gtfs_path, "stop_times.txt")
+            ),
+        )
+        db.execute(
+            """
+            INSERT INTO connections
+            SELECT trip_idx, seq, stop, next_stop, dep, next_arr FROM (
+                SELECT trip_idx, seq, stop, COALESCE(dep, arr) AS dep,
+                       LEAD(stop) OVER w AS next_stop,
+                       LEAD(COALESCE(arr, dep)) OVER w AS next_arr
+                FROM stop_times
+                WINDOW w AS (PARTITION BY trip_idx ORDER BY seq)
+            )
+            WHERE next_stop IS NOT NULL AND dep IS NOT NULL AND next_arr IS NOT NULL
+            """
+        )
+        db.execute("DROP TABLE stop_times")
+        db.execute("CREATE INDEX stops_parent ON stops (parent_id)")
+        db.commit()
+    finally:
+        db.close()
+
+    os.replace(tmp_path, db_path)
+    _logger.debug(f"Built timetable {db_path} from {gtfs_path}")
+
+
+class _Day:
+    r"""Connections running on one date, sorted by departure time, as packed arrays."""
+
+    def __init__(self, rows: Iterable[Tuple[int, int, int, int, int]]):
+        self.dep_stop = array("i")
+        self.arr_stop = array("i")
+        self.dep_time = array("i")
+        self.arr_time = array("i")
+        self.trip = array("i")
+        for dep_stop, arr_stop, dep_time, arr_time, trip in sorted(rows, key=lambda row: row[2]):
+            self.dep_stop.append(dep_stop)
+            self.arr_stop.append(arr_stop)
+            self.dep_time.append(dep_time)
+            self.arr_time.append(arr_time)
+            self.trip.append(trip)
+
+
+class Timetable:
+    r"""
+
+        Planned timetable built with :func:`build_timetable`, answering journeys offline.
+
+        Journeys are found with a connection scan over the connections of the
+        requested day. Results are :class:`vvspy.models.Trip` objects just like
+        :func:`vvspy.get_trips` returns, without realtime data (estimated == planned).
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            timetable = vvspy.timetable.Timetable("vvs_timetable.db")
+            trips = timetable.get_trips("de:08111:6115", "de:08111:6465", limit=3)
+    """
+
+    def __init__(self, db_path: str):
+        self.path = db_path
+        self._db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        if int(meta.get("schema_version", 0)) != SCHEMA_VERSION:
+            raise ValueError(f"Timetable {db_path} has an unsupported schema, rebuild it")
+        self.timezone = ZoneInfo(meta["timezone"])
+
+        self.stop_ids: List[str] = []
+        self.stop_names: List[str] = []
+        self.stop_coords: List[Tuple[Optional[float], Optional[float]]] = []
+        self._stop_index: Dict[str, int] = {}
+        self._station_of: List[str] = []
+        self._stations: Dict[str, List[int]] = {}
+        for idx, stop_id, name, parent_id, lat, lon in self._db.execute(
+            "SELECT idx, stop_id, name, parent_id, lat, lon FROM stops ORDER BY idx"
+        ):
+            station = parent_id or stop_id
+            self.stop_ids.append(stop_id)
+            self.stop_names.append(name)
+            self.stop_coords.append((lat, lon))
+            self._stop_index[stop_id] = idx
+            self._station_of.append(station)
+            self._stations.setdefault(station, []).append(idx)
+
+        self._routes = {
+            idx: (short_name, long_name, route_type)
+            for idx, short_name, long_name, route_type in self._db.execute(
+                "SELECT idx, short_name, long_name, type FROM routes"
+            )
+        }
+        self._days: Dict[date, _Day] = {}
+
+    def close(self) -> None:
+        self._db.close()
+
+    def resolve_stops(self, station_id: Union[str, int, "Station"]) -> List[int]:
+        r"""Stop indices of a station id, a platform id or a parent station id."""
+        station_id = station_id.value if isinstance(station_id, Enum) else str(station_id)
+        if station_id in self._stations:
+            return list(self._stations[station_id])
+        if station_id in self._stop_index:
+            return [self._stop_index[station_id]]
+        # VVS platform ids extend the station id, e.g. de:08111:6:1:1 -> de:08111:6
+        prefix = station_id + ":"
+        return [idx for idx, stop_id in enumerate(self.stop_ids) if stop_id.startswith(prefix)]
+
+    def stations(self) -> List[Tuple[str, str, float, float]]:
+        r"""``(station id, name, lat, lon)`` of every station with coordinates."""
+        stations = []
+        for station, stops in self._stations.items():
+            own = self._stop_index.get(station)
+            for idx in ([own] if own is not None else []) + stops:
+                lat, lon = self.stop_coords[idx]
+                if lat is not None and lon is not None:
+                    stations.append((station, self.stop_names[idx], lat, lon))
+                    break
+        return stations
+
+    def _services(self, day: date) -> List[str]:
+        day_int = int(day.strftime("%Y%m%d"))
+        weekday_bit = 1 << day.weekday()
+        services = {
+            service_id
+            for service_id, weekdays in self._db.execute(
+                "SELECT service_id, weekdays FROM calendar WHERE start_date <= ? AND end_date >= ?",
+                (day_int, day_int),
+            )
+            if weekdays & weekday_bit
+        }
+        for service_id, exception_type in self._db.execute(
+            "SELECT service_id, exception_type FROM calendar_dates WHERE date = ?", (day_int,)
+        ):
+            if exception_type == 1:
+                services.add(service_id)
+            else:
+                services.discard(service_id)
+        return list(services)
+
+    def _connections(self, day: date, shift: int, min_time: int) -> List[tuple]:
+        services = self._services(day)
+        if not services:
+            return []
+        placeholders = ",".join("?" * len(services))
+        return [
+            (dep_stop, arr_stop, dep_time + shift, arr_time + shift, trip)
+            for dep_stop, arr_stop, dep_time, arr_time, trip in self._db.execute(
+                f"""
+                SELECT c.dep_stop, c.arr_stop, c.dep_time, c.arr_time, c.trip_idx
+                FROM connections c JOIN trips t ON t.idx = c.trip_idx
+                WHERE t.service_id IN ({placeholders}) AND c.dep_time >= ?
+                """,
+                (*services, min_time),
+            )
+        ]
+
+    def _day(self, day: date) -> _Day:
+        with self._lock:
+            if day not in self._days:
+                # trips of the previous service day running past midnight (times >= 24:00:00)
+                rows = self._connections(day, 0, 0) + self._connections(
+                    day - timedelta(days=1), -_DAY, _DAY
+                )
+                self._days = {day: _Day(rows)}  # keep only one day in memory
+                _logger.debug(f"Loaded {len(rows)} connections for {day}")
+            return self._days[day]
+
+    def _scan(self, day: _Day, origins: List[int], targets: set, start: int) -> Optional[List[tuple]]:
+        r"""Earliest arrival connection scan, returns the legs as (trip, first, last) connection indices."""
+        earliest: Dict[int, int] = {stop: start for stop in origins}
+        arrived_by: Dict[int, tuple] = {}  # stop -> (boarding connection, alighting connection)
+        boarded: Dict[int, int] = {}  # trip -> connection it was boarded at
+        best = None
+        best_time = start + SEARCH_HORIZON_SECONDS
+
+        dep_time, arr_time = day.dep_time, day.arr_time
+        dep_stop, arr_stop, trips = day.dep_stop, day.arr_stop, day.trip
+        for c in range(bisect_left(dep_time, start), len(dep_time)):
+            if dep_time[c] >= best_time:
+                break
+            trip = trips[c]
+            if trip not in boarded:
+                if earliest.get(dep_stop[c], best_time) > dep_time[c]:
+                    continue
+                boarded[trip] = c
+            stop = arr_stop[c]
+            if arr_time[c] < earliest.get(stop, best_time):
+                earliest[stop] = arr_time[c]
+                arrived_by[stop] = (boarded[trip], c)
+                if stop in targets:
+                    best, best_time = stop, arr_time[c]
+                    continue
+                # change to another platform of the same station
+                for sibling in self._stations[self._station_of[stop]]:
+                    transfer = arr_time[c] + MIN_TRANSFER_SECONDS
+                    if sibling != stop and transfer < earliest.get(sibling, best_time):
+                        earliest[sibling] = transfer
+                        arrived_by[sibling] = arrived_by[stop]
+
+        if best is None:
+            return None
+        legs = []
+        stop = best
+        while stop in arrived_by:  # origins are never in arrived_by
+            first, last = arrived_by[stop]
+            legs.append((trips[first], first, last))
+            stop = dep_stop[first]
+        legs.reverse()
+        return legs
+
+    def _stop_dict(self, stop: int, when: datetime, arrival: bool) -> dict:
+        key = "arrivalTime" if arrival else "departureTime"
+        stamp = when.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        lat, lon = self.stop_coords[stop]
+        station = self._station_of[stop]
+        return {
+            "id": self.stop_ids[stop],
+            "name": self.stop_names[stop],
+            "type": "platform",
+            "coord": [lat, lon] if lat is not None else [],
+            "parent": {"id": station, "name": self.stop_names[self._stations[station][0]]},
+            f"{key}Planned": stamp,
+            f"{key}Estimated": stamp,
+        }
+
+    def _trip_info(self, trip: int) -> tuple:
+        with self._lock:
+            return self._db.execute(
+                "SELECT trip_id, route_idx, headsign FROM trips WHERE idx = ?", (trip,)
+            ).fetchone()
+
+    def _journey(self, day: _Day, midnight: datetime, legs: List[tuple]) -> dict:
+        journey_legs = []
+        for trip, first, last in legs:
+            trip_id, route_idx, headsign = self._trip_info(trip)
+            short_name, long_name, route_type = self._routes.get(route_idx, (None, None, 3))
+            departure = midnight + timedelta(seconds=day.dep_time[first])
+            arrival = midnight + timedelta(seconds=day.arr_time[last])
+            journey_legs.append(
+                {
+                    "duration": int((arrival - departure).total_seconds()),
+                    "isRealtimeControlled": False,
+                    "origin": self._stop_dict(day.dep_stop[first], departure, arrival=False),
+                    "destination": self._stop_dict(day.arr_stop[last], arrival, arrival=True),
+                    "transportation": {
+                        "id": trip_id,
+                        "name": long_name or short_name,
+                        "disassembledName": short_name,
+                        "number": short_name,
+                        "description": headsign,
+                        "product": {"class": route_type},
+                        "destination": {"name": headsign},
+                    },
+                    "properties": {"source": "timetable"},
+                }
+            )
+        return {"legs": journey_legs, "interchanges": len(journey_legs) - 1}
+
+    def get_trips(
+        self,
+        origin_station_id: Union[str, int, "Station"],
+        destination_station_id: Union[str, int, "Station"],
+        check_time: datetime = None,
+        limit: int = 3,
+    ) -> List[Trip]:
+        r"""
+
+        Same as `vvspy.get_trips`
+        But answered from the planned timetable, without network access.
+
+        Returns: List[:class:`vvspy.models.Trip`]
+        Returns an empty list if a station is unknown or no journey was found.
+
+        Parameters
+        ----------
+            origin_station_id Union[:class:`int`, :class:`str`, :class:`vvspy.enums.Station`]
+                Station (or platform) to start from.
+            destination_station_id Union[:class:`int`, :class:`str`, :class:`vvspy.enums.Station`]
+                Station (or platform) to go to.
+            check_time Optional[:class:`datetime.datetime`]
+                Naive local time to depart at.
+                default datetime.now()
+            limit Optional[:class:`int`]
+                Maximum number of journeys.
+                default 3
+        """
+        if not check_time:
+            check_time = datetime.now()
+        origins = self.resolve_stops(origin_station_id)
+        targets = set(self.resolve_stops(destination_station_id))
+        if not origins or not targets:
+            _logger.error(f"Unknown station {origin_station_id if not origins else destination_station_id}")
+            return []
+
+        day = self._day(check_time.date())
+        midnight = datetime.combine(check_time.date(), time(), tzinfo=self.timezone)
+        start = check_time.hour * 3600 + check_time.minute * 60 + check_time.second
+
+        journeys = []
+        last_arrival = None
+        while len(journeys) < int(limit):
+            legs = self._scan(day, origins, targets, start)
+            if not legs:
+                break
+            arrival = day.arr_time[legs[-1][2]]
+            if arrival == last_arrival:
+                journeys.pop()  # departing later, arriving at the same time is better
+            journeys.append(self._journey(day, midnight, legs))
+            last_arrival = arrival
+            start = day.dep_time[legs[0][1]] + 60
+
+        return [Trip(**journey) for journey in journeys]
+
+
+if __name__ == "__main__":
+    import sys
+
+    build_timetable(sys.argv[1], sys.argv[2])
@@ -8,6 +8,7 @@ import logging as __logging
 
 if TYPE_CHECKING:
     from .enums import Station
+from .instrumentation import record
 from .models import Trip
 
 __API_URL = "https://www3.vvs.de/mngvvs/XML_TRIP_REQUEST2"
@@ -124,35 +125,37 @@ def get_trips(
         "w_regPrefAm": kwargs.get("w_regPrefAm", "1"),
     }
 
-    if session:
-        r = session.get(__API_URL, **{**request_params, **{"params": params}})
-    else:
-        r = requests.get(__API_URL, **{**request_params, **{"params": params}})
-
-    __logger.debug(
-        f"Request took {r.elapsed.total_seconds()}s and returned {r.status_code}"
-    )
-
-    if r.status_code != 200:
-        __logger.error("Error in API request")
-        __logger.error(f"Request: {r.status_code}")
-        __logger.error(f"{r.text}")
-        raise Exception(f"Error in API request: {r.status_code}")
-
-    if return_response:
-        return r
-
-    __logger.debug("Initializing parsing of response...")
-
-    try:
-        r.encoding = "UTF-8"
-        return _parse_response(r.json(), limit)
-    except json.decoder.JSONDecodeError as e:
-        __logger.error(
-            "Error in API request. Received invalid JSON. Status code: %s",
-            r.status_code,
+    with record("trip") as event:
+        r = event.get(__API_URL, session, request_params, params)
+
+        __logger.debug(
+            f"Request took {r.elapsed.total_seconds()}s and returned {r.status_code}"
         )
-        raise e
+
+        if r.status_code != 200:
+            __logger.error("Error in API request")
+            __logger.error(f"Request: {r.status_code}")
+            __logger.error(f"{r.text}")
+            raise Exception(f"Error in API request: {r.status_code}")
+
+        if return_response:
+            return r
+
+        __logger.debug("Initializing parsing of response...")
+
+        try:
+            r.encoding = "UTF-8"
+            with event.parsing():
+                trips = _parse_response(r.json(), limit)
+            event.items = len(trips)
+            event.legs = sum(len(trip.connections) for trip in trips)
+            return trips
+        except json.decoder.JSONDecodeError as e:
+            __logger.error(
+                "Error in API request. Received invalid JSON. Status code: %s",
+                r.status_code,
+            )
+            raise e
 
 
 def _parse_response(result: dict, limit: int = 100) -> Union[List[Trip], None]:
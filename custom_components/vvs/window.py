@@ -0,0 +1,207 @@
+"""Trip windows shared by all VVS entries of the same route, whatever their offset."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from . import vvspy
+from .const import DATA_ROUTE_WINDOWS, ROUTE_WINDOW_MAX_AGE, ROUTE_WINDOW_TOP_UPS
+from .scheduler import PRIORITY_BACKGROUND, async_get_scheduler
+from .stats import VVSStatistics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _window_key(
+    start_station: str, dest_station: str, route_type: str, kwargs: dict
+) -> tuple:
+    """Key of a route in `DATA_ROUTE_WINDOWS`."""
+    return start_station, dest_station, route_type, tuple(sorted(kwargs.items()))
+
+
+class VVSRouteWindow:
+    """Upcoming trips of one route from now on, fetched with one request per refresh.
+
+    Entries register their offset and number of trips. A refresh asks for as
+    many trips as the entry with the largest offset needs, every entry then
+    picks the trips departing from its own check time on. The window is
+    dropped once its last entry unregistered.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        start_station: str,
+        dest_station: str,
+        route_type: str,
+        **kwargs,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.buffer = vvspy.TripBuffer(
+            start_station,
+            dest_station,
+            size=0,
+            tz=dt_util.DEFAULT_TIME_ZONE,
+            routeType=route_type,
+            **kwargs,
+        )
+        # Registration -> (offset in minutes, most trips the entry shows)
+        self._demand: dict[object, tuple[int, int]] = {}
+        self._key = _window_key(start_station, dest_station, route_type, kwargs)
+        self._fetched_at: datetime | None = None
+        self._lock = asyncio.Lock()
+
+    @callback
+    def async_register(self, offset: int, limit: int) -> CALLBACK_TYPE:
+        """Take an entry's offset and number of trips into account on refreshes.
+
+        Returns the callback unregistering the entry again.
+        """
+        registration = object()
+        self._demand[registration] = (offset, limit)
+
+        @callback
+        def _async_unregister() -> None:
+            self._demand.pop(registration, None)
+            if not self._demand:
+                windows = self.hass.data.get(DATA_ROUTE_WINDOWS, {})
+                if windows.get(self._key) is self:
+                    del windows[self._key]
+
+        return _async_unregister
+
+    def trips(self, check_time: datetime) -> list:
+        """Buffered trips departing from `check_time` on."""
+        return self.buffer.upcoming(dt_util.utcnow(), check_time)
+
+    def _window_size(self, now: datetime) -> int:
+        """Trips from `now` on covering the registered entries."""
+        naive_now = now.replace(tzinfo=None)
+        minutes_ahead = [
+            (trip.connections[0].origin.departure_time_estimated - naive_now)
+            / timedelta(minutes=1)
+            for trip in self.buffer.upcoming(now)
+        ]
+        return max(
+            (
+                sum(1 for minutes in minutes_ahead if minutes < offset) + limit
+                for offset, limit in self._demand.values()
+            ),
+            default=0,
+        )
+
+    async def async_get_trips(
+        self,
+        check_time: datetime,
+        limit: int,
+        priority: int = PRIORITY_BACKGROUND,
+        stats: VVSStatistics | None = None,
+    ) -> list:
+        """Return `limit` trips from `check_time` on, refreshing a stale window first.
+
+        Requests (or polls saved by the shared window) are accounted in `stats`.
+        """
+        async with self._lock:
+            now = dt_util.utcnow()
+            if (
+                self._fetched_at is None
+                or now - self._fetched_at > ROUTE_WINDOW_MAX_AGE
+            ):
+                size = max(self._window_size(now), limit)
+                await async_get_scheduler(self.hass).async_acquire(priority)
+                await self._async_run(stats, self.buffer.fetch, now, size)
+                self._fetched_at = now
+                _LOGGER.debug(
+                    "Fetched %s trips of %s to %s",
+                    size,
+                    self.buffer.origin_station_id,
+                    self.buffer.destination_station_id,
+                )
+            elif stats is not None:
+                stats.record_saved()
+            await self._async_fill(check_time, limit, priority, stats)
+            return self.trips(check_time)[:limit]
+
+    async def async_fill(
+        self,
+        check_time: datetime,
+        count: int,
+        priority: int = PRIORITY_BACKGROUND,
+        stats: VVSStatistics | None = None,
+    ) -> int:
+        """Request the trips following the buffered ones.
+
+        Tops up until `count` trips depart from `check_time` on, returns the trips added.
+        """
+        async with self._lock:
+            return await self._async_fill(check_time, count, priority, stats)
+
+    async def _async_fill(
+        self,
+        check_time: datetime,
+        count: int,
+        priority: int,
+        stats: VVSStatistics | None,
+    ) -> int:
+        """Top up the buffer, each top-up asks for the trips after the last one."""
+        added = 0
+        for _ in range(ROUTE_WINDOW_TOP_UPS):
+            missing = count - len(self.trips(check_time))
+            if missing <= 0:
+                break
+            self.buffer.size = len(self.buffer.upcoming(dt_util.utcnow())) + missing
+            await async_get_scheduler(self.hass).async_acquire(priority)
+            topped_up = await self._async_run(
+                stats, self.buffer.top_up, dt_util.utcnow()
+            )
+            if not topped_up:
+                break
+            added += topped_up
+        return added
+
+    async def _async_run(self, stats: VVSStatistics | None, fetch, *args):
+        """Run a buffer call in the executor, accounting its requests in `stats`."""
+        events: list = []
+        try:
+            return await self.hass.async_add_executor_job(
+                partial(self._capture, fetch, args, events)
+            )
+        finally:
+            if stats is not None:
+                stats.record_events(events)
+
+    @staticmethod
+    def _capture(fetch, args: tuple, events: list):
+        """Call `fetch`, collecting the request events into `events`."""
+        with vvspy.instrumentation.capture() as captured:
+            try:
+                return fetch(*args)
+            finally:
+                events.extend(captured)
+
+
+@callback
+def async_get_route_window(
+    hass: HomeAssistant,
+    start_station: str,
+    dest_station: str,
+    route_type: str,
+    **kwargs,
+) -> VVSRouteWindow:
+    """Return the shared window of a route, extra vvspy arguments are part of the route."""
+    windows: dict[tuple, VVSRouteWindow] = hass.data.setdefault(
+        DATA_ROUTE_WINDOWS, {}
+    )
+    key = _window_key(start_station, dest_station, route_type, kwargs)
+    if key not in windows:
+        windows[key] = VVSRouteWindow(
+            hass, start_station, dest_station, route_type, **kwargs
+        )
+    return windows[key]
@@ -0,0 +1,113 @@
+"""Make the bundled vvspy importable without Home Assistant, and build trips for tests."""
+
+from datetime import datetime, timedelta
+import os
+import sys
+
+import pytest
+
+# Appended: the integration's calendar.py must not hide the standard library's
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "custom_components", "vvs"))
+
+from vvspy.models import Departure, Trip  # noqa: E402
+
+
+def _iso(when: datetime) -> str:
+    return when.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@pytest.fixture
+def make_leg():
+    """Factory of trip legs (rapidJSON), times are naive UTC like the API's."""
+
+    def _make_leg(
+        line: str,
+        origin: str,
+        departure: datetime,
+        minutes: int = 10,
+        delay: int = 0,
+        platform: str = "1",
+        cancelled: bool = False,
+        realtime: bool = True,
+        destination: str = "de:08111:6465",
+    ) -> dict:
+        arrival = departure + timedelta(minutes=minutes)
+        shift = timedelta(minutes=delay)
+        return {
+            "duration": minutes * 60,
+            "isRealtimeControlled": realtime,
+            "realtimeStatus": ["TRIP_CANCELLED"] if cancelled else [],
+            "origin": {
+                "id": f"{origin}:1:{platform}",
+                "name": origin,
+                "type": "platform",
+                "parent": {"id": origin, "type": "stop"},
+                "departureTimePlanned": _iso(departure),
+                "departureTimeEstimated": _iso(departure + shift),
+                "properties": {"platform": platform},
+            },
+            "destination": {
+                "id": f"{destination}:1:1",
+                "name": destination,
+                "type": "platform",
+                "parent": {"id": destination, "type": "stop"},
+                "arrivalTimePlanned": _iso(arrival),
+                "arrivalTimeEstimated": _iso(arrival + shift),
+            },
+            "transportation": {
+                "id": f"vvs:{line}:{departure:%H%M}",
+                "number": line,
+                "disassembledName": line,
+            },
+        }
+
+    return _make_leg
+
+
+@pytest.fixture
+def make_trip():
+    """Factory of trips from legs built with `make_leg`."""
+
+    def _make_trip(*legs: dict) -> Trip:
+        return Trip(legs=list(legs))
+
+    return _make_trip
+
+
+def _dm_time(when: datetime) -> dict:
+    return {
+        "year": str(when.year),
+        "month": str(when.month),
+        "day": str(when.day),
+        "hour": str(when.hour),
+        "minute": str(when.minute),
+    }
+
+
+@pytest.fixture
+def make_departure():
+    """Factory of departure board entries (DM), times are naive local like the API's."""
+
+    def _make_departure(
+        stop_id: str,
+        when: datetime,
+        line: str = "S1",
+        delay: int = 0,
+        cancelled: bool = False,
+        stop_info: dict = None,
+    ) -> Departure:
+        return Departure(
+            stopID=stop_id,
+            stopName="Hauptbahnhof (tief)",
+            platform="1",
+            countdown="2",
+            realtimeStatus="DEPARTURE_CANCELLED" if cancelled else "MONITORED",
+            dateTime=_dm_time(when),
+            realDateTime=_dm_time(when + timedelta(minutes=delay)),
+            servingLine={"number": line, "direction": "Kirchheim (T)", "realtime": "1"},
+            operator={"code": "DB", "name": "DB Regio AG"},
+            stopInfos={"stopInfo": stop_info} if stop_info else None,
+            lineInfos=None,
+        )
+
+    return _make_departure
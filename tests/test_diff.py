@@ -0,0 +1,58 @@
+"""Tests of the trip diff across polls."""
+
+from datetime import datetime, timedelta
+
+from vvspy.diff import diff_trips, journey_key
+
+START = "de:08111:6115"
+DEPARTURE = datetime(2026, 3, 2, 7, 0)
+
+
+def test_unchanged_trips_are_falsy(make_leg, make_trip):
+    old = [make_trip(make_leg("S1", START, DEPARTURE))]
+    new = [make_trip(make_leg("S1", START, DEPARTURE))]
+
+    diff = diff_trips(old, new)
+
+    assert not diff
+    assert diff.unchanged == 1
+
+
+def test_journeys_are_matched_across_platforms_and_walks(make_leg, make_trip):
+    walk = make_leg(None, START, DEPARTURE - timedelta(minutes=5), minutes=5)
+    old = make_trip(make_leg("S1", START, DEPARTURE, platform="1"))
+    new = make_trip(walk, make_leg("S1", START, DEPARTURE, platform="2"))
+
+    assert journey_key(old) == journey_key(new)
+
+
+def test_added_removed_delayed_cancelled_and_platform_changes(make_leg, make_trip):
+    old = [
+        make_trip(make_leg("S1", START, DEPARTURE)),
+        make_trip(make_leg("S2", START, DEPARTURE + timedelta(minutes=5))),
+        make_trip(make_leg("S3", START, DEPARTURE + timedelta(minutes=10))),
+        make_trip(make_leg("U6", START, DEPARTURE + timedelta(minutes=15))),
+    ]
+    new = [
+        make_trip(make_leg("S1", START, DEPARTURE, delay=3)),
+        make_trip(make_leg("S2", START, DEPARTURE + timedelta(minutes=5), cancelled=True)),
+        make_trip(make_leg("S3", START, DEPARTURE + timedelta(minutes=10), platform="2")),
+        make_trip(make_leg("S1", START, DEPARTURE + timedelta(minutes=30))),
+    ]
+
+    diff = diff_trips(old, new)
+
+    assert [trip.connections[0].transportation.number for trip in diff.added] == ["S1"]
+    assert [trip.connections[0].transportation.number for trip in diff.removed] == ["U6"]
+    assert [(o.connections[0].origin.delay, n.connections[0].origin.delay) for o, n in diff.delayed] == [(0, 3)]
+    assert diff.cancelled == [new[1]]
+    assert diff.platform_changed == [(old[2], new[2])]
+    assert diff.unchanged == 0
+
+
+def test_empty_results(make_leg, make_trip):
+    trips = [make_trip(make_leg("S1", START, DEPARTURE))]
+
+    assert diff_trips(None, trips).added == trips
+    assert diff_trips(trips, None).removed == trips
+    assert not diff_trips(None, None)
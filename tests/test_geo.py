@@ -0,0 +1,82 @@
+"""Tests of the spatial stop index."""
+
+import random
+
+import pytest
+
+from vvspy.geo import StopIndex, distance
+
+
+@pytest.fixture(scope="module")
+def stops():
+    rng = random.Random(41)
+    # Around Stuttgart, denser in the centre like the real network
+    return [
+        (
+            f"de:08111:{i}",
+            f"Stop {i}",
+            48.78 + rng.gauss(0, 0.05 if i % 3 else 0.2),
+            9.18 + rng.gauss(0, 0.08 if i % 3 else 0.3),
+        )
+        for i in range(2000)
+    ]
+
+
+@pytest.fixture(scope="module")
+def index(stops):
+    return StopIndex(stops, cell_size=500)
+
+
+def _brute_force(index, lat, lon):
+    """All stops by distance, with the index's own metric."""
+    return sorted((index._meters(i, lat, lon), index.ids[i]) for i in range(len(index)))
+
+
+QUERIES = [
+    (48.7784, 9.1800),  # centre
+    (48.70, 9.00),  # sparse outskirts
+    (49.50, 10.00),  # far outside every occupied cell
+    (47.00, 8.00),
+]
+
+
+@pytest.mark.parametrize("lat, lon", QUERIES)
+@pytest.mark.parametrize("k", [1, 5, 50])
+def test_nearest_matches_brute_force(index, lat, lon, k):
+    expected = _brute_force(index, lat, lon)[:k]
+
+    found = index.nearest(lat, lon, k=k)
+
+    assert [stop_id for stop_id, _, _ in found] == [stop_id for _, stop_id in expected]
+    assert [meters for _, _, meters in found] == pytest.approx([meters for meters, _ in expected])
+
+
+@pytest.mark.parametrize("lat, lon", QUERIES)
+@pytest.mark.parametrize("radius", [300, 2500])
+def test_within_matches_brute_force(index, lat, lon, radius):
+    expected = [stop_id for meters, stop_id in _brute_force(index, lat, lon) if meters <= radius]
+
+    assert [stop_id for stop_id, _, _ in index.within(lat, lon, radius)] == expected
+
+
+def test_nearest_respects_max_distance(index):
+    lat, lon = 48.7784, 9.1800
+    expected = [stop_id for meters, stop_id in _brute_force(index, lat, lon)[:10] if meters <= 400]
+
+    found = index.nearest(lat, lon, k=10, max_distance=400)
+
+    assert [stop_id for stop_id, _, _ in found] == expected
+
+
+def test_index_metric_is_close_to_great_circle(index, stops):
+    lat, lon = 48.7784, 9.1800
+    for i, (_, _, stop_lat, stop_lon) in enumerate(stops[:50]):
+        assert index._meters(i, lat, lon) == pytest.approx(distance(lat, lon, stop_lat, stop_lon), rel=0.01)
+
+
+def test_empty_index():
+    index = StopIndex([("de:08111:1", "No position", None, None)])
+
+    assert len(index) == 0
+    assert index.nearest(48.78, 9.18) == []
+    assert index.within(48.78, 9.18, 1000) == []
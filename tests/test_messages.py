@@ -0,0 +1,48 @@
+"""Tests of the disruption message store."""
+
+from datetime import datetime
+
+from vvspy.messages import MessageStore
+
+STATION = "de:08111:6115"
+MORNING = datetime(2026, 3, 2, 7, 0)
+
+
+def _stop_info(info_id: str, title: str) -> dict:
+    return {
+        "infoLinkText": title,
+        "infoText": {"content": title},
+        "paramList": [
+            {"name": "infoID", "value": info_id},
+            {"name": "infoVersion", "value": "1"},
+            {"name": "priority", "value": "normal"},
+        ],
+    }
+
+
+def test_board_stop_messages_are_recorded_under_the_requested_station(make_departure):
+    departures = [
+        make_departure("5006115", MORNING, stop_info=_stop_info("elevator-2", "Aufzug Gleis 2 defekt")),
+        make_departure("5006115", MORNING.replace(minute=3)),
+    ]
+
+    store = MessageStore()
+    assert store.add_departures(departures, STATION) == 1
+
+    messages = store.messages({"S1"}, {STATION})
+    assert [message.id for message in messages] == ["elevator-2"]
+    assert messages[0].stops == {STATION}
+    assert not store.messages(stops={"5006115"})
+
+
+def test_board_stop_messages_default_to_the_stop_of_each_departure(make_departure):
+    departures = [
+        make_departure("5006115", MORNING, stop_info=_stop_info("elevator-a", "Aufzug A defekt")),
+        make_departure("5006465", MORNING.replace(minute=3), stop_info=_stop_info("elevator-b", "Aufzug B defekt")),
+    ]
+
+    store = MessageStore()
+    assert store.add_departures(departures) == 2
+
+    assert [message.id for message in store.messages(stops={"5006115"})] == ["elevator-a"]
+    assert [message.id for message in store.messages(stops={"5006465"})] == ["elevator-b"]
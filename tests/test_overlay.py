@@ -0,0 +1,70 @@
+"""Tests of the realtime overlay merging board delays onto planned trips."""
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from vvspy.overlay import RealtimeOverlay
+
+BERLIN = ZoneInfo("Europe/Berlin")
+START = "de:08111:6115"
+CHANGE = "de:08111:6118"
+# 07:00 UTC is 08:00 in Stuttgart in March
+DEPARTURE = datetime(2026, 3, 2, 7, 0)
+LOCAL = datetime(2026, 3, 2, 8, 0)
+
+
+def _planned(make_leg, make_trip):
+    return [
+        make_trip(
+            make_leg("S1", START, DEPARTURE, minutes=10, delay=1, destination=CHANGE),
+            make_leg("U6", CHANGE, DEPARTURE + timedelta(minutes=15), minutes=10),
+        ),
+        make_trip(make_leg("S2", START, DEPARTURE + timedelta(minutes=20))),
+    ]
+
+
+def test_planned_trips_are_not_realtime(make_leg, make_trip):
+    overlay = RealtimeOverlay(_planned(make_leg, make_trip), BERLIN)
+
+    assert not any(leg.is_realtime_controlled for trip in overlay.trips for leg in trip.connections)
+    # The delay the trips were planned with is kept
+    assert overlay.trips[0].connections[0].origin.delay == 1
+
+
+def test_board_delays_and_cancellations_are_merged(make_leg, make_trip, make_departure):
+    planned = _planned(make_leg, make_trip)
+    overlay = RealtimeOverlay(planned, BERLIN)
+
+    trips = overlay.apply(
+        [
+            make_departure("5006115", LOCAL, line="S1", delay=4),
+            make_departure("5006115", LOCAL + timedelta(minutes=20), line="S2", cancelled=True),
+            # No planned leg departs with it
+            make_departure("5006115", LOCAL + timedelta(minutes=5), line="S1", delay=9),
+        ]
+    )
+
+    first, second = trips
+    leg = first.connections[0]
+    assert leg.is_realtime_controlled
+    assert leg.origin.delay == 4
+    assert leg.origin.departure_time_estimated == DEPARTURE + timedelta(minutes=4)
+    # The board has no data for the exit stop, the delay carries over
+    assert leg.destination.arrival_time_estimated == DEPARTURE + timedelta(minutes=14)
+    assert not first.connections[1].is_realtime_controlled
+    assert second.connections[0].cancelled
+
+    # The planned trips are left alone
+    assert planned[0].connections[0].origin.delay == 1
+    assert not overlay.planned[1].connections[0].cancelled
+
+
+def test_unchanged_realtime_data_keeps_the_trip_objects(make_leg, make_trip, make_departure):
+    overlay = RealtimeOverlay(_planned(make_leg, make_trip), BERLIN)
+    board = [make_departure("5006115", LOCAL, line="S1", delay=4)]
+
+    before = list(overlay.apply(board))
+    after = overlay.apply(board)
+
+    assert after[0] is before[0]
+    assert after[1] is overlay.planned[1]
@@ -0,0 +1,92 @@
+"""Tests of the offline timetable's connection scan router."""
+
+from datetime import datetime
+
+import pytest
+
+from vvspy.timetable import Timetable, build_timetable
+
+ORIGIN = "de:08111:1"
+CHANGE = "de:08111:2"
+TARGET = "de:08111:3"
+
+GTFS = {
+    "agency.txt": "agency_id,agency_name,agency_url,agency_timezone\nvvs,VVS,https://vvs.de,Europe/Berlin\n",
+    "stops.txt": (
+        "stop_id,stop_name,stop_lat,stop_lon,parent_station\n"
+        f"{ORIGIN},Origin,48.78,9.18,\n"
+        f"{ORIGIN}:1:1,Origin,48.78,9.18,{ORIGIN}\n"
+        f"{CHANGE},Change,48.79,9.19,\n"
+        f"{CHANGE}:1:1,Change,48.79,9.19,{CHANGE}\n"
+        f"{CHANGE}:1:2,Change,48.79,9.19,{CHANGE}\n"
+        f"{TARGET},Target,48.80,9.20,\n"
+        f"{TARGET}:1:1,Target,48.80,9.20,{TARGET}\n"
+    ),
+    "routes.txt": (
+        "route_id,route_short_name,route_long_name,route_type\n"
+        "s1,S1,S-Bahn S1,2\n"
+        "u6,U6,Stadtbahn U6,0\n"
+    ),
+    "trips.txt": (
+        "route_id,service_id,trip_id,trip_headsign\n"
+        "s1,weekdays,s1-0800,Change\n"
+        "u6,weekdays,u6-0811,Target\n"
+        "u6,weekdays,u6-0813,Target\n"
+    ),
+    "calendar.txt": (
+        "service_id,monday,tuesday,wednesday,thursday,friday,saturday,sunday,start_date,end_date\n"
+        "weekdays,1,1,1,1,1,0,0,20260101,20261231\n"
+    ),
+    "stop_times.txt": (
+        "trip_id,arrival_time,departure_time,stop_id,stop_sequence\n"
+        f"s1-0800,08:00:00,08:00:00,{ORIGIN}:1:1,1\n"
+        f"s1-0800,08:10:00,08:10:00,{CHANGE}:1:1,2\n"
+        # One minute after the S1 arrives, too short to change platforms
+        f"u6-0811,08:11:00,08:11:00,{CHANGE}:1:2,1\n"
+        f"u6-0811,08:20:00,08:20:00,{TARGET}:1:1,2\n"
+        f"u6-0813,08:13:00,08:13:00,{CHANGE}:1:2,1\n"
+        f"u6-0813,08:25:00,08:25:00,{TARGET}:1:1,2\n"
+    ),
+}
+
+
+@pytest.fixture
+def timetable(tmp_path):
+    gtfs = tmp_path / "gtfs"
+    gtfs.mkdir()
+    for name, content in GTFS.items():
+        (gtfs / name).write_text(content, encoding="utf-8")
+    db_path = str(tmp_path / "timetable.db")
+    build_timetable(str(gtfs), db_path)
+    timetable = Timetable(db_path)
+    yield timetable
+    timetable.close()
+
+
+def test_interchanges_keep_the_transfer_time(timetable):
+    # Monday 2 March 2026, 07:55 local
+    trips = timetable.get_trips(ORIGIN, TARGET, datetime(2026, 3, 2, 7, 55), limit=1)
+
+    assert len(trips) == 1
+    first, second = trips[0].connections
+    assert (first.transportation.number, second.transportation.number) == ("S1", "U6")
+    assert first.destination.id == f"{CHANGE}:1:1"
+    assert second.origin.id == f"{CHANGE}:1:2"
+    # Naive UTC like the API, the U6 at 08:11 can't be caught
+    assert second.origin.departure_time_planned == datetime(2026, 3, 2, 7, 13)
+    assert second.destination.arrival_time_planned == datetime(2026, 3, 2, 7, 25)
+
+
+def test_direct_ride_from_the_changing_station(timetable):
+    trips = timetable.get_trips(CHANGE, TARGET, datetime(2026, 3, 2, 8, 5), limit=2)
+
+    assert [trip.connections[0].origin.departure_time_planned for trip in trips] == [
+        datetime(2026, 3, 2, 7, 11),
+        datetime(2026, 3, 2, 7, 13),
+    ]
+
+
+def test_no_trips_without_service(timetable):
+    # Saturday
+    assert timetable.get_trips(ORIGIN, TARGET, datetime(2026, 3, 7, 7, 55)) == []
+    assert timetable.get_trips(ORIGIN, "de:08111:404", datetime(2026, 3, 2, 7, 55)) == []